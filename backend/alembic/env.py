@@ -0,0 +1,50 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from app.config import settings
+from app.database import Base
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+target_metadata = Base.metadata
+
+# app.utils.migrations hands over an open connection; the app has already configured logging then.
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def configure(**kwargs) -> None:
+    dialect = kwargs["connection"].dialect.name if "connection" in kwargs else kwargs["url"].split(":")[0].split("+")[0]
+    # SQLite cannot ALTER most constraints in place; batch mode rebuilds the table instead.
+    context.configure(target_metadata=target_metadata, render_as_batch=dialect == "sqlite", compare_type=True, **kwargs)
+
+
+def run_migrations_offline() -> None:
+    configure(url=database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = engine_from_config({"sqlalchemy.url": database_url()}, prefix="sqlalchemy.", poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,136 @@
+"""Baseline schema
+
+The tables as the app created them with Base.metadata.create_all before migrations existed. On
+PostgreSQL, close_approaches is range-partitioned by month on approach_date. A DEFAULT partition
+catches rows whose month has no partition yet; app.utils.partitions creates monthly partitions and
+moves those rows into them. The primary key there is (id, approach_date) because a partitioned table's
+unique constraints must include the partition key. approach_date gets a BRIN index instead of a B-tree:
+rows arrive roughly in date order, so block ranges map closely to date ranges at a fraction of the size.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "asteroids",
+        sa.Column("id", sa.String(length=20), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("absolute_magnitude", sa.Float(), nullable=True),
+        sa.Column("is_hazardous", sa.Boolean(), nullable=True),
+        sa.Column("estimated_diameter_min", sa.Float(), nullable=True),
+        sa.Column("estimated_diameter_max", sa.Float(), nullable=True),
+        sa.Column("nasa_jpl_url", sa.String(length=500), nullable=True),
+        sa.Column("last_updated", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_asteroids_id", "asteroids", ["id"])
+    op.create_index("ix_asteroids_name", "asteroids", ["name"])
+    op.create_index("ix_asteroids_is_hazardous", "asteroids", ["is_hazardous"])
+
+    approach_columns = [
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("asteroid_id", sa.String(length=20), nullable=False),
+        sa.Column("approach_date", sa.Date(), nullable=False),
+        sa.Column("approach_date_full", sa.DateTime(), nullable=True),
+        sa.Column("velocity_kmh", sa.Float(), nullable=True),
+        sa.Column("miss_distance_km", sa.Float(), nullable=True),
+        sa.Column("miss_distance_lunar", sa.Float(), nullable=True),
+        sa.Column("orbiting_body", sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(["asteroid_id"], ["asteroids.id"]),
+    ]
+    if is_postgres:
+        op.create_table(
+            "close_approaches", *approach_columns, sa.PrimaryKeyConstraint("id", "approach_date"),
+            postgresql_partition_by="RANGE (approach_date)"
+        )
+        op.execute("CREATE TABLE close_approaches_default PARTITION OF close_approaches DEFAULT")
+        op.create_index("ix_close_approaches_approach_date_brin", "close_approaches", ["approach_date"], postgresql_using="brin")
+    else:
+        op.create_table("close_approaches", *approach_columns, sa.PrimaryKeyConstraint("id"))
+        op.create_index("ix_close_approaches_approach_date", "close_approaches", ["approach_date"])
+    op.create_index("ix_close_approaches_id", "close_approaches", ["id"])
+    op.create_index("ix_close_approaches_asteroid_id", "close_approaches", ["asteroid_id"])
+
+    op.create_table(
+        "watchlist",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("asteroid_id", sa.String(length=20), nullable=False),
+        sa.Column("alert_distance_km", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["asteroid_id"], ["asteroids.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "asteroid_id", name="unique_user_asteroid"),
+    )
+    op.create_index("ix_watchlist_id", "watchlist", ["id"])
+    op.create_index("ix_watchlist_user_id", "watchlist", ["user_id"])
+    op.create_index("ix_watchlist_asteroid_id", "watchlist", ["asteroid_id"])
+
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("asteroid_id", sa.String(length=20), nullable=False),
+        sa.Column("message", sa.String(length=500), nullable=False),
+        sa.Column("alert_type", sa.String(length=50), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("approach_date", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["asteroid_id"], ["asteroids.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_alerts_id", "alerts", ["id"])
+    op.create_index("ix_alerts_user_id", "alerts", ["user_id"])
+    op.create_index("ix_alerts_asteroid_id", "alerts", ["asteroid_id"])
+    op.create_index("ix_alerts_is_read", "alerts", ["is_read"])
+
+    op.create_table(
+        "chat_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("asteroid_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_chat_messages_id", "chat_messages", ["id"])
+    op.create_index("ix_chat_messages_asteroid_id", "chat_messages", ["asteroid_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("chat_messages")
+    op.drop_table("alerts")
+    op.drop_table("watchlist")
+    op.drop_table("close_approaches")
+    op.drop_table("asteroids")
+    op.drop_table("users")
@@ -0,0 +1,65 @@
+"""Composite and unique indexes for the hot queries
+
+close_approaches gains a unique (asteroid_id, approach_date) index, the natural key the ingest
+upsert matches on, so it can use ON CONFLICT. Any duplicate rows are collapsed first, keeping the
+most recently inserted one. An (approach_date, miss_distance_km) index serves the alert window scan.
+alerts gains (user_id, is_read, created_at, id) for unread listing and counts, and
+(user_id, asteroid_id, approach_date) for the per-approach duplicate check. The single-column
+indexes these make redundant are dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATED = [
+    ("ix_close_approaches_asteroid_date", "close_approaches", ["asteroid_id", "approach_date"], True),
+    ("ix_close_approaches_date_distance", "close_approaches", ["approach_date", "miss_distance_km"], False),
+    ("ix_alerts_user_read_created", "alerts", ["user_id", "is_read", "created_at", "id"], False),
+    ("ix_alerts_user_asteroid_date", "alerts", ["user_id", "asteroid_id", "approach_date"], False),
+]
+
+# Leading-column prefixes of the indexes above, or too unselective to be used on their own.
+DROPPED = [
+    ("ix_close_approaches_asteroid_id", "close_approaches", ["asteroid_id"]),
+    ("ix_close_approaches_approach_date", "close_approaches", ["approach_date"]),
+    ("ix_alerts_user_id", "alerts", ["user_id"]),
+    ("ix_alerts_is_read", "alerts", ["is_read"]),
+]
+
+
+def upgrade() -> None:
+    # Databases created with create_all may already match, and on PostgreSQL approach_date has a BRIN
+    # index instead of the B-tree, so check what exists. Offline (--sql) runs render every step.
+    existing = None if context.is_offline_mode() else {
+        table: {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)} for table in ("close_approaches", "alerts")
+    }
+
+    op.execute(
+        "DELETE FROM close_approaches WHERE id NOT IN "
+        "(SELECT MAX(id) FROM close_approaches GROUP BY asteroid_id, approach_date)"
+    )
+    for name, table, columns, unique in CREATED:
+        if existing is None or name not in existing[table]:
+            op.create_index(name, table, columns, unique=unique)
+    for name, table, _ in DROPPED:
+        if existing is None or name in existing[table]:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    for name, table, columns in DROPPED:
+        if not (is_postgres and name == "ix_close_approaches_approach_date"):
+            op.create_index(name, table, columns)
+    for name, table, _, _ in reversed(CREATED):
+        op.drop_index(name, table_name=table)
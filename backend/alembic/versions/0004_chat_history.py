@@ -0,0 +1,44 @@
+"""Chat history columns and room index
+
+Chat messages are now stored, including those from guests, so user_id becomes nullable and the
+sender's display name is kept in user_email. Room history is read newest first through an
+(asteroid_id, created_at, id) index, which replaces the single-column asteroid_id index.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = None if context.is_offline_mode() else sa.inspect(op.get_bind())
+    columns = None if inspector is None else {c["name"]: c for c in inspector.get_columns("chat_messages")}
+    indexes = None if inspector is None else {i["name"] for i in inspector.get_indexes("chat_messages")}
+
+    with op.batch_alter_table("chat_messages") as batch_op:
+        if columns is None or "user_email" not in columns:
+            batch_op.add_column(sa.Column("user_email", sa.String(length=255), nullable=True))
+        if columns is None or not columns["user_id"]["nullable"]:
+            batch_op.alter_column("user_id", existing_type=sa.Integer(), nullable=True)
+    if indexes is None or "ix_chat_messages_asteroid_created" not in indexes:
+        op.create_index("ix_chat_messages_asteroid_created", "chat_messages", ["asteroid_id", "created_at", "id"])
+    if indexes is None or "ix_chat_messages_asteroid_id" in indexes:
+        op.drop_index("ix_chat_messages_asteroid_id", table_name="chat_messages")
+
+
+def downgrade() -> None:
+    op.create_index("ix_chat_messages_asteroid_id", "chat_messages", ["asteroid_id"])
+    op.drop_index("ix_chat_messages_asteroid_created", table_name="chat_messages")
+    op.execute("DELETE FROM chat_messages WHERE user_id IS NULL")
+    with op.batch_alter_table("chat_messages") as batch_op:
+        batch_op.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column("user_email")
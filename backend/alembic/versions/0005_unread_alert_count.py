@@ -0,0 +1,33 @@
+"""Denormalized unread alert counter on users
+
+users.unread_alert_count is kept in step with the user's unread alerts by every alert write, so
+the unread badge is a primary-key lookup instead of a COUNT over the user's alert history. The
+column is filled from the current alerts when it is added.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if context.is_offline_mode() or "unread_alert_count" not in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("users")}:
+        op.add_column("users", sa.Column("unread_alert_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE users SET unread_alert_count = "
+        "(SELECT COUNT(*) FROM alerts WHERE alerts.user_id = users.id AND alerts.is_read = false)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("unread_alert_count")
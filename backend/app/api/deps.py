@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.database import SessionLocal
+from app.database import SessionLocal, AsyncSessionLocal
 from app.core.security import decode_access_token
+from app.core.principals import Principal, principal_cache
 from app.models.user import User
 
 
@@ -18,12 +20,13 @@ def get_db():
         db.close()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    payload = decode_access_token(token)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    payload = decode_access_token(credentials.credentials)
     
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -32,19 +35,51 @@ def get_current_user(
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return int(user_id)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    user = await db.get(User, _token_user_id(credentials))
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     
+    principal_cache.set(user.id, Principal(id=user.id, email=user.email))
     return user
 
 
-def get_optional_user(
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> int:
+    """The authenticated user's id, for handlers that need nothing else from the user.
+    
+    A user verified within AUTH_PRINCIPAL_CACHE_TTL_SECONDS is served from the principal cache without
+    touching the database; otherwise only the id, email and is_active columns are read.
+    """
+    user_id = _token_user_id(credentials)
+    if principal_cache.get(user_id) is not None:
+        return user_id
+    
+    row = (await db.execute(select(User.email, User.is_active).where(User.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    
+    if not row.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    
+    principal_cache.set(user_id, Principal(id=user_id, email=row.email))
+    return user_id
+
+
+async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Optional[User]:
     if credentials is None:
         return None
@@ -57,4 +92,4 @@ def get_optional_user(
     if user_id is None:
         return None
     
-    return db.query(User).filter(User.id == int(user_id)).first()
+    return await db.get(User, int(user_id))
@@ -1,55 +1,89 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
-from app.schemas.alert import AlertResponse
-from app.api.deps import get_db, get_current_user
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.schemas.alert import AlertResponse, AlertDeltaResponse
+from app.api.deps import get_db, get_async_db, get_current_user_id
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import json_response
 from app import crud
 
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 
+_alert_list = TypeAdapter(List[AlertResponse])
+_alert_delta = TypeAdapter(AlertDeltaResponse)
+
+
+def alert_payload(a) -> dict:
+    return {
+        "id": a.id, "user_id": a.user_id, "asteroid_id": a.asteroid_id, "message": a.message,
+        "alert_type": a.alert_type or "close_approach", "is_read": bool(a.is_read), "approach_date": a.approach_date,
+        "created_at": a.created_at, "asteroid_name": a.asteroid.name if a.asteroid else None
+    }
+
 
 @router.get("", response_model=List[AlertResponse])
 async def get_user_alerts(
     unread_only: bool = Query(False), limit: int = Query(50, le=100), offset: int = Query(0),
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page; replaces offset"),
+    current_user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)
 ):
-    alerts = crud.alert.get_by_user(db, user_id=current_user.id, unread_only=unread_only, limit=limit, offset=offset)
-    return [{
-        "id": a.id, "user_id": a.user_id, "asteroid_id": a.asteroid_id, "message": a.message,
-        "alert_type": a.alert_type, "is_read": a.is_read, "approach_date": a.approach_date,
-        "created_at": a.created_at, "asteroid_name": a.asteroid.name if a.asteroid else None
-    } for a in alerts]
+    position = None
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+            position = (datetime.fromisoformat(created_at), int(last_id))
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+    
+    alerts = await crud.aio.alert.get_by_user(db, user_id=current_user_id, unread_only=unread_only, limit=limit, offset=offset, cursor=position)
+    response = json_response(_alert_list, [alert_payload(a) for a in alerts])
+    if len(alerts) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor([alerts[-1].created_at, alerts[-1].id])
+    return response
+
+
+@router.get("/delta", response_model=AlertDeltaResponse)
+async def get_alert_delta(
+    after_id: int = Query(0, ge=0, description="Highest alert id the client already has"), limit: int = Query(100, ge=1, le=500),
+    current_user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)
+):
+    """Alerts created since ``after_id``, oldest first, to catch up after a WebSocket reconnect"""
+    alerts = await crud.aio.alert.get_after(db, user_id=current_user_id, after_id=after_id, limit=limit)
+    return json_response(_alert_delta, {
+        "alerts": [alert_payload(a) for a in alerts],
+        "last_id": alerts[-1].id if alerts else after_id,
+        "has_more": len(alerts) == limit,
+        "unread_count": await crud.aio.alert.count_unread(db, user_id=current_user_id)
+    })
 
 
 @router.get("/unread/count")
-async def get_unread_count(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return {"unread_count": crud.alert.count_unread(db, user_id=current_user.id)}
+async def get_unread_count(current_user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)):
+    return {"unread_count": await crud.aio.alert.count_unread(db, user_id=current_user_id)}
 
 
 @router.put("/{alert_id}/read", response_model=AlertResponse)
-async def mark_as_read(alert_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def mark_as_read(alert_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     alert = crud.alert.get(db, id=alert_id)
-    if not alert or alert.user_id != current_user.id:
+    if not alert or alert.user_id != current_user_id:
         raise HTTPException(status_code=404, detail="Alert not found")
     
     updated = crud.alert.update(db, db_obj=alert, obj_in={"is_read": True})
-    return {
-        "id": updated.id, "user_id": updated.user_id, "asteroid_id": updated.asteroid_id, "message": updated.message,
-        "alert_type": updated.alert_type, "is_read": updated.is_read, "approach_date": updated.approach_date,
-        "created_at": updated.created_at, "asteroid_name": updated.asteroid.name if updated.asteroid else None
-    }
+    return alert_payload(updated)
 
 
 @router.put("/read-all")
-async def mark_all_read(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    count = crud.alert.mark_all_as_read(db, user_id=current_user.id)
+def mark_all_read(current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    count = crud.alert.mark_all_as_read(db, user_id=current_user_id)
     return {"message": f"Marked {count} alerts as read"}
 
 
 @router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_alert(alert_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_alert(alert_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     alert = crud.alert.get(db, id=alert_id)
-    if not alert or alert.user_id != current_user.id:
+    if not alert or alert.user_id != current_user_id:
         raise HTTPException(status_code=404, detail="Alert not found")
     crud.alert.remove(db, id=alert_id)
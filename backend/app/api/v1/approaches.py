@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, time, timedelta, timezone
+from app.config import settings
+from app.api.deps import get_async_db
+from app.schemas.asteroid import UpcomingApproachResponse
+from app.services.risk_service import RISK_THRESHOLDS
+from app.services.timeline_service import approach_timeline, utc_today
+
+router = APIRouter(prefix="/approaches", tags=["Approaches"])
+
+
+@router.get("/upcoming", response_model=List[UpcomingApproachResponse])
+async def get_upcoming_approaches(
+    start: Optional[datetime] = Query(None, description="UTC; defaults to the start of the current UTC day"),
+    days: int = Query(7, ge=1, le=settings.TIMELINE_DAYS),
+    is_hazardous: Optional[bool] = Query(None),
+    min_risk: Optional[str] = Query(None, pattern="^(LOW|MODERATE|HIGH|EXTREME)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Close approaches in time order, with the asteroid summary and risk, from the in-memory timeline"""
+    if start is None:
+        start = datetime.combine(utc_today(), time.min)
+    elif start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+
+    snapshot = await approach_timeline.snapshot(db)
+    end = start + timedelta(days=days)
+    if not snapshot.covers(start, end):
+        raise HTTPException(
+            status_code=422, detail=f"The timeline covers {snapshot.start_date} to {snapshot.end_date} (UTC); start and days must fall within it"
+        )
+    body = snapshot.window(
+        start, end, is_hazardous=is_hazardous,
+        min_risk=RISK_THRESHOLDS[min_risk] if min_risk else None, limit=limit
+    )
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-cache"})
@@ -1,29 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import date, timedelta
 from app.schemas.asteroid import AsteroidResponse, AsteroidFeedResponse
-from app.api.deps import get_db
+from app.api.deps import get_db, get_async_db, get_current_user_id
+from app.config import settings
 from app import crud
-from app.services.risk_service import calculate_risk_score
-from app.services.nasa_service import nasa_service
+from app.services.risk_service import RISK_THRESHOLDS, calculate_risk_score, score_approaches
+from app.services.nasa_service import NASAOfflineError, NASARateLimitError
+from app.services.ingest_service import ingest_service
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import response_cache
+from app.utils.serialization import asteroid_payload, encode, json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/asteroids", tags=["Asteroids"])
 
+_asteroid = TypeAdapter(AsteroidResponse)
+_asteroid_list = TypeAdapter(List[AsteroidResponse])
+_feed = TypeAdapter(AsteroidFeedResponse)
+
+def _closest_approach(asteroid):
+    return min(asteroid.close_approaches, key=lambda x: x.miss_distance_km if x.miss_distance_km else float('inf'))
+
+
+def _risk_scores(asteroids) -> List[Optional[str]]:
+    # Prefer the score materialized at ingest; only rows stored before it existed are scored here.
+    missing = [asteroid for asteroid in asteroids if asteroid.risk_score is None and asteroid.close_approaches]
+    computed = dict(zip((a.id for a in missing), score_approaches(missing, [_closest_approach(a) for a in missing])))
+    return [asteroid.risk_score if asteroid.risk_score is not None else computed.get(asteroid.id) for asteroid in asteroids]
+
+
+def _asteroid_payloads(asteroids) -> List[dict]:
+    return [asteroid_payload(asteroid, risk_score) for asteroid, risk_score in zip(asteroids, _risk_scores(asteroids))]
+
 
 @router.get("/feed", response_model=AsteroidFeedResponse)
 async def get_asteroid_feed(
+    request: Request,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     is_hazardous: Optional[bool] = Query(None),
     min_diameter: Optional[float] = Query(None),
     max_diameter: Optional[float] = Query(None),
-    sort_by: Optional[str] = Query("approach_date"),
+    min_risk: Optional[str] = Query(None, pattern="^(LOW|MODERATE|HIGH|EXTREME)$"),
+    sort_by: Optional[str] = Query("approach_date", description="approach_date, diameter, velocity or risk"),
     limit: int = Query(50, le=100),
     offset: int = Query(0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces offset"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     if not start_date:
         start_date = date.today()
@@ -33,65 +61,77 @@ async def get_asteroid_feed(
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="end_date must be after start_date")
     
-    asteroids = crud.asteroid.get_feed(
-        db, start_date=start_date, end_date=end_date, is_hazardous=is_hazardous,
-        min_diameter=min_diameter, max_diameter=max_diameter, sort_by=sort_by, limit=limit, offset=offset
-    )
+    position = None
+    if cursor:
+        try:
+            cursor_sort, key, last_id = decode_cursor(cursor)
+            if cursor_sort != sort_by:
+                raise ValueError("Cursor was issued for a different sort order")
+            aggregate = sort_by in crud.asteroid.AGGREGATE_SORTS
+            key_ok = isinstance(key, (int, float)) and not isinstance(key, bool) if aggregate else isinstance(key, str)
+            if not key_ok or not isinstance(last_id, str):
+                raise ValueError("Cursor values have the wrong types")
+            position = (key if aggregate else date.fromisoformat(key), last_id)
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        offset = 0
     
-    response_asteroids = []
-    for asteroid in asteroids:
-        asteroid_dict = {
-            "id": asteroid.id, "name": asteroid.name, "absolute_magnitude": asteroid.absolute_magnitude,
-            "is_hazardous": asteroid.is_hazardous, "estimated_diameter_min": asteroid.estimated_diameter_min,
-            "estimated_diameter_max": asteroid.estimated_diameter_max, "nasa_jpl_url": asteroid.nasa_jpl_url,
-            "last_updated": asteroid.last_updated, "close_approaches": asteroid.close_approaches, "risk_score": None
-        }
-        if asteroid.close_approaches:
-            closest = min(asteroid.close_approaches, key=lambda x: x.miss_distance_km if x.miss_distance_km else float('inf'))
-            asteroid_dict["risk_score"] = calculate_risk_score(asteroid, closest)
-        response_asteroids.append(asteroid_dict)
+    async def render() -> bytes:
+        asteroids, next_position = await crud.aio.asteroid.get_feed_page(
+            db, start_date=start_date, end_date=end_date, is_hazardous=is_hazardous,
+            min_diameter=min_diameter, max_diameter=max_diameter, min_risk=RISK_THRESHOLDS[min_risk] if min_risk else None,
+            sort_by=sort_by, limit=limit, offset=offset, cursor=position
+        )
+        
+        next_cursor = encode_cursor([sort_by, *next_position]) if next_position else None
+        return encode(_feed, {"count": len(asteroids), "asteroids": _asteroid_payloads(asteroids), "next_cursor": next_cursor})
     
-    return {"count": len(response_asteroids), "asteroids": response_asteroids}
+    cache_key = response_cache.make_key(
+        "feed", start_date=start_date, end_date=end_date, is_hazardous=is_hazardous, min_diameter=min_diameter,
+        max_diameter=max_diameter, min_risk=min_risk, sort_by=sort_by, limit=limit, offset=offset, cursor=cursor
+    )
+    return await response_cache.respond(request, cache_key, render)
 
 
 @router.get("/search", response_model=List[AsteroidResponse])
-async def search_asteroids(q: str = Query(..., min_length=2), db: Session = Depends(get_db)):
-    asteroids = crud.asteroid.search(db, query=q)
-    for asteroid in asteroids:
-        if asteroid.close_approaches:
-            closest = min(asteroid.close_approaches, key=lambda x: x.miss_distance_km if x.miss_distance_km else float('inf'))
-            asteroid.risk_score = calculate_risk_score(asteroid, closest)
-    return asteroids
+async def search_asteroids(q: str = Query(..., min_length=2), db: AsyncSession = Depends(get_async_db)):
+    return json_response(_asteroid_list, _asteroid_payloads(await crud.aio.asteroid.search(db, query=q)))
 
 
 @router.get("/hazardous", response_model=List[AsteroidResponse])
-async def get_hazardous_asteroids(limit: int = Query(50, le=100), db: Session = Depends(get_db)):
-    asteroids = crud.asteroid.get_hazardous(db, limit=limit)
-    for asteroid in asteroids:
-        if asteroid.close_approaches:
-            closest = min(asteroid.close_approaches, key=lambda x: x.miss_distance_km if x.miss_distance_km else float('inf'))
-            asteroid.risk_score = calculate_risk_score(asteroid, closest)
-    return asteroids
+async def get_hazardous_asteroids(request: Request, limit: int = Query(50, le=100), db: AsyncSession = Depends(get_async_db)):
+    async def render() -> bytes:
+        return encode(_asteroid_list, _asteroid_payloads(await crud.aio.asteroid.get_hazardous(db, limit=limit)))
+    
+    return await response_cache.respond(request, response_cache.make_key("hazardous", limit=limit), render)
 
 
 @router.get("/{asteroid_id}", response_model=AsteroidResponse)
-async def get_asteroid_by_id(asteroid_id: str, db: Session = Depends(get_db)):
-    asteroid = crud.asteroid.get(db, id=asteroid_id)
-    if not asteroid:
-        raise HTTPException(status_code=404, detail=f"Asteroid with ID {asteroid_id} not found")
+async def get_asteroid_by_id(request: Request, asteroid_id: str, db: AsyncSession = Depends(get_async_db)):
+    today = date.today()
+    
+    async def render() -> bytes:
+        asteroid = await crud.aio.asteroid.get(db, id=asteroid_id)
+        if not asteroid:
+            raise HTTPException(status_code=404, detail=f"Asteroid with ID {asteroid_id} not found")
+        
+        risk_score = None
+        if asteroid.close_approaches:
+            future = [a for a in asteroid.close_approaches if a.approach_date >= today]
+            approach = min(future, key=lambda x: x.approach_date) if future else asteroid.close_approaches[0]
+            risk_score = approach.risk_score or calculate_risk_score(asteroid, approach)
+        return encode(_asteroid, asteroid_payload(asteroid, risk_score))
     
-    if asteroid.close_approaches:
-        today = date.today()
-        future = [a for a in asteroid.close_approaches if a.approach_date >= today]
-        approach = min(future, key=lambda x: x.approach_date) if future else asteroid.close_approaches[0]
-        asteroid.risk_score = calculate_risk_score(asteroid, approach)
-    return asteroid
+    # The risk shown is for the next approach, so entries are per day as well as per asteroid.
+    return await response_cache.respond(request, response_cache.make_key("asteroid", asteroid_id=asteroid_id, today=today), render)
 
 
 @router.post("/sync")
 async def sync_nasa_data(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    concurrency: Optional[int] = Query(None, ge=1, le=16),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     if not start_date:
@@ -99,18 +139,26 @@ async def sync_nasa_data(
     if not end_date:
         end_date = start_date + timedelta(days=7)
     
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+    if (end_date - start_date).days + 1 > settings.SYNC_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Sync covers at most {settings.SYNC_MAX_DAYS} days; use `python -m app.cli backfill` for longer ranges"
+        )
+    
     try:
-        response = await nasa_service.fetch_feed(start_date, end_date)
-        asteroids_data = nasa_service.parse_feed_response(response)
+        stats = await ingest_service.backfill(db, start_date, end_date, concurrency=concurrency)
         
-        count = 0
-        for data in asteroids_data:
-            asteroid = crud.asteroid.upsert(db, asteroid_data=data)
-            for approach in data["close_approaches"]:
-                crud.close_approach.upsert(db, asteroid_id=asteroid.id, approach_data=approach)
-            count += 1
-        
-        return {"message": f"Successfully synced {count} asteroids", "start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        return {
+            "message": f"Successfully synced {stats['asteroids']} asteroids", "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(), "windows": stats["windows"], "approaches": stats["approaches"], "batches": stats["batches"]
+        }
+    except NASARateLimitError as e:
+        logger.error(f"NASA sync rate limited: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
+    except NASAOfflineError as e:
+        logger.error(f"NASA sync unavailable offline: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"NASA sync error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to sync NASA data: {str(e)}")
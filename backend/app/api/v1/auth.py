@@ -1,28 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.core.security import create_access_token
-from app.api.deps import get_db, get_current_user
+from app.core.security import PasswordHasherBusy, create_access_token
+from app.api.deps import get_async_db, get_current_user
 from app.models.user import User
+from app.services.auth_service import auth_service
 from app import crud
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+_BUSY = HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many sign-ins in progress, retry shortly", headers={"Retry-After": "1"})
+
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = crud.user.get_by_email(db, email=user_data.email)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await crud.aio.user.get_by_email(db, email=user_data.email)
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
-    user = crud.user.create(db, obj_in=user_data)
+    try:
+        user = await auth_service.register(db, obj_in=user_data)
+    except PasswordHasherBusy:
+        raise _BUSY
     access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = crud.user.authenticate(db, email=credentials.email, password=credentials.password)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    try:
+        user = await auth_service.authenticate(db, email=credentials.email, password=credentials.password)
+    except PasswordHasherBusy:
+        raise _BUSY
     
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.schemas.chat import ChatMessageResponse
+from app.api.deps import get_async_db
+from app.utils.pagination import encode_cursor, decode_cursor
+from app import crud
+
+router = APIRouter(prefix="/chat", tags=["Chat"])
+
+
+@router.get("/{asteroid_id}/messages", response_model=List[ChatMessageResponse])
+async def get_chat_history(
+    asteroid_id: str, response: Response, limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous (newer) page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stored messages of an asteroid room, newest first"""
+    position = None
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+            position = (datetime.fromisoformat(created_at), int(last_id))
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+    
+    messages = await crud.aio.chat_message.get_by_asteroid(db, asteroid_id=asteroid_id, limit=limit, cursor=position)
+    if len(messages) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor([messages[-1].created_at, messages[-1].id])
+    return messages
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_current_user_id
+from app.services.export_service import EXPORT_MEDIA_TYPES, ExportUnavailableError, export_service
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+class ExportResponse(StreamingResponse):
+    """Frees the export slot however the stream ends, including a client disconnect before the first chunk."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            export_service.release()
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str = Path(..., pattern="^(asteroids|close_approaches)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """Stream a whole table as NDJSON, CSV or Parquet (Parquet needs pyarrow)"""
+    try:
+        writer = export_service.writer(table, format)
+    except ExportUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if not export_service.try_acquire():
+        raise HTTPException(status_code=429, detail="Too many exports in progress", headers={"Retry-After": "30"})
+    return ExportResponse(
+        export_service.stream(table, format, writer=writer), media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    )
@@ -1,48 +1,81 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
-from app.schemas.watchlist import WatchlistCreate, WatchlistUpdate, WatchlistResponse
-from app.api.deps import get_db, get_current_user
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List
+from collections import Counter
+from app.schemas.watchlist import (
+    WatchlistCreate, WatchlistUpdate, WatchlistResponse,
+    WatchlistBulkCreate, WatchlistBulkUpdate, WatchlistBulkRemove, WatchlistBulkResponse
+)
+from app.api.deps import get_db, get_async_db, get_current_user_id
 from app import crud
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/watchlist", tags=["Watchlist"])
 
+_watchlist_list = TypeAdapter(List[WatchlistResponse])
+
 
 @router.get("", response_model=List[WatchlistResponse])
-async def get_user_watchlist(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return crud.watchlist.get_by_user(db, user_id=current_user.id)
+async def get_user_watchlist(current_user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)):
+    rows = await crud.aio.watchlist.get_by_user(db, user_id=current_user_id)
+    return json_response(_watchlist_list, [row._asdict() for row in rows])
 
 
 @router.post("", response_model=WatchlistResponse, status_code=status.HTTP_201_CREATED)
-async def add_to_watchlist(data: WatchlistCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def add_to_watchlist(data: WatchlistCreate, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     asteroid = crud.asteroid.get(db, id=data.asteroid_id)
     if not asteroid:
         raise HTTPException(status_code=404, detail=f"Asteroid {data.asteroid_id} not found")
     
-    existing = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user.id, asteroid_id=data.asteroid_id)
+    existing = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user_id, asteroid_id=data.asteroid_id)
     if existing:
         raise HTTPException(status_code=400, detail="Asteroid already in your watchlist")
     
-    return crud.watchlist.create(db, user_id=current_user.id, asteroid_id=data.asteroid_id, alert_distance_km=data.alert_distance_km)
+    return crud.watchlist.create(db, user_id=current_user_id, asteroid_id=data.asteroid_id, alert_distance_km=data.alert_distance_km)
+
+
+def bulk_response(results: List[Dict]) -> Dict:
+    return {"results": results, "counts": dict(Counter(result["status"] for result in results))}
+
+
+@router.post("/bulk", response_model=WatchlistBulkResponse)
+def bulk_add_to_watchlist(data: WatchlistBulkCreate, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    """Add many asteroids at once; each item reports created, exists or not_found"""
+    items = [(item.asteroid_id, item.alert_distance_km) for item in data.items]
+    return bulk_response(crud.watchlist.bulk_add(db, user_id=current_user_id, items=items))
+
+
+@router.put("/bulk", response_model=WatchlistBulkResponse)
+def bulk_update_watchlist(data: WatchlistBulkUpdate, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    """Update many entries at once; each item reports updated or not_found"""
+    items = [(item.asteroid_id, item.alert_distance_km) for item in data.items]
+    return bulk_response(crud.watchlist.bulk_update(db, user_id=current_user_id, items=items))
+
+
+@router.delete("/bulk", response_model=WatchlistBulkResponse)
+def bulk_remove_from_watchlist(data: WatchlistBulkRemove, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    """Remove many entries at once; each item reports removed or not_found"""
+    return bulk_response(crud.watchlist.bulk_remove(db, user_id=current_user_id, asteroid_ids=data.asteroid_ids))
 
 
 @router.put("/{asteroid_id}", response_model=WatchlistResponse)
-async def update_watchlist_entry(asteroid_id: str, data: WatchlistUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    entry = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user.id, asteroid_id=asteroid_id)
+def update_watchlist_entry(asteroid_id: str, data: WatchlistUpdate, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    entry = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user_id, asteroid_id=asteroid_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Watchlist entry not found")
     return crud.watchlist.update(db, db_obj=entry, obj_in=data)
 
 
 @router.delete("/{asteroid_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_from_watchlist(asteroid_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    entry = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user.id, asteroid_id=asteroid_id)
+def remove_from_watchlist(asteroid_id: str, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    entry = crud.watchlist.get_by_user_and_asteroid(db, user_id=current_user_id, asteroid_id=asteroid_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Watchlist entry not found")
     crud.watchlist.remove(db, id=entry.id)
 
 
 @router.get("/count")
-async def get_watchlist_count(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return {"count": crud.watchlist.count_by_user(db, user_id=current_user.id)}
+async def get_watchlist_count(current_user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)):
+    return {"count": await crud.aio.watchlist.count_by_user(db, user_id=current_user_id)}
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+
+from app.database import SessionLocal, engine
+from app import crud
+from app.services.export_service import EXPORT_TABLES, ExportUnavailableError, export_service
+from app.services.ingest_service import ingest_service
+from app.services.nasa_service import nasa_service
+from app.services.risk_service import refresh_risk_scores
+from app.utils.cache import response_cache
+from app.utils.migrations import run_migrations
+from app.utils.partitions import ensure_monthly_partitions
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    run_migrations(engine)
+    created = ensure_monthly_partitions(engine, args.partitions_from, args.partitions_to) if args.partitions_from else []
+    logger.info(f"Database migrated; {len(created)} partitions created")
+
+
+async def _backfill(args: argparse.Namespace) -> None:
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        stats = await ingest_service.backfill(db, args.start_date, args.end_date, concurrency=args.concurrency)
+        logger.info(f"Backfill complete: {stats['windows']} windows, {stats['asteroids']} asteroids, {stats['approaches']} approaches")
+    finally:
+        db.close()
+        await nasa_service.shutdown()
+
+
+def _rescore(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        count = refresh_risk_scores(db)
+        db.commit()
+        response_cache.invalidate()
+        logger.info(f"Recomputed risk scores for {count} close approaches")
+    finally:
+        db.close()
+
+
+def _reconcile_counters(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        fixed = crud.alert.reconcile_unread_counts(db)
+        db.commit()
+        logger.info(f"Reconciled unread alert counters of {fixed} users")
+    finally:
+        db.close()
+
+
+def _export(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_service.export(db, args.table, args.format, batch_size=args.batch_size):
+            out.write(chunk)
+    except ExportUnavailableError as e:
+        raise SystemExit(str(e))
+    finally:
+        if args.output:
+            out.close()
+        db.close()
+    if args.output:
+        logger.info(f"Exported {args.table} as {args.format} to {args.output}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Cosmic Watch maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Upgrade the database schema to the latest revision")
+    migrate.add_argument("--partitions-from", type=date.fromisoformat, default=None, help="PostgreSQL: create monthly close_approaches partitions from this date")
+    migrate.add_argument("--partitions-to", type=date.fromisoformat, default=date.today())
+
+    backfill = subparsers.add_parser("backfill", help="Fetch and store NASA feed data for an arbitrary date range")
+    backfill.add_argument("--start-date", type=date.fromisoformat, required=True)
+    backfill.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    backfill.add_argument("--concurrency", type=int, default=None)
+
+    subparsers.add_parser("rescore", help="Recompute the stored risk scores of every asteroid and close approach")
+    subparsers.add_parser("reconcile-counters", help="Repair users' unread alert counters from their alerts")
+
+    export = subparsers.add_parser("export", help="Stream a whole table to a file or stdout")
+    export.add_argument("table", choices=sorted(EXPORT_TABLES))
+    export.add_argument("--format", choices=["ndjson", "csv", "parquet"], default="ndjson", help="parquet requires pyarrow")
+    export.add_argument("--output", "-o", default=None, help="File to write; stdout when omitted")
+    export.add_argument("--batch-size", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        _migrate(args)
+    elif args.command == "backfill":
+        asyncio.run(_backfill(args))
+    elif args.command == "rescore":
+        _rescore(args)
+    elif args.command == "reconcile-counters":
+        _reconcile_counters(args)
+    elif args.command == "export":
+        _export(args)
+
+
+if __name__ == "__main__":
+    main()
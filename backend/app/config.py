@@ -1,5 +1,7 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
+import os
 
 
 class Settings(BaseSettings):
@@ -12,10 +14,74 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "SECRET_KEY"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = Field(min(4, os.cpu_count() or 1), ge=1)
+    PASSWORD_HASH_MAX_PENDING: int = Field(64, ge=0)
     
     DATABASE_URL: str = "sqlite:///./data/cosmic_watch.db"
+    DB_AUTO_MIGRATE: bool = True
+    PARTITION_MONTHS_AHEAD: int = 12
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    SQLITE_PROFILE: str = "production"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
     
     NASA_API_KEY: str = "DEMO_KEY"
+    NASA_FEED_CONCURRENCY: int = 4
+    NASA_DEMO_KEY_CONCURRENCY: int = 1
+    NASA_RATE_LIMIT_WARNING: int = 10
+    NASA_HTTP_TIMEOUT: float = 30.0
+    NASA_HTTP_MAX_CONNECTIONS: int = 20
+    NASA_HTTP_MAX_KEEPALIVE: int = 10
+    NASA_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    NASA_HTTP2: bool = True
+    NASA_HTTP_RETRIES: int = 3
+    NASA_HTTP_BACKOFF_BASE: float = 0.5
+    NASA_HTTP_BACKOFF_MAX: float = 30.0
+    NASA_CACHE_ENABLED: bool = True
+    NASA_CACHE_DIR: str = "./data/nasa_cache"
+    NASA_CACHE_TTL_SECONDS: int = 30 * 60
+    NASA_CACHE_HISTORICAL_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    NASA_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    NASA_OFFLINE: bool = False
+    # Longest range POST /asteroids/sync accepts; longer backfills go through `python -m app.cli backfill`
+    SYNC_MAX_DAYS: int = 31
+    
+    INGEST_BATCH_SIZE: int = 500
+    
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 5 * 60
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_MAX_AGE_SECONDS: int = 60
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    
+    # Encode asteroid and alert list responses from prebuilt payloads with orjson instead of validating them
+    FAST_JSON: bool = False
+    
+    EXPORT_BATCH_SIZE: int = 1000
+    # Each running export holds a pooled connection for its whole stream
+    EXPORT_MAX_CONCURRENT: int = 2
+    
+    # /approaches/upcoming is served from an in-memory index of the next TIMELINE_DAYS, rebuilt after ingest
+    TIMELINE_DAYS: int = 30
+    TIMELINE_REFRESH_SECONDS: int = 5 * 60
+    
+    # redis://host:6379/0 to fan Socket.IO events and chat presence out across workers; memory:// for a single process
+    SOCKETIO_MESSAGE_QUEUE: Optional[str] = None
+    SOCKETIO_CHANNEL: str = "cosmic_watch"
+    
+    CHAT_FLUSH_BATCH_SIZE: int = 100
+    CHAT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    CHAT_MAX_PENDING: int = 10000
+    CHAT_HISTORY_REPLAY: int = 50
+    CHAT_MAX_MESSAGE_LENGTH: int = 2000
     
     FRONTEND_URL: str = "http://localhost:8080"
     ALLOWED_ORIGINS: List[str] = ["http://localhost:8080", "http://localhost:5173", "http://localhost:3000"]
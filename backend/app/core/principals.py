@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+
+
+# Recently verified active users by token subject (user id). crud.user.deactivate evicts its user at once in
+# this process; other workers keep accepting a deactivated user for at most the TTL.
+principal_cache = TTLCache(settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES, settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
@@ -1,11 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.config import settings
+from app.utils.metrics import metrics
+import asyncio
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds still verify, and are flagged by verify_and_update for a rehash.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -29,3 +33,56 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool so it never holds up the event loop.
+
+    bcrypt releases the GIL, so the workers hash in parallel. At most ``max_pending`` operations may be
+    running or queued; further callers get PasswordHasherBusy at once instead of waiting behind a queue
+    that only grows during a login burst.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = settings.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.max_pending = settings.PASSWORD_HASH_MAX_PENDING if max_pending is None else max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+    def _set_depth(self) -> None:
+        metrics.set_gauge("password_hasher.pending", self._pending)
+        metrics.set_gauge("password_hasher.queued", max(0, self._pending - self.workers))
+
+    async def _run(self, name: str, func, *args):
+        if self._pending >= self.max_pending:
+            metrics.increment("password_hasher.rejected")
+            raise PasswordHasherBusy(f"{self._pending} password operations already pending")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        self._pending += 1
+        self._set_depth()
+        try:
+            with metrics.timer(f"password_hasher.{name}"):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            self._set_depth()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new_hash); new_hash is set when the stored hash uses outdated cost parameters."""
+        return await self._run("verify", pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
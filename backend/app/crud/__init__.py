@@ -3,5 +3,7 @@ from app.crud.asteroid import asteroid
 from app.crud.close_approach import close_approach
 from app.crud.watchlist import watchlist
 from app.crud.alert import alert
+from app.crud.chat import chat_message
+from app.crud import aio
 
-__all__ = ["user", "asteroid", "close_approach", "watchlist", "alert"]
+__all__ = ["user", "asteroid", "close_approach", "watchlist", "alert", "chat_message", "aio"]
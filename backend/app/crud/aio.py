@@ -0,0 +1,40 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.user import user as _user
+from app.crud.asteroid import asteroid as _asteroid
+from app.crud.close_approach import close_approach as _close_approach
+from app.crud.watchlist import watchlist as _watchlist
+from app.crud.alert import alert as _alert
+from app.crud.chat import chat_message as _chat_message
+
+
+class AsyncCRUD:
+    """Awaitable counterpart of a CRUD object, for handlers that hold an AsyncSession.
+
+    Every method of the wrapped object becomes a coroutine taking the AsyncSession in place of the Session.
+    The call runs through AsyncSession.run_sync, so the queries are shared with the sync path while the
+    driver I/O (aiosqlite/asyncpg) is awaited instead of blocking the event loop. Relationships the caller
+    reads afterwards must be eager-loaded by the wrapped method; lazy loads are not possible outside it.
+    """
+
+    def __init__(self, crud):
+        self._crud = crud
+
+    def __getattr__(self, name: str):
+        method = getattr(self._crud, name)
+        if not callable(method):
+            return method
+
+        async def call(db: AsyncSession, *args, **kwargs):
+            return await db.run_sync(lambda session: method(session, *args, **kwargs))
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+
+user = AsyncCRUD(_user)
+asteroid = AsyncCRUD(_asteroid)
+close_approach = AsyncCRUD(_close_approach)
+watchlist = AsyncCRUD(_watchlist)
+alert = AsyncCRUD(_alert)
+chat_message = AsyncCRUD(_chat_message)
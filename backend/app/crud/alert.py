@@ -1,18 +1,36 @@
 from sqlalchemy.orm import Session, joinedload
-from typing import Optional, List
+from sqlalchemy import Row, delete, func, insert, select, update, or_, and_
+from typing import Optional, List, Tuple
+from collections import Counter
 from datetime import datetime
 from app.models.alert import Alert
+from app.models.user import User
 
 
 class CRUDAlert:
     def get(self, db: Session, id: int) -> Optional[Alert]:
         return db.query(Alert).options(joinedload(Alert.asteroid)).filter(Alert.id == id).first()
 
-    def get_by_user(self, db: Session, *, user_id: int, unread_only: bool = False, limit: int = 50, offset: int = 0) -> List[Alert]:
+    def get_by_user(
+        self, db: Session, *, user_id: int, unread_only: bool = False, limit: int = 50, offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[Alert]:
+        """Newest first. ``cursor`` is the (created_at, id) of the last alert already seen; it replaces offset."""
         query = db.query(Alert).options(joinedload(Alert.asteroid)).filter(Alert.user_id == user_id)
         if unread_only:
             query = query.filter(Alert.is_read == False)
-        return query.order_by(Alert.created_at.desc()).offset(offset).limit(limit).all()
+        if cursor is not None:
+            created_at, last_id = cursor
+            query = query.filter(or_(Alert.created_at < created_at, and_(Alert.created_at == created_at, Alert.id < last_id)))
+            offset = 0
+        return query.order_by(Alert.created_at.desc(), Alert.id.desc()).offset(offset).limit(limit).all()
+
+    def get_after(self, db: Session, *, user_id: int, after_id: int, limit: int = 100) -> List[Alert]:
+        """Alerts created after ``after_id``, oldest first, for clients catching up after a reconnect."""
+        return (
+            db.query(Alert).options(joinedload(Alert.asteroid))
+            .filter(Alert.user_id == user_id, Alert.id > after_id).order_by(Alert.id).limit(limit).all()
+        )
 
     def get_by_user_asteroid_date(self, db: Session, *, user_id: int, asteroid_id: str, approach_date: datetime) -> Optional[Alert]:
         return db.query(Alert).filter(
@@ -20,18 +38,49 @@ class CRUDAlert:
         ).first()
 
     def count_unread(self, db: Session, *, user_id: int) -> int:
-        return db.query(Alert).filter(Alert.user_id == user_id, Alert.is_read == False).count()
+        return db.execute(select(User.unread_alert_count).where(User.id == user_id)).scalar() or 0
+
+    def _adjust_unread(self, db: Session, user_id: int, delta: int) -> None:
+        # A relative UPDATE in the same transaction as the alert change, so concurrent writers cannot lose counts.
+        if delta:
+            db.execute(update(User).where(User.id == user_id).values(unread_alert_count=User.unread_alert_count + delta))
+
+    def reconcile_unread_counts(self, db: Session) -> int:
+        """Reset every counter that drifted from the actual number of unread alerts. Does not commit."""
+        actual = select(func.count(Alert.id)).where(Alert.user_id == User.id, Alert.is_read == False).scalar_subquery()
+        result = db.execute(
+            update(User).where(User.unread_alert_count != actual).values(unread_alert_count=actual),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount
 
     def create(self, db: Session, *, user_id: int, asteroid_id: str, message: str, alert_type: str = "close_approach", approach_date: datetime = None) -> Alert:
         db_obj = Alert(user_id=user_id, asteroid_id=asteroid_id, message=message, alert_type=alert_type, approach_date=approach_date)
         db.add(db_obj)
+        self._adjust_unread(db, user_id, 1)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def bulk_create(self, db: Session, *, alerts: List[dict]) -> List[Row]:
+        """Insert many alerts in one batched statement and return the new rows. Does not commit."""
+        if not alerts:
+            return []
+        now = datetime.utcnow()
+        rows = [{"alert_type": "close_approach", "is_read": False, "created_at": now, **data} for data in alerts]
+        created = db.execute(insert(Alert).returning(*Alert.__table__.columns), rows).all()
+        for user_id, count in Counter(row.user_id for row in created if not row.is_read).items():
+            self._adjust_unread(db, user_id, count)
+        return created
+
     def update(self, db: Session, *, db_obj: Alert, obj_in: dict) -> Alert:
+        is_read = obj_in.get("is_read")
+        if is_read is not None:
+            # Only a row whose flag actually flips moves the counter, even if two requests race.
+            flipped = db.query(Alert).filter(Alert.id == db_obj.id, Alert.is_read == (not is_read)).update({"is_read": is_read})
+            self._adjust_unread(db, db_obj.user_id, -flipped if is_read else flipped)
         for field, value in obj_in.items():
-            if value is not None:
+            if value is not None and field != "is_read":
                 setattr(db_obj, field, value)
         db.commit()
         db.refresh(db_obj)
@@ -39,13 +88,15 @@ class CRUDAlert:
 
     def mark_all_as_read(self, db: Session, *, user_id: int) -> int:
         result = db.query(Alert).filter(Alert.user_id == user_id, Alert.is_read == False).update({"is_read": True})
+        self._adjust_unread(db, user_id, -result)
         db.commit()
         return result
 
     def remove(self, db: Session, *, id: int) -> None:
-        obj = db.query(Alert).filter(Alert.id == id).first()
-        if obj:
-            db.delete(obj)
+        deleted = db.execute(delete(Alert).where(Alert.id == id).returning(Alert.user_id, Alert.is_read)).first()
+        if deleted:
+            if not deleted.is_read:
+                self._adjust_unread(db, deleted.user_id, -1)
             db.commit()
 
 
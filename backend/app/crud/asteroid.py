@@ -1,41 +1,114 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
-from typing import Optional, List
-from datetime import date
+from sqlalchemy.orm import Session, joinedload, selectinload, aliased
+from sqlalchemy import Select, and_, or_, exists, func, select, update, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, Optional, List, Tuple
+from datetime import date, datetime
 from app.models.asteroid import Asteroid
 from app.models.close_approach import CloseApproach
 
 
+_UPSERT_COLUMNS = ("name", "absolute_magnitude", "is_hazardous", "estimated_diameter_min", "estimated_diameter_max", "nasa_jpl_url", "last_updated")
+
+FEED_AGGREGATE_SORTS = {
+    "diameter": lambda: func.max(Asteroid.estimated_diameter_max),
+    "velocity": lambda: func.max(CloseApproach.velocity_kmh),
+    # The asteroid's headline risk, the one the feed displays, rather than the riskiest approach in the window.
+    "risk": lambda: func.max(Asteroid.risk_points)
+}
+
+
+def _asteroid_row(asteroid_data: dict, now: datetime) -> dict:
+    return {
+        "id": asteroid_data["id"], "name": asteroid_data["name"],
+        "absolute_magnitude": asteroid_data.get("absolute_magnitude"),
+        "is_hazardous": asteroid_data.get("is_hazardous", False),
+        "estimated_diameter_min": asteroid_data.get("estimated_diameter_min"),
+        "estimated_diameter_max": asteroid_data.get("estimated_diameter_max"),
+        "nasa_jpl_url": asteroid_data.get("nasa_jpl_url"),
+        "last_updated": now
+    }
+
+
 class CRUDAsteroid:
+    AGGREGATE_SORTS = frozenset(FEED_AGGREGATE_SORTS)
+
     def get(self, db: Session, id: str) -> Optional[Asteroid]:
         return db.query(Asteroid).options(joinedload(Asteroid.close_approaches)).filter(Asteroid.id == id).first()
 
-    def get_feed(
-        self, db: Session, *, start_date: date, end_date: date,
-        is_hazardous: Optional[bool] = None, min_diameter: Optional[float] = None,
-        max_diameter: Optional[float] = None, sort_by: str = "approach_date",
-        limit: int = 50, offset: int = 0
-    ) -> List[Asteroid]:
-        query = db.query(Asteroid).join(Asteroid.close_approaches).filter(
-            CloseApproach.approach_date >= start_date,
-            CloseApproach.approach_date <= end_date
-        )
+    def _feed_page(
+        self, *, start_date: date, end_date: date, is_hazardous: Optional[bool], min_diameter: Optional[float],
+        max_diameter: Optional[float], min_risk: Optional[int], sort_by: str, cursor: Optional[Tuple[Any, str]]
+    ) -> Select:
+        """One (asteroid_id, sort_key) row per asteroid in the window, ordered by (sort_key, asteroid_id)."""
+        def approach_filters(approach):
+            return [approach.approach_date >= start_date, approach.approach_date <= end_date]
         
+        asteroid_filters = []
+        if min_risk is not None:
+            asteroid_filters.append(Asteroid.risk_points >= min_risk)
         if is_hazardous is not None:
-            query = query.filter(Asteroid.is_hazardous == is_hazardous)
+            asteroid_filters.append(Asteroid.is_hazardous == is_hazardous)
         if min_diameter is not None:
-            query = query.filter(Asteroid.estimated_diameter_max >= min_diameter)
+            asteroid_filters.append(Asteroid.estimated_diameter_max >= min_diameter)
         if max_diameter is not None:
-            query = query.filter(Asteroid.estimated_diameter_min <= max_diameter)
+            asteroid_filters.append(Asteroid.estimated_diameter_min <= max_diameter)
         
-        if sort_by == "diameter":
-            query = query.order_by(Asteroid.estimated_diameter_max.desc())
-        elif sort_by == "velocity":
-            query = query.order_by(CloseApproach.velocity_kmh.desc())
-        else:
-            query = query.order_by(CloseApproach.approach_date.asc())
+        if sort_by in FEED_AGGREGATE_SORTS:
+            # Descending aggregates; NULLs sort last as -1 so the keyset comparison stays total.
+            sort_key = func.coalesce(FEED_AGGREGATE_SORTS[sort_by](), -1)
+            id_column = Asteroid.id
+            query = select(id_column.label("asteroid_id"), sort_key.label("sort_key")).join(
+                CloseApproach, CloseApproach.asteroid_id == Asteroid.id
+            ).where(*approach_filters(CloseApproach), *asteroid_filters).group_by(Asteroid.id)
+            if cursor is not None:
+                query = query.having(or_(sort_key < cursor[0], and_(sort_key == cursor[0], id_column > cursor[1])))
+            return query.order_by(sort_key.desc(), id_column.asc())
         
-        return query.distinct().options(joinedload(Asteroid.close_approaches)).offset(offset).limit(limit).all()
+        # Ordered by first approach in the window: keep each asteroid's earliest matching approach row, so the
+        # (approach_date, asteroid_id) index can seek straight to the cursor instead of grouping the whole window.
+        earlier = aliased(CloseApproach)
+        sort_key = CloseApproach.approach_date
+        id_column = CloseApproach.asteroid_id
+        query = select(id_column.label("asteroid_id"), sort_key.label("sort_key")).join(
+            Asteroid, Asteroid.id == CloseApproach.asteroid_id
+        ).where(
+            *approach_filters(CloseApproach), *asteroid_filters,
+            ~exists().where(earlier.asteroid_id == CloseApproach.asteroid_id, earlier.approach_date < CloseApproach.approach_date, *approach_filters(earlier))
+        )
+        if cursor is not None:
+            query = query.where(or_(sort_key > cursor[0], and_(sort_key == cursor[0], id_column > cursor[1])))
+        return query.order_by(sort_key.asc(), id_column.asc())
+
+    def get_feed_page(
+        self, db: Session, *, start_date: date, end_date: date,
+        is_hazardous: Optional[bool] = None, min_diameter: Optional[float] = None,
+        max_diameter: Optional[float] = None, min_risk: Optional[int] = None,
+        sort_by: str = "approach_date", limit: int = 50, offset: int = 0, cursor: Optional[Tuple[Any, str]] = None
+    ) -> Tuple[List[Asteroid], Optional[Tuple[Any, str]]]:
+        """Returns one page of the feed and the (sort_key, asteroid_id) to pass as the next cursor, if any.
+
+        Two phases: the page of IDs is selected on its own (one row per asteroid, limit applied in SQL), then the
+        approaches for just those IDs are loaded with one IN query, so no joined row explosion is ever de-duplicated.
+        """
+        page = db.execute(self._feed_page(
+            start_date=start_date, end_date=end_date, is_hazardous=is_hazardous, min_diameter=min_diameter,
+            max_diameter=max_diameter, min_risk=min_risk, sort_by=sort_by, cursor=cursor
+        ).offset(offset).limit(limit)).all()
+        if not page:
+            return [], None
+        
+        ids = [row.asteroid_id for row in page]
+        by_id = {asteroid.id: asteroid for asteroid in db.query(Asteroid).options(
+            selectinload(Asteroid.close_approaches)
+        ).filter(Asteroid.id.in_(ids))}
+        
+        asteroids = [by_id[asteroid_id] for asteroid_id in ids if asteroid_id in by_id]
+        next_cursor = (page[-1].sort_key, page[-1].asteroid_id) if len(page) == limit else None
+        return asteroids, next_cursor
+
+    def get_feed(self, db: Session, **kwargs) -> List[Asteroid]:
+        return self.get_feed_page(db, **kwargs)[0]
 
     def search(self, db: Session, *, query: str, limit: int = 20) -> List[Asteroid]:
         return db.query(Asteroid).options(joinedload(Asteroid.close_approaches)).filter(
@@ -75,5 +148,29 @@ class CRUDAsteroid:
             return existing
         return self.create(db, asteroid_data=asteroid_data)
 
+    def bulk_upsert(self, db: Session, *, asteroids_data: List[dict]) -> Tuple[int, int]:
+        """Set-based upsert of a batch of asteroids. Does not commit; returns (created, updated)."""
+        now = datetime.utcnow()
+        rows = {data["id"]: _asteroid_row(data, now) for data in asteroids_data}
+        if not rows:
+            return 0, 0
+
+        existing = set(db.scalars(select(Asteroid.id).where(Asteroid.id.in_(list(rows)))))
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(Asteroid)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Asteroid.id], set_={col: getattr(stmt.excluded, col) for col in _UPSERT_COLUMNS}
+            )
+            db.execute(stmt, list(rows.values()))
+        else:
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            old_rows = [row for key, row in rows.items() if key in existing]
+            if new_rows:
+                db.execute(insert(Asteroid), new_rows)
+            if old_rows:
+                db.execute(update(Asteroid), old_rows)
+        return len(rows) - len(existing), len(existing)
+
 
 asteroid = CRUDAsteroid()
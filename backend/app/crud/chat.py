@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_, and_
+from typing import Optional, List, Tuple
+from datetime import datetime
+from app.models.chat import ChatMessage
+
+
+class CRUDChatMessage:
+    def get_by_asteroid(self, db: Session, *, asteroid_id: str, limit: int = 50, cursor: Optional[Tuple[datetime, int]] = None) -> List[ChatMessage]:
+        """Newest first. ``cursor`` is the (created_at, id) of the oldest message already seen."""
+        query = db.query(ChatMessage).filter(ChatMessage.asteroid_id == asteroid_id)
+        if cursor is not None:
+            created_at, last_id = cursor
+            query = query.filter(or_(ChatMessage.created_at < created_at, and_(ChatMessage.created_at == created_at, ChatMessage.id < last_id)))
+        return query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit).all()
+
+    def bulk_create(self, db: Session, *, messages: List[dict]) -> int:
+        """Insert many messages with one executemany statement. Does not commit."""
+        if not messages:
+            return 0
+        db.execute(insert(ChatMessage), messages)
+        return len(messages)
+
+
+chat_message = CRUDChatMessage()
@@ -1,9 +1,17 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy import Row, or_, select, update, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List, Tuple
 from datetime import date, datetime, timedelta
+from app.models.asteroid import Asteroid
 from app.models.close_approach import CloseApproach
 
 
+_TRACKED_COLUMNS = ("approach_date_full", "velocity_kmh", "miss_distance_km", "miss_distance_lunar", "orbiting_body")
+_UPSERT_COLUMNS = _TRACKED_COLUMNS + ("updated_at",)
+
+
 def _parse_approach_date_full(value) -> Optional[datetime]:
     if value is None:
         return None
@@ -21,6 +29,24 @@ def _parse_approach_date_full(value) -> Optional[datetime]:
     return None
 
 
+def _parse_approach_date(value) -> Optional[date]:
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def _approach_row(asteroid_id: str, approach_data: dict) -> dict:
+    return {
+        "asteroid_id": asteroid_id,
+        "approach_date": _parse_approach_date(approach_data.get("approach_date")),
+        "approach_date_full": _parse_approach_date_full(approach_data.get("approach_date_full")),
+        "velocity_kmh": approach_data.get("velocity_kmh"),
+        "miss_distance_km": approach_data.get("miss_distance_km"),
+        "miss_distance_lunar": approach_data.get("miss_distance_lunar"),
+        "orbiting_body": approach_data.get("orbiting_body", "Earth")
+    }
+
+
 class CRUDCloseApproach:
     def get(self, db: Session, id: int) -> Optional[CloseApproach]:
         return db.query(CloseApproach).filter(CloseApproach.id == id).first()
@@ -40,28 +66,29 @@ class CRUDCloseApproach:
             CloseApproach.approach_date >= today, CloseApproach.approach_date <= future
         ).order_by(CloseApproach.approach_date.asc()).limit(limit).all()
 
+    def get_timeline(self, db: Session, *, start_date: date, end_date: date) -> List[Row]:
+        """Approaches between the two dates with the asteroid summary, as rows for the approach timeline."""
+        return db.execute(
+            select(
+                CloseApproach.id, CloseApproach.asteroid_id, CloseApproach.approach_date, CloseApproach.approach_date_full,
+                CloseApproach.velocity_kmh, CloseApproach.miss_distance_km, CloseApproach.miss_distance_lunar,
+                CloseApproach.orbiting_body, CloseApproach.risk_points, CloseApproach.risk_score, Asteroid.name,
+                Asteroid.is_hazardous, Asteroid.absolute_magnitude, Asteroid.estimated_diameter_min,
+                Asteroid.estimated_diameter_max, Asteroid.risk_score.label("asteroid_risk_score")
+            )
+            .join(Asteroid, Asteroid.id == CloseApproach.asteroid_id)
+            .where(CloseApproach.approach_date >= start_date, CloseApproach.approach_date <= end_date)
+        ).all()
+
     def create(self, db: Session, *, asteroid_id: str, approach_data: dict) -> CloseApproach:
-        approach_date = approach_data.get("approach_date")
-        if isinstance(approach_date, str):
-            approach_date = datetime.strptime(approach_date, "%Y-%m-%d").date()
-        
-        db_obj = CloseApproach(
-            asteroid_id=asteroid_id, approach_date=approach_date,
-            approach_date_full=_parse_approach_date_full(approach_data.get("approach_date_full")),
-            velocity_kmh=approach_data.get("velocity_kmh"),
-            miss_distance_km=approach_data.get("miss_distance_km"),
-            miss_distance_lunar=approach_data.get("miss_distance_lunar"),
-            orbiting_body=approach_data.get("orbiting_body", "Earth")
-        )
+        db_obj = CloseApproach(**_approach_row(asteroid_id, approach_data))
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def upsert(self, db: Session, *, asteroid_id: str, approach_data: dict) -> CloseApproach:
-        approach_date = approach_data.get("approach_date")
-        if isinstance(approach_date, str):
-            approach_date = datetime.strptime(approach_date, "%Y-%m-%d").date()
+        approach_date = _parse_approach_date(approach_data.get("approach_date"))
         
         existing = db.query(CloseApproach).filter(
             CloseApproach.asteroid_id == asteroid_id, CloseApproach.approach_date == approach_date
@@ -78,5 +105,53 @@ class CRUDCloseApproach:
             return existing
         return self.create(db, asteroid_id=asteroid_id, approach_data=approach_data)
 
+    def bulk_upsert(self, db: Session, *, approaches: List[Tuple[str, dict]]) -> Tuple[int, int]:
+        """Upsert (asteroid_id, approach_data) pairs on the unique (asteroid_id, approach_date) index.
+
+        Existing rows are only written, and their updated_at bumped, when a tracked column changed, so alert
+        generation does not rescan approaches that every sync re-fetches unchanged. Does not commit; returns
+        (created, updated), where updated counts the existing rows matched.
+        """
+        rows = {}
+        for asteroid_id, approach_data in approaches:
+            row = _approach_row(asteroid_id, approach_data)
+            rows[(row["asteroid_id"], row["approach_date"])] = row
+        if not rows:
+            return 0, 0
+
+        asteroid_ids = {key[0] for key in rows}
+        approach_dates = {key[1] for key in rows}
+        existing = {
+            (row.asteroid_id, row.approach_date): row
+            for row in db.execute(
+                select(CloseApproach.id, CloseApproach.asteroid_id, CloseApproach.approach_date, *(getattr(CloseApproach, col) for col in _TRACKED_COLUMNS)).where(
+                    CloseApproach.asteroid_id.in_(asteroid_ids), CloseApproach.approach_date.in_(approach_dates)
+                )
+            )
+        }
+
+        now = datetime.utcnow()
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(CloseApproach)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CloseApproach.asteroid_id, CloseApproach.approach_date],
+                set_={col: getattr(stmt.excluded, col) for col in _UPSERT_COLUMNS},
+                where=or_(*(getattr(CloseApproach, col).is_distinct_from(getattr(stmt.excluded, col)) for col in _TRACKED_COLUMNS))
+            )
+            db.execute(stmt, [{**row, "updated_at": now} for row in rows.values()])
+            return len(rows) - len(existing), len(existing)
+
+        new_rows = [{**row, "updated_at": now} for key, row in rows.items() if key not in existing]
+        old_rows = [
+            {**row, "id": existing[key].id, "updated_at": now} for key, row in rows.items()
+            if key in existing and any(getattr(existing[key], col) != row[col] for col in _TRACKED_COLUMNS)
+        ]
+        if new_rows:
+            db.execute(insert(CloseApproach), new_rows)
+        if old_rows:
+            db.execute(update(CloseApproach), old_rows)
+        return len(new_rows), len(existing)
+
 
 close_approach = CRUDCloseApproach()
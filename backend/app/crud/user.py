@@ -3,6 +3,7 @@ from typing import Optional
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash, verify_password
+from app.core.principals import principal_cache
 
 
 class CRUDUser:
@@ -12,8 +13,9 @@ class CRUDUser:
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(email=obj_in.email, password_hash=get_password_hash(obj_in.password))
+    def create(self, db: Session, *, obj_in: UserCreate, password_hash: Optional[str] = None) -> User:
+        """``password_hash`` is the already hashed password; without it the password is hashed inline."""
+        db_obj = User(email=obj_in.email, password_hash=password_hash or get_password_hash(obj_in.password))
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -25,9 +27,16 @@ class CRUDUser:
             return None
         return user
 
+    def update_password_hash(self, db: Session, *, user: User, password_hash: str) -> User:
+        user.password_hash = password_hash
+        db.commit()
+        db.refresh(user)
+        return user
+
     def deactivate(self, db: Session, *, user: User) -> User:
         user.is_active = False
         db.commit()
+        principal_cache.delete(user.id)
         db.refresh(user)
         return user
 
@@ -1,5 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
-from typing import Optional, List
+from sqlalchemy import Row, select, insert, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List, Dict, Tuple
+from datetime import date, datetime
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
 from app.models.watchlist import Watchlist
 
 
@@ -7,10 +13,25 @@ class CRUDWatchlist:
     def get(self, db: Session, id: int) -> Optional[Watchlist]:
         return db.query(Watchlist).filter(Watchlist.id == id).first()
 
-    def get_by_user(self, db: Session, *, user_id: int) -> List[Watchlist]:
-        return db.query(Watchlist).options(joinedload(Watchlist.asteroid)).filter(
-            Watchlist.user_id == user_id
-        ).order_by(Watchlist.created_at.desc()).all()
+    def get_by_user(self, db: Session, *, user_id: int) -> List[Row]:
+        """The user's entries, newest first, as rows holding exactly the WatchlistResponse fields.
+
+        Columns are selected instead of entities, so large watchlists build no ORM objects; the next
+        approach is a correlated MIN served by the (asteroid_id, approach_date) index.
+        """
+        next_approach = (
+            select(func.min(CloseApproach.approach_date))
+            .where(CloseApproach.asteroid_id == Watchlist.asteroid_id, CloseApproach.approach_date >= date.today())
+            .correlate(Watchlist).scalar_subquery()
+        )
+        return db.execute(
+            select(
+                Watchlist.id, Watchlist.user_id, Watchlist.asteroid_id, Watchlist.alert_distance_km, Watchlist.created_at,
+                Asteroid.name.label("asteroid_name"), next_approach.label("next_approach_date")
+            )
+            .outerjoin(Asteroid, Asteroid.id == Watchlist.asteroid_id)
+            .where(Watchlist.user_id == user_id).order_by(Watchlist.created_at.desc(), Watchlist.id.desc())
+        ).all()
 
     def get_by_user_and_asteroid(self, db: Session, *, user_id: int, asteroid_id: str) -> Optional[Watchlist]:
         return db.query(Watchlist).filter(
@@ -48,5 +69,69 @@ class CRUDWatchlist:
             db.delete(obj)
             db.commit()
 
+    def bulk_add(self, db: Session, *, user_id: int, items: List[Tuple[str, float]]) -> List[Dict]:
+        """Add (asteroid_id, alert_distance_km) pairs in one transaction; one result per distinct asteroid_id.
+
+        Unknown asteroids are found with one IN query, and the insert skips pairs already watched through the
+        unique_user_asteroid constraint, so concurrent imports cannot fail on duplicates.
+        """
+        distances = dict(items)
+        names = dict(db.execute(select(Asteroid.id, Asteroid.name).where(Asteroid.id.in_(distances))).all())
+        now = datetime.utcnow()
+        rows = [
+            {"user_id": user_id, "asteroid_id": asteroid_id, "alert_distance_km": distance, "created_at": now, "updated_at": now}
+            for asteroid_id, distance in distances.items() if asteroid_id in names
+        ]
+
+        created = {}
+        if rows:
+            columns = (Watchlist.id, Watchlist.user_id, Watchlist.asteroid_id, Watchlist.alert_distance_km, Watchlist.created_at)
+            dialect = db.get_bind().dialect.name
+            if dialect in ("sqlite", "postgresql"):
+                stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(Watchlist).values(rows)
+                stmt = stmt.on_conflict_do_nothing(index_elements=[Watchlist.user_id, Watchlist.asteroid_id]).returning(*columns)
+                created = {row.asteroid_id: row for row in db.execute(stmt)}
+            else:
+                watched = set(db.scalars(select(Watchlist.asteroid_id).where(
+                    Watchlist.user_id == user_id, Watchlist.asteroid_id.in_([row["asteroid_id"] for row in rows])
+                )))
+                new_rows = [row for row in rows if row["asteroid_id"] not in watched]
+                if new_rows:
+                    created = {row.asteroid_id: row for row in db.execute(insert(Watchlist).returning(*columns), new_rows)}
+            db.commit()
+
+        results = []
+        for asteroid_id in distances:
+            if asteroid_id not in names:
+                results.append({"asteroid_id": asteroid_id, "status": "not_found", "entry": None})
+            elif asteroid_id in created:
+                results.append({"asteroid_id": asteroid_id, "status": "created", "entry": {**created[asteroid_id]._mapping, "asteroid_name": names[asteroid_id]}})
+            else:
+                results.append({"asteroid_id": asteroid_id, "status": "exists", "entry": None})
+        return results
+
+    def bulk_update(self, db: Session, *, user_id: int, items: List[Tuple[str, float]]) -> List[Dict]:
+        """Set alert_distance_km for (asteroid_id, alert_distance_km) pairs with one lookup and one executemany UPDATE."""
+        distances = dict(items)
+        ids = dict(db.execute(select(Watchlist.asteroid_id, Watchlist.id).where(
+            Watchlist.user_id == user_id, Watchlist.asteroid_id.in_(distances)
+        )).all())
+        if ids:
+            now = datetime.utcnow()
+            db.execute(update(Watchlist), [
+                {"id": ids[asteroid_id], "alert_distance_km": distance, "updated_at": now}
+                for asteroid_id, distance in distances.items() if asteroid_id in ids
+            ])
+            db.commit()
+        return [{"asteroid_id": asteroid_id, "status": "updated" if asteroid_id in ids else "not_found", "entry": None} for asteroid_id in distances]
+
+    def bulk_remove(self, db: Session, *, user_id: int, asteroid_ids: List[str]) -> List[Dict]:
+        asteroid_ids = list(dict.fromkeys(asteroid_ids))
+        removed = set(db.scalars(
+            delete(Watchlist).where(Watchlist.user_id == user_id, Watchlist.asteroid_id.in_(asteroid_ids)).returning(Watchlist.asteroid_id)
+        ))
+        db.commit()
+        return [{"asteroid_id": asteroid_id, "status": "removed" if asteroid_id in removed else "not_found", "entry": None} for asteroid_id in asteroid_ids]
+
 
 watchlist = CRUDWatchlist()
@@ -1,16 +1,90 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from typing import Any, Dict, Optional
 from app.config import settings
 
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=settings.DEBUG
-)
+
+def async_database_url(url: str) -> str:
+    """The async-driver equivalent of a sync DATABASE_URL (aiosqlite for SQLite, asyncpg for Postgres)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.drivername in ASYNC_DRIVERS.values() or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def sqlite_pragmas(profile: Optional[str] = None) -> Dict[str, Any]:
+    """PRAGMAs applied to every new SQLite connection for a storage profile.
+
+    "default" keeps SQLite's own settings (rollback journal, synchronous=FULL). "production" switches to WAL so
+    readers are never blocked by the ingest writer, relaxes fsyncs to once per checkpoint, which is still safe
+    against corruption in WAL mode, and gives each connection a larger page cache and a memory map.
+    """
+    profile = profile or settings.SQLITE_PROFILE
+    if profile == "default":
+        return {"busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS}
+    if profile == "production":
+        return {
+            "journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+            "cache_size": -settings.SQLITE_CACHE_SIZE_KB, "mmap_size": settings.SQLITE_MMAP_SIZE, "temp_store": "MEMORY"
+        }
+    raise ValueError(f"Unknown SQLITE_PROFILE {profile!r}; expected 'default' or 'production'")
+
+
+def apply_sqlite_pragmas(engine, profile: Optional[str] = None) -> None:
+    pragmas = sqlite_pragmas(profile)
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW, "pool_timeout": settings.DB_POOL_TIMEOUT, "pool_recycle": settings.DB_POOL_RECYCLE, "pool_pre_ping": True}
+    if parsed.database in (None, "", ":memory:"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {"connect_args": {"check_same_thread": False}, "pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW, "pool_timeout": settings.DB_POOL_TIMEOUT}
+
+
+def create_db_engine(url: str, profile: Optional[str] = None) -> Engine:
+    db_engine = create_engine(url, echo=settings.DEBUG, **_engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(db_engine, profile)
+    return db_engine
+
+
+def create_async_db_engine(url: str, profile: Optional[str] = None) -> AsyncEngine:
+    url = async_database_url(url)
+    options = _engine_options(url)
+    options.pop("connect_args", None)
+    db_engine = create_async_engine(url, echo=settings.DEBUG, **options)
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(db_engine, profile)
+    return db_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+
+# Objects handed back to request handlers must stay readable after commit without a lazy refresh,
+# which an AsyncSession cannot do implicitly.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -22,3 +96,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,13 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from datetime import date
 import logging
 import os
 
 from app.config import settings
-from app.database import engine, Base
-from app.api.v1 import auth, asteroids, watchlist, alerts
+from app.database import engine, async_engine
+from app.api.v1 import auth, asteroids, watchlist, alerts, chat, approaches, export
 from app.utils.scheduler import asteroid_scheduler
+from app.utils.metrics import metrics
+from app.services.nasa_service import nasa_service
+from app.utils.migrations import run_migrations
+from app.utils.partitions import add_months, ensure_monthly_partitions
+from app.services.chat_service import chat_service
+from app.core.security import password_hasher
+from app.utils.websocket import presence
 
 logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,8 +29,12 @@ async def lifespan(app: FastAPI):
     if data_dir and not os.path.exists(data_dir):
         os.makedirs(data_dir, exist_ok=True)
     
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables ready")
+    if settings.DB_AUTO_MIGRATE:
+        run_migrations(engine)
+        ensure_monthly_partitions(engine, date.today(), add_months(date.today(), settings.PARTITION_MONTHS_AHEAD))
+        logger.info("✅ Database schema up to date")
+    
+    await nasa_service.startup()
     
     if settings.ENABLE_SCHEDULER:
         asteroid_scheduler.start()
@@ -34,6 +46,11 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down...")
     if settings.ENABLE_SCHEDULER:
         asteroid_scheduler.shutdown()
+    await nasa_service.shutdown()
+    await chat_service.shutdown()
+    password_hasher.shutdown()
+    await presence.close()
+    await async_engine.dispose()
     logger.info("👋 Goodbye!")
 
 
@@ -59,6 +76,9 @@ fastapi_app.include_router(auth.router, prefix="/api/v1")
 fastapi_app.include_router(asteroids.router, prefix="/api/v1")
 fastapi_app.include_router(watchlist.router, prefix="/api/v1")
 fastapi_app.include_router(alerts.router, prefix="/api/v1")
+fastapi_app.include_router(chat.router, prefix="/api/v1")
+fastapi_app.include_router(approaches.router, prefix="/api/v1")
+fastapi_app.include_router(export.router, prefix="/api/v1")
 
 
 @fastapi_app.get("/", tags=["Root"])
@@ -71,6 +91,11 @@ async def health_check():
     return {"status": "healthy", "version": settings.VERSION}
 
 
+@fastapi_app.get("/metrics", tags=["Health"])
+async def get_metrics():
+    return metrics.snapshot()
+
+
 # Socket.IO WebSocket integration
 from app.utils.websocket import sio
 import socketio
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -6,13 +6,18 @@ from app.database import Base
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_user_created", "user_id", "created_at", "id"),
+        Index("ix_alerts_user_read_created", "user_id", "is_read", "created_at", "id"),
+        Index("ix_alerts_user_asteroid_date", "user_id", "asteroid_id", "approach_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     asteroid_id = Column(String(20), ForeignKey("asteroids.id"), nullable=False, index=True)
     message = Column(String(500), nullable=False)
     alert_type = Column(String(50), default="close_approach")
-    is_read = Column(Boolean, default=False, index=True)
+    is_read = Column(Boolean, default=False)
     approach_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,9 @@ class Asteroid(Base):
     estimated_diameter_min = Column(Float, nullable=True)
     estimated_diameter_max = Column(Float, nullable=True)
     nasa_jpl_url = Column(String(500), nullable=True)
+    risk_points = Column(Integer, nullable=True, index=True)
+    risk_score = Column(String(10), nullable=True)
+    closest_approach_km = Column(Float, nullable=True)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     close_approaches = relationship("CloseApproach", back_populates="asteroid", cascade="all, delete-orphan")
@@ -1,19 +1,29 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database import Base
 
 
 class CloseApproach(Base):
     __tablename__ = "close_approaches"
+    __table_args__ = (
+        Index("ix_close_approaches_asteroid_date", "asteroid_id", "approach_date", unique=True),
+        Index("ix_close_approaches_date_asteroid", "approach_date", "asteroid_id"),
+        Index("ix_close_approaches_date_distance", "approach_date", "miss_distance_km"),
+        Index("ix_close_approaches_date_risk", "approach_date", "risk_points"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    asteroid_id = Column(String(20), ForeignKey("asteroids.id"), nullable=False, index=True)
-    approach_date = Column(Date, nullable=False, index=True)
+    asteroid_id = Column(String(20), ForeignKey("asteroids.id"), nullable=False)
+    approach_date = Column(Date, nullable=False)
     approach_date_full = Column(DateTime, nullable=True)
     velocity_kmh = Column(Float, nullable=True)
     miss_distance_km = Column(Float, nullable=True)
     miss_distance_lunar = Column(Float, nullable=True)
     orbiting_body = Column(String(50), default="Earth")
+    risk_points = Column(Integer, nullable=True)
+    risk_score = Column(String(10), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     asteroid = relationship("Asteroid", back_populates="close_approaches")
     
@@ -13,10 +13,15 @@ class Watchlist(Base):
     asteroid_id = Column(String(20), ForeignKey("asteroids.id"), nullable=False, index=True)
     alert_distance_km = Column(Float, default=1000000.0)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     user = relationship("User", back_populates="watchlist")
     asteroid = relationship("Asteroid", back_populates="watchlist_entries")
     
+    @property
+    def asteroid_name(self):
+        return self.asteroid.name if self.asteroid else None
+    
     def __repr__(self):
         return f"<Watchlist(user={self.user_id}, asteroid={self.asteroid_id})>"
 
@@ -1,11 +1,21 @@
 from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, Token, TokenData
-from app.schemas.asteroid import AsteroidBase, AsteroidResponse, CloseApproachBase, CloseApproachResponse, AsteroidFeedResponse
-from app.schemas.watchlist import WatchlistCreate, WatchlistUpdate, WatchlistResponse
-from app.schemas.alert import AlertResponse, AlertUpdate
+from app.schemas.asteroid import (
+    AsteroidBase, AsteroidResponse, CloseApproachBase, CloseApproachResponse, AsteroidFeedResponse,
+    AsteroidSummary, UpcomingApproachResponse
+)
+from app.schemas.watchlist import (
+    WatchlistCreate, WatchlistUpdate, WatchlistResponse,
+    WatchlistBulkCreate, WatchlistBulkUpdate, WatchlistBulkRemove, WatchlistBulkResponse
+)
+from app.schemas.alert import AlertResponse, AlertUpdate, AlertDeltaResponse
+from app.schemas.chat import ChatMessageResponse
 
 __all__ = [
     "UserBase", "UserCreate", "UserLogin", "UserResponse", "Token", "TokenData",
     "AsteroidBase", "AsteroidResponse", "CloseApproachBase", "CloseApproachResponse", "AsteroidFeedResponse",
+    "AsteroidSummary", "UpcomingApproachResponse",
     "WatchlistCreate", "WatchlistUpdate", "WatchlistResponse",
-    "AlertResponse", "AlertUpdate"
+    "WatchlistBulkCreate", "WatchlistBulkUpdate", "WatchlistBulkRemove", "WatchlistBulkResponse",
+    "AlertResponse", "AlertUpdate", "AlertDeltaResponse",
+    "ChatMessageResponse"
 ]
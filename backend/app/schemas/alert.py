@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -19,3 +19,10 @@ class AlertResponse(BaseModel):
 
 class AlertUpdate(BaseModel):
     is_read: Optional[bool] = None
+
+
+class AlertDeltaResponse(BaseModel):
+    alerts: List[AlertResponse]
+    last_id: int
+    has_more: bool
+    unread_count: int
@@ -15,6 +15,7 @@ class CloseApproachBase(BaseModel):
 class CloseApproachResponse(CloseApproachBase):
     id: int
     asteroid_id: str
+    risk_score: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -33,6 +34,7 @@ class AsteroidResponse(AsteroidBase):
     last_updated: Optional[datetime] = None
     close_approaches: List[CloseApproachResponse] = []
     risk_score: Optional[str] = None
+    closest_approach_km: Optional[float] = None
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -40,3 +42,21 @@ class AsteroidResponse(AsteroidBase):
 class AsteroidFeedResponse(BaseModel):
     count: int
     asteroids: List[AsteroidResponse]
+    next_cursor: Optional[str] = None
+
+
+class AsteroidSummary(BaseModel):
+    id: str
+    name: str
+    is_hazardous: bool = False
+    absolute_magnitude: Optional[float] = None
+    estimated_diameter_min: Optional[float] = None
+    estimated_diameter_max: Optional[float] = None
+    risk_score: Optional[str] = None
+
+
+class UpcomingApproachResponse(CloseApproachBase):
+    id: int
+    asteroid_id: str
+    risk_score: Optional[str] = None
+    asteroid: AsteroidSummary
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class ChatMessageResponse(BaseModel):
+    id: int
+    asteroid_id: str
+    user_id: Optional[int] = None
+    user_email: Optional[str] = None
+    message: str
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
-from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime
+
+BULK_MAX_ITEMS = 1000
 
 
 class WatchlistCreate(BaseModel):
@@ -19,5 +21,34 @@ class WatchlistResponse(BaseModel):
     alert_distance_km: float
     created_at: datetime
     asteroid_name: Optional[str] = None
+    next_approach_date: Optional[date] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class WatchlistBulkCreate(BaseModel):
+    items: List[WatchlistCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class WatchlistBulkUpdateItem(BaseModel):
+    asteroid_id: str
+    alert_distance_km: float = Field(..., gt=0)
+
+
+class WatchlistBulkUpdate(BaseModel):
+    items: List[WatchlistBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class WatchlistBulkRemove(BaseModel):
+    asteroid_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class WatchlistBulkItemResult(BaseModel):
+    asteroid_id: str
+    status: Literal["created", "exists", "updated", "removed", "not_found"]
+    entry: Optional[WatchlistResponse] = None
+
+
+class WatchlistBulkResponse(BaseModel):
+    results: List[WatchlistBulkItemResult]
+    counts: Dict[str, int]
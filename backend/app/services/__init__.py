@@ -1,5 +1,6 @@
 from app.services.nasa_service import nasa_service
-from app.services.risk_service import calculate_risk_score
+from app.services.risk_service import calculate_risk_score, calculate_risk_scores
 from app.services.alert_service import alert_service
+from app.services.ingest_service import ingest_service
 
-__all__ = ["nasa_service", "calculate_risk_score", "alert_service"]
+__all__ = ["nasa_service", "calculate_risk_score", "calculate_risk_scores", "alert_service", "ingest_service"]
@@ -1,5 +1,12 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, or_
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from app.models.alert import Alert
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+from app.models.watchlist import Watchlist
+from app.schemas.alert import AlertResponse
 from app import crud
 import logging
 
@@ -7,38 +14,72 @@ logger = logging.getLogger(__name__)
 
 
 class AlertService:
-    def generate_alerts_for_approaches(self, db: Session) -> int:
-        all_watchlist = crud.watchlist.get_all(db)
-        alerts_created = 0
-        
-        for entry in all_watchlist:
-            asteroid = entry.asteroid
-            if not asteroid or not asteroid.close_approaches:
-                continue
-            
-            today = datetime.now().date()
-            future_date = (datetime.now() + timedelta(days=30)).date()
-            
-            upcoming = [a for a in asteroid.close_approaches if today <= a.approach_date <= future_date]
-            
-            for approach in upcoming:
-                if approach.miss_distance_km and approach.miss_distance_km <= entry.alert_distance_km:
-                    existing = crud.alert.get_by_user_asteroid_date(
-                        db, user_id=entry.user_id, asteroid_id=asteroid.id, approach_date=approach.approach_date_full
-                    )
-                    
-                    if not existing:
-                        lunar_dist = approach.miss_distance_lunar or 0
-                        message = f"🚨 Close Approach: {asteroid.name} will pass within {lunar_dist:.2f} lunar distances on {approach.approach_date.strftime('%B %d, %Y')}"
-                        if asteroid.is_hazardous:
-                            message = f"⚠️ HAZARDOUS - {message}"
-                        
-                        crud.alert.create(db, user_id=entry.user_id, asteroid_id=asteroid.id, message=message,
-                                         alert_type="close_approach", approach_date=approach.approach_date_full)
-                        alerts_created += 1
-        
-        logger.info(f"Generated {alerts_created} new alerts")
-        return alerts_created
+    ALERT_WINDOW_DAYS = 30
+    # Rows stamped just before the previous run may have committed after it started; re-scanning them is
+    # harmless because existing alerts are excluded by the anti-join.
+    INCREMENTAL_OVERLAP = timedelta(minutes=5)
+
+    def __init__(self):
+        self.last_run_at: Optional[datetime] = None
+        self.last_horizon = None
+
+    def generate_alerts_for_approaches(self, db: Session, incremental: bool = False) -> int:
+        return len(self.generate(db, incremental=incremental))
+
+    def generate(self, db: Session, incremental: bool = False) -> List[Dict]:
+        """Create the missing alerts and return them as AlertResponse payloads, ready to push to their users."""
+        started_at = datetime.utcnow()
+        today = datetime.now().date()
+        horizon = today + timedelta(days=self.ALERT_WINDOW_DAYS)
+
+        # Every watched approach inside the window and the user's alert distance that has no alert yet.
+        query = (
+            select(
+                Watchlist.user_id, Asteroid.id, Asteroid.name, Asteroid.is_hazardous,
+                CloseApproach.approach_date, CloseApproach.approach_date_full, CloseApproach.miss_distance_lunar
+            )
+            .join(Asteroid, Asteroid.id == Watchlist.asteroid_id)
+            .join(CloseApproach, CloseApproach.asteroid_id == Watchlist.asteroid_id)
+            .outerjoin(Alert, and_(
+                Alert.user_id == Watchlist.user_id, Alert.asteroid_id == Watchlist.asteroid_id,
+                Alert.approach_date.is_not_distinct_from(CloseApproach.approach_date_full)
+            ))
+            .where(
+                CloseApproach.approach_date >= today, CloseApproach.approach_date <= horizon,
+                CloseApproach.miss_distance_km.is_not(None), CloseApproach.miss_distance_km != 0,
+                CloseApproach.miss_distance_km <= Watchlist.alert_distance_km,
+                Alert.id.is_(None)
+            )
+        )
+
+        if incremental and self.last_run_at is not None:
+            # Only rows written since the last run, plus approaches that have just entered the window.
+            since = self.last_run_at - self.INCREMENTAL_OVERLAP
+            query = query.where(or_(
+                CloseApproach.updated_at >= since,
+                Watchlist.updated_at >= since,
+                CloseApproach.approach_date > self.last_horizon
+            ))
+
+        alerts, names = {}, {}
+        for user_id, asteroid_id, name, is_hazardous, approach_date, approach_date_full, lunar_dist in db.execute(query):
+            message = f"🚨 Close Approach: {name} will pass within {lunar_dist or 0:.2f} lunar distances on {approach_date.strftime('%B %d, %Y')}"
+            if is_hazardous:
+                message = f"⚠️ HAZARDOUS - {message}"
+            names[asteroid_id] = name
+            alerts[(user_id, asteroid_id, approach_date_full)] = {
+                "user_id": user_id, "asteroid_id": asteroid_id, "message": message, "approach_date": approach_date_full
+            }
+
+        created = [
+            AlertResponse.model_validate({**row._mapping, "asteroid_name": names[row.asteroid_id]}).model_dump(mode="json")
+            for row in crud.alert.bulk_create(db, alerts=list(alerts.values()))
+        ]
+        db.commit()
+        self.last_run_at, self.last_horizon = started_at, horizon
+
+        logger.info(f"Generated {len(created)} new alerts ({'incremental' if incremental else 'full'} scan)")
+        return created
 
 
 alert_service = AlertService()
@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.security import password_hasher
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app import crud
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AuthService:
+    """Registration and login with bcrypt on the password hasher pool instead of the request's thread."""
+
+    async def register(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        password_hash = await password_hasher.hash(obj_in.password)
+        return await crud.aio.user.create(db, obj_in=obj_in, password_hash=password_hash)
+
+    async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        user = await crud.aio.user.get_by_email(db, email=email)
+        if not user:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+        if not valid:
+            return None
+        if new_hash:
+            # The cost parameters changed since this hash was made; the plaintext is only at hand now.
+            user = await crud.aio.user.update_password_hash(db, user=user, password_hash=new_hash)
+            logger.info(f"Rehashed password of user {user.id} with current bcrypt parameters")
+        return user
+
+
+auth_service = AuthService()
@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.utils.metrics import metrics
+from app import crud
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime) -> datetime:
+    # created_at is timezone-aware on PostgreSQL but comes back naive (UTC) from SQLite.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class ChatService:
+    """Write-behind store for asteroid room chat.
+
+    Messages are broadcast as soon as they are sent and queued here. The queue is written with one
+    executemany INSERT and one commit per CHAT_FLUSH_BATCH_SIZE messages, or after
+    CHAT_FLUSH_INTERVAL_SECONDS for a quiet room, so a busy room does not commit per message.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._pending: List[Dict] = []
+        self._in_flight: List[Dict] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def record(self, *, asteroid_id: str, message: str, user_id: Optional[int] = None, user_email: Optional[str] = None) -> Dict:
+        entry = {"asteroid_id": str(asteroid_id), "user_id": user_id, "user_email": user_email, "message": message, "created_at": datetime.now(timezone.utc)}
+        self._pending.append(entry)
+        if len(self._pending) >= settings.CHAT_FLUSH_BATCH_SIZE:
+            task = asyncio.create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+        return entry
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.CHAT_FLUSH_INTERVAL_SECONDS)
+        await self.flush()
+
+    async def flush(self) -> int:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            self._in_flight = batch
+            try:
+                await self._store(batch)
+                stored = len(batch)
+            except Exception as e:
+                metrics.increment("chat.flush_errors")
+                logger.error(f"Failed to store {len(batch)} chat messages, retrying one at a time: {e}")
+                stored = await self._store_each(batch)
+            finally:
+                self._in_flight = []
+        metrics.increment("chat.messages_stored", stored)
+        return stored
+
+    async def _store(self, messages: List[Dict]) -> None:
+        async with self.session_factory() as db:
+            await crud.aio.chat_message.bulk_create(db, messages=messages)
+            await db.commit()
+
+    async def _store_each(self, batch: List[Dict]) -> int:
+        """Store a failed batch row by row, so one bad row cannot hold back the rest; rows that still fail are dropped."""
+        stored = 0
+        for i, entry in enumerate(batch):
+            try:
+                await self._store([entry])
+            except OperationalError as e:
+                # The database itself is unavailable: keep the rest for the next flush, but never let it grow the queue without bound.
+                self._pending = (batch[i:] + self._pending)[-settings.CHAT_MAX_PENDING:]
+                logger.error(f"Failed to store {len(batch) - i} chat messages: {e}")
+                break
+            except Exception as e:
+                metrics.increment("chat.messages_dropped")
+                logger.error(f"Dropped a chat message that could not be stored: {e}")
+            else:
+                stored += 1
+        return stored
+
+    async def recent(self, asteroid_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """The room's last ``limit`` messages, oldest first, including those not yet flushed."""
+        limit = limit or settings.CHAT_HISTORY_REPLAY
+        unsaved = [m for m in self._in_flight + self._pending if m["asteroid_id"] == str(asteroid_id)]
+        async with self.session_factory() as db:
+            stored = await crud.aio.chat_message.get_by_asteroid(db, asteroid_id=str(asteroid_id), limit=limit)
+        # A batch committed between the snapshot and the query would otherwise appear twice.
+        seen = {(_utc(m.created_at), m.user_email, m.message) for m in stored}
+        messages = [self.to_payload(m) for m in reversed(stored)]
+        messages += [self.to_payload(m) for m in unsaved if (_utc(m["created_at"]), m["user_email"], m["message"]) not in seen]
+        return messages[-limit:]
+
+    @staticmethod
+    def to_payload(message) -> Dict:
+        get = message.get if isinstance(message, dict) else lambda key: getattr(message, key)
+        return {
+            "id": get("id"), "asteroid_id": get("asteroid_id"), "user_id": get("user_id"), "user_email": get("user_email"),
+            "message": get("message"), "timestamp": _utc(get("created_at")).isoformat()
+        }
+
+    async def shutdown(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        await self.flush()
+
+
+chat_service = ChatService()
@@ -0,0 +1,166 @@
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Select, Table, select
+from sqlalchemy.orm import Session
+from typing import AsyncIterator, Dict, Iterator, Optional, Sequence
+from datetime import date, datetime
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+from app.utils.metrics import metrics
+import csv
+import io
+import json
+
+EXPORT_TABLES: Dict[str, Table] = {"asteroids": Asteroid.__table__, "close_approaches": CloseApproach.__table__}
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportUnavailableError(Exception):
+    """The requested export format needs an optional dependency that is not installed."""
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+class NDJSONWriter:
+    def __init__(self, columns: Sequence[str]):
+        self.columns = columns
+
+    def begin(self) -> bytes:
+        return b""
+
+    def write(self, rows: Sequence) -> bytes:
+        return "".join(json.dumps(dict(zip(self.columns, map(_plain, row))), separators=(",", ":")) + "\n" for row in rows).encode()
+
+    def end(self) -> bytes:
+        return b""
+
+
+class CSVWriter:
+    def __init__(self, columns: Sequence[str]):
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def begin(self) -> bytes:
+        self._writer.writerow(self.columns)
+        return self._drain()
+
+    def write(self, rows: Sequence) -> bytes:
+        self._writer.writerows([_plain(value) for value in row] for row in rows)
+        return self._drain()
+
+    def end(self) -> bytes:
+        return b""
+
+
+class ParquetWriter:
+    """One Parquet row group per fetched batch; the file footer is written by end()."""
+
+    def __init__(self, table: Table):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportUnavailableError("Parquet export requires the pyarrow package")
+        types = {Integer: pa.int64(), Float: pa.float64(), Boolean: pa.bool_(), Date: pa.date32(), DateTime: pa.timestamp("us")}
+        self._pa = pa
+        self.schema = pa.schema([
+            (column.name, next((t for sql_type, t in types.items() if isinstance(column.type, sql_type)), pa.string()))
+            for column in table.columns
+        ])
+        self._buffer = io.BytesIO()
+        self._writer = pq.ParquetWriter(self._buffer, self.schema)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def begin(self) -> bytes:
+        return self._drain()
+
+    def write(self, rows: Sequence) -> bytes:
+        if rows:
+            self._writer.write_batch(self._pa.RecordBatch.from_pylist([dict(zip(self.schema.names, row)) for row in rows], schema=self.schema))
+        return self._drain()
+
+    def end(self) -> bytes:
+        self._writer.close()
+        return self._drain()
+
+
+class ExportService:
+    """Streams whole tables out in NDJSON, CSV or Parquet.
+
+    Rows are read with yield_per, which uses a server-side cursor where the driver has one, and each
+    batch of EXPORT_BATCH_SIZE rows is encoded and handed on before the next is fetched, so memory use
+    does not grow with the table.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        """Claim one of EXPORT_MAX_CONCURRENT stream slots; pair a successful claim with release()."""
+        if self.active >= settings.EXPORT_MAX_CONCURRENT:
+            metrics.increment("export.rejected")
+            return False
+        self.active += 1
+        metrics.set_gauge("export.active", self.active)
+        return True
+
+    def release(self) -> None:
+        self.active = max(0, self.active - 1)
+        metrics.set_gauge("export.active", self.active)
+
+    @staticmethod
+    def query(table_name: str, batch_size: Optional[int] = None) -> Select:
+        table = EXPORT_TABLES[table_name]
+        return select(*table.columns).order_by(*table.primary_key.columns).execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+
+    @staticmethod
+    def writer(table_name: str, fmt: str):
+        """Raises ExportUnavailableError up front, before any response is started."""
+        table = EXPORT_TABLES[table_name]
+        if fmt == "ndjson":
+            return NDJSONWriter([column.name for column in table.columns])
+        if fmt == "csv":
+            return CSVWriter([column.name for column in table.columns])
+        if fmt == "parquet":
+            return ParquetWriter(table)
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    def export(self, db: Session, table_name: str, fmt: str, writer=None, batch_size: Optional[int] = None) -> Iterator[bytes]:
+        writer = writer or self.writer(table_name, fmt)
+        result = db.execute(self.query(table_name, batch_size))
+        try:
+            yield writer.begin()
+            for rows in result.partitions():
+                metrics.increment("export.rows", len(rows))
+                yield writer.write(rows)
+            yield writer.end()
+        finally:
+            result.close()
+
+    async def stream(self, table_name: str, fmt: str, writer=None, batch_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        writer = writer or self.writer(table_name, fmt)
+        async with self.session_factory() as db:
+            result = await db.stream(self.query(table_name, batch_size))
+            yield writer.begin()
+            async for rows in result.partitions():
+                metrics.increment("export.rows", len(rows))
+                yield writer.write(rows)
+            yield writer.end()
+
+
+export_service = ExportService()
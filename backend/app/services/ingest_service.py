@@ -0,0 +1,67 @@
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import date
+from contextlib import aclosing
+from app.config import settings
+from app.services.nasa_service import nasa_service
+from app.services.risk_service import refresh_risk_scores
+from app.services.timeline_service import approach_timeline
+from app.utils.cache import response_cache
+from app.utils.partitions import ensure_monthly_partitions
+from app import crud
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class IngestService:
+    def ingest(self, db: Session, asteroids_data: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        stats = {"asteroids": 0, "approaches": 0, "batches": []}
+
+        for offset in range(0, len(asteroids_data), batch_size):
+            batch = asteroids_data[offset:offset + batch_size]
+            started = time.perf_counter()
+            try:
+                created, updated = crud.asteroid.bulk_upsert(db, asteroids_data=batch)
+                approaches = [(data["id"], approach) for data in batch for approach in data["close_approaches"]]
+                approaches_created, approaches_updated = crud.close_approach.bulk_upsert(db, approaches=approaches)
+                refresh_risk_scores(db, asteroid_ids={data["id"] for data in batch})
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            response_cache.invalidate()
+            approach_timeline.invalidate()
+
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            stats["asteroids"] += created + updated
+            stats["approaches"] += approaches_created + approaches_updated
+            stats["batches"].append({
+                "asteroids_created": created, "asteroids_updated": updated,
+                "approaches_created": approaches_created, "approaches_updated": approaches_updated,
+                "elapsed_ms": elapsed_ms
+            })
+            logger.info(
+                f"Ingested batch of {len(batch)} asteroids ({created} new, {updated} updated) and "
+                f"{len(approaches)} approaches ({approaches_created} new, {approaches_updated} updated) in {elapsed_ms} ms"
+            )
+        return stats
+
+    async def backfill(self, db: Session, start_date: date, end_date: date, concurrency: Optional[int] = None) -> Dict:
+        stats = {"windows": 0, "asteroids": 0, "approaches": 0, "batches": []}
+        await asyncio.to_thread(ensure_monthly_partitions, db.get_bind(), start_date, end_date)
+        async with aclosing(nasa_service.fetch_range(start_date, end_date, concurrency=concurrency)) as windows:
+            async for window_start, window_end, response in windows:
+                window_stats = await asyncio.to_thread(self.ingest, db, nasa_service.parse_feed_response(response))
+                stats["windows"] += 1
+                stats["asteroids"] += window_stats["asteroids"]
+                stats["approaches"] += window_stats["approaches"]
+                stats["batches"].extend({**batch, "window": f"{window_start}/{window_end}"} for batch in window_stats["batches"])
+        logger.info(f"Backfilled {stats['windows']} windows from {start_date} to {end_date}: {stats['asteroids']} asteroids, {stats['approaches']} approaches")
+        return stats
+
+
+ingest_service = IngestService()
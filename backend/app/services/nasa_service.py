@@ -1,47 +1,209 @@
 import httpx
-from typing import Dict, List, Optional
+import asyncio
+import importlib.util
+import random
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import date, timedelta
 from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.disk_cache import CacheEntry, DiskCache
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class NASARateLimitError(Exception):
+    pass
+
+
+class NASAOfflineError(Exception):
+    pass
+
 
 class NASAService:
     BASE_URL = "https://api.nasa.gov/neo/rest/v1"
+    MAX_FEED_DAYS = 7
+    RATE_LIMIT_WINDOW_SECONDS = 3600
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, cache: Optional[DiskCache] = None):
         self.api_key = settings.NASA_API_KEY
+        self.rate_limit_remaining: Optional[int] = None
+        self._rate_limited_until = 0.0
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        if cache is None and settings.NASA_CACHE_ENABLED:
+            cache = DiskCache(settings.NASA_CACHE_DIR, max_bytes=settings.NASA_CACHE_MAX_BYTES)
+        self.cache = cache
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.NASA_HTTP2 and importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(
+            max_connections=settings.NASA_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.NASA_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.NASA_HTTP_KEEPALIVE_EXPIRY
+        )
+        logger.info(f"Opening NASA API client (http2={http2}, max_connections={settings.NASA_HTTP_MAX_CONNECTIONS})")
+        return httpx.AsyncClient(timeout=settings.NASA_HTTP_TIMEOUT, limits=limits, http2=http2, transport=self._transport)
+    
+    async def startup(self) -> None:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+    
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def fetch_feed(self, start_date: date, end_date: date) -> Dict:
-        if (end_date - start_date).days > 7:
-            end_date = start_date + timedelta(days=7)
-        
-        url = f"{self.BASE_URL}/feed"
-        params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat(), "api_key": self.api_key}
+        if (end_date - start_date).days > self.MAX_FEED_DAYS:
+            logger.warning(f"Feed range {start_date} to {end_date} exceeds {self.MAX_FEED_DAYS} days, truncating; use fetch_range for longer ranges")
+            end_date = start_date + timedelta(days=self.MAX_FEED_DAYS)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
+            return await self._get_feed(self.client, start_date, end_date)
         except httpx.HTTPError as e:
             logger.error(f"NASA API feed error: {e}")
             raise
     
-    async def lookup_asteroid(self, asteroid_id: str) -> Optional[Dict]:
-        url = f"{self.BASE_URL}/neo/{asteroid_id}"
-        params = {"api_key": self.api_key}
+    def split_range(self, start_date: date, end_date: date) -> List[Tuple[date, date]]:
+        windows = []
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(window_start + timedelta(days=self.MAX_FEED_DAYS), end_date)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+        return windows
+    
+    def feed_concurrency(self, requested: Optional[int] = None) -> int:
+        concurrency = requested or settings.NASA_FEED_CONCURRENCY
+        if self.api_key == "DEMO_KEY":
+            concurrency = min(concurrency, settings.NASA_DEMO_KEY_CONCURRENCY)
+        return max(1, concurrency)
+    
+    async def fetch_range(
+        self, start_date: date, end_date: date, concurrency: Optional[int] = None, client: Optional[httpx.AsyncClient] = None
+    ) -> AsyncIterator[Tuple[date, date, Dict]]:
+        """Fetch an arbitrary date range as feed windows, yielding each window as soon as it arrives."""
+        windows = self.split_range(start_date, end_date)
+        concurrency = self.feed_concurrency(concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        client = client or self.client
         
+        async def fetch_window(window_start: date, window_end: date) -> Tuple[date, date, Dict]:
+            async with semaphore:
+                return window_start, window_end, await self._get_feed(client, window_start, window_end)
+        
+        tasks = [asyncio.create_task(fetch_window(*window)) for window in windows]
+        logger.info(f"Fetching {len(windows)} feed windows from {start_date} to {end_date} with concurrency {concurrency}")
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return None
-            raise
+            for next_window in asyncio.as_completed(tasks):
+                yield await next_window
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _get_feed(self, client: httpx.AsyncClient, start_date: date, end_date: date) -> Dict:
+        params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        # Windows that ended before yesterday no longer change upstream, so they can be kept much longer.
+        historical = end_date < date.today() - timedelta(days=1)
+        ttl = settings.NASA_CACHE_HISTORICAL_TTL_SECONDS if historical else settings.NASA_CACHE_TTL_SECONDS
+        return await self._get_json(client, "/feed", params, metric="nasa.feed", ttl=ttl)
+    
+    async def _get_json(self, client: httpx.AsyncClient, path: str, params: Dict, metric: str, ttl: float) -> Optional[Dict]:
+        """Cached GET returning the decoded body, or None for a 404. Stale entries are revalidated when possible."""
+        key = DiskCache.make_key(path, params) if self.cache else None
+        entry = self.cache.get(key) if self.cache else None
+        if entry is not None and (settings.NASA_OFFLINE or entry.age() < ttl):
+            metrics.increment(f"{metric}.cache_hits")
+            return entry.body
+        if settings.NASA_OFFLINE:
+            raise NASAOfflineError(f"No cached NASA response for {path} {params} in offline mode")
+        
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        
+        response = await self._request(client, path, params, metric=metric, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            metrics.increment(f"{metric}.cache_revalidated")
+            self.cache.touch(key)
+            return entry.body
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        
+        body = response.json()
+        if self.cache:
+            metrics.increment(f"{metric}.cache_misses")
+            self.cache.set(key, CacheEntry(
+                body=body, stored_at=time.time(),
+                etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified")
+            ))
+        return body
+    
+    async def _request(self, client: httpx.AsyncClient, path: str, params: Dict, metric: str, headers: Optional[Dict] = None) -> httpx.Response:
+        """GET with retry and jittered exponential backoff on 429/5xx and transport errors."""
+        params = {**params, "api_key": self.api_key}
+        for attempt in range(settings.NASA_HTTP_RETRIES + 1):
+            if time.monotonic() < self._rate_limited_until:
+                raise NASARateLimitError("NASA API rate limit exhausted for this API key")
+            
+            started = time.perf_counter()
+            try:
+                response = await client.get(f"{self.BASE_URL}{path}", params=params, headers=headers)
+            except httpx.TransportError as e:
+                metrics.observe(metric, (time.perf_counter() - started) * 1000, ok=False)
+                if attempt == settings.NASA_HTTP_RETRIES:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"NASA API {path} transport error ({e!r}), retrying in {delay:.2f}s")
+            else:
+                metrics.observe(metric, (time.perf_counter() - started) * 1000, ok=response.status_code < 400)
+                self._track_rate_limit(response)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                
+                retry_after = response.headers.get("Retry-After", "")
+                if response.status_code == 429 and retry_after.isdigit() and int(retry_after) > settings.NASA_HTTP_BACKOFF_MAX:
+                    self._rate_limited_until = time.monotonic() + int(retry_after)
+                    raise NASARateLimitError(f"NASA API rate limit exceeded (retry after {retry_after}s)")
+                if attempt == settings.NASA_HTTP_RETRIES:
+                    if response.status_code == 429:
+                        self._rate_limited_until = time.monotonic() + self.RATE_LIMIT_WINDOW_SECONDS
+                        raise NASARateLimitError("NASA API rate limit exceeded")
+                    return response
+                delay = int(retry_after) if retry_after.isdigit() else self._backoff(attempt)
+                logger.warning(f"NASA API {path} returned {response.status_code}, retrying in {delay:.2f}s")
+            
+            metrics.increment(f"{metric}.retries")
+            await asyncio.sleep(delay)
+    
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(settings.NASA_HTTP_BACKOFF_MAX, settings.NASA_HTTP_BACKOFF_BASE * 2 ** attempt))
+    
+    def _track_rate_limit(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+            if self.rate_limit_remaining == 0:
+                self._rate_limited_until = time.monotonic() + self.RATE_LIMIT_WINDOW_SECONDS
+            elif self.rate_limit_remaining < settings.NASA_RATE_LIMIT_WARNING:
+                logger.warning(f"NASA API rate limit nearly exhausted: {self.rate_limit_remaining} requests remaining")
+    
+    async def lookup_asteroid(self, asteroid_id: str) -> Optional[Dict]:
+        return await self._get_json(self.client, f"/neo/{asteroid_id}", {}, metric="nasa.neo", ttl=settings.NASA_CACHE_TTL_SECONDS)
     
     def parse_feed_response(self, response: Dict) -> List[Dict]:
         asteroids = []
@@ -1,6 +1,19 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from typing import Iterable, List, Optional, Sequence, Tuple
+import numpy as np
 from app.models.asteroid import Asteroid
 from app.models.close_approach import CloseApproach
 
+# Bucket edges and points mirroring calculate_risk_score, for np.searchsorted lookups.
+DIAMETER_THRESHOLDS = np.array([0.05, 0.1, 0.5, 1.0])
+DIAMETER_POINTS = np.array([0, 5, 10, 20, 30])
+LUNAR_THRESHOLDS = np.array([1.0, 5.0, 10.0, 20.0])
+LUNAR_POINTS = np.array([20, 15, 10, 5, 0])
+SCORE_THRESHOLDS = np.array([30, 50, 70])
+RISK_CATEGORIES = np.array(["LOW", "MODERATE", "HIGH", "EXTREME"])
+RISK_THRESHOLDS = {"LOW": 0, "MODERATE": 30, "HIGH": 50, "EXTREME": 70}
+
 
 def calculate_risk_score(asteroid: Asteroid, approach: CloseApproach) -> str:
     score = 0
@@ -37,6 +50,65 @@ def calculate_risk_score(asteroid: Asteroid, approach: CloseApproach) -> str:
     return "LOW"
 
 
+def calculate_risk_scores(is_hazardous, diameter_max, miss_distance_lunar) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized calculate_risk_score over column arrays; None/NaN follow the scalar rules. Returns (scores, categories)."""
+    hazardous = np.asarray(is_hazardous, dtype=bool)
+    diameter = np.nan_to_num(np.asarray(diameter_max, dtype=float), nan=0.0)
+    lunar = np.asarray(miss_distance_lunar, dtype=float)
+    lunar = np.where(np.isnan(lunar) | (lunar == 0), np.inf, lunar)
+
+    # side="left" counts thresholds strictly below the diameter (d > t); side="right" counts thresholds <= the distance (not d < t).
+    scores = (
+        hazardous * 50
+        + DIAMETER_POINTS[np.searchsorted(DIAMETER_THRESHOLDS, diameter, side="left")]
+        + LUNAR_POINTS[np.searchsorted(LUNAR_THRESHOLDS, lunar, side="right")]
+    )
+    return scores, RISK_CATEGORIES[np.searchsorted(SCORE_THRESHOLDS, scores, side="right")]
+
+
+def score_approaches(asteroids: Sequence[Asteroid], approaches: Sequence[CloseApproach]) -> List[str]:
+    _, categories = calculate_risk_scores(
+        [a.is_hazardous for a in asteroids], [a.estimated_diameter_max for a in asteroids], [c.miss_distance_lunar for c in approaches]
+    )
+    return categories.tolist()
+
+
+def refresh_risk_scores(db: Session, asteroid_ids: Optional[Iterable[str]] = None) -> int:
+    """Recompute the stored risk columns for the given asteroids (all when None). Does not commit."""
+    query = select(
+        CloseApproach.id, CloseApproach.asteroid_id, CloseApproach.miss_distance_km, CloseApproach.miss_distance_lunar,
+        Asteroid.is_hazardous, Asteroid.estimated_diameter_max, CloseApproach.risk_points
+    ).join(Asteroid, Asteroid.id == CloseApproach.asteroid_id).order_by(CloseApproach.id)
+    if asteroid_ids is not None:
+        query = query.where(CloseApproach.asteroid_id.in_(list(asteroid_ids)))
+    rows = db.execute(query).all()
+    if not rows:
+        return 0
+
+    approach_ids, owners, distances_km, distances_lunar, hazardous, diameters, stored = zip(*rows)
+    scores, categories = calculate_risk_scores(hazardous, diameters, distances_lunar)
+    scores, categories = scores.tolist(), categories.tolist()
+    # Only rewrite approaches whose score moved: an UPDATE bumps updated_at, which alert generation scans for.
+    changed = [
+        {"id": approach_id, "risk_points": score, "risk_score": category}
+        for approach_id, score, category, old_score in zip(approach_ids, scores, categories, stored) if score != old_score
+    ]
+    if changed:
+        db.execute(update(CloseApproach), changed)
+
+    # An asteroid's headline risk is that of its closest approach, as the list endpoints have always reported it.
+    closest = {}
+    for index, (asteroid_id, distance) in enumerate(zip(owners, distances_km)):
+        key = distance if distance else float("inf")
+        if asteroid_id not in closest or key < closest[asteroid_id][0]:
+            closest[asteroid_id] = (key, index)
+    db.execute(update(Asteroid), [
+        {"id": asteroid_id, "risk_points": scores[index], "risk_score": categories[index], "closest_approach_km": distances_km[index]}
+        for asteroid_id, (_, index) in closest.items()
+    ])
+    return len(rows)
+
+
 def get_risk_color(risk_score: str) -> str:
     colors = {"EXTREME": "#ff0000", "HIGH": "#ff6600", "MODERATE": "#ffcc00", "LOW": "#00cc00"}
     return colors.get(risk_score, "#808080")
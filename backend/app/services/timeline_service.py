@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from datetime import date, datetime, time as dt_time, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.schemas.asteroid import UpcomingApproachResponse
+from app.utils.metrics import metrics
+from app import crud
+import asyncio
+import bisect
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def utc_today() -> date:
+    # NASA approach times are UTC, so the indexed window and the endpoint's default start follow the UTC date.
+    return datetime.utcnow().date()
+
+
+def approach_time(row) -> datetime:
+    # Approaches without a time of day are placed at the start of their date.
+    return row.approach_date_full or datetime.combine(row.approach_date, dt_time.min)
+
+
+@dataclass
+class TimelineSnapshot:
+    start_date: date
+    end_date: date
+    built_at: float
+    generation: int
+    times: List[datetime]
+    bodies: List[bytes]
+    hazardous: List[bool]
+    risk_points: List[int]
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return datetime.combine(self.start_date, dt_time.min) <= start and end <= datetime.combine(self.end_date + timedelta(days=1), dt_time.min)
+
+    def window(self, start: datetime, end: datetime, *, is_hazardous: Optional[bool] = None, min_risk: Optional[int] = None, limit: int = 100) -> bytes:
+        """JSON array of the approaches at or after ``start`` and before ``end``, in approach order."""
+        lo, hi = bisect.bisect_left(self.times, start), bisect.bisect_left(self.times, end)
+        if is_hazardous is None and min_risk is None:
+            selected = self.bodies[lo:min(hi, lo + limit)]
+        else:
+            selected = [
+                self.bodies[i] for i in range(lo, hi)
+                if (is_hazardous is None or self.hazardous[i] == is_hazardous) and (min_risk is None or self.risk_points[i] >= min_risk)
+            ][:limit]
+        return b"[" + b",".join(selected) + b"]"
+
+
+class ApproachTimeline:
+    """In-memory index of the close approaches in the next TIMELINE_DAYS, sorted by approach time.
+
+    Each approach is serialized once when the index is built, so a range request is two bisects on the
+    sorted times and a join of the pre-rendered slice. Ingest invalidates the index and the next request
+    rebuilds it; it is also rebuilt when the date changes, and after TIMELINE_REFRESH_SECONDS to pick up
+    ingests run by another worker.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[TimelineSnapshot] = None
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    def _is_fresh(self, snapshot: Optional[TimelineSnapshot]) -> bool:
+        return (
+            snapshot is not None and snapshot.generation == self._generation and snapshot.start_date == utc_today()
+            and time.monotonic() - snapshot.built_at < settings.TIMELINE_REFRESH_SECONDS
+        )
+
+    async def snapshot(self, db: AsyncSession) -> TimelineSnapshot:
+        """The current index; ``db`` is only queried when it has to be rebuilt."""
+        if self._is_fresh(self._snapshot):
+            return self._snapshot
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._is_fresh(self._snapshot):
+                # An ingest committing during the build bumps the generation, so its rows are picked up next time.
+                generation = self._generation
+                snapshot = await db.run_sync(self.build)
+                snapshot.generation = generation
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def build(self, db: Session) -> TimelineSnapshot:
+        start_date = utc_today()
+        end_date = start_date + timedelta(days=settings.TIMELINE_DAYS)
+        with metrics.timer("approach_timeline.build"):
+            rows = crud.close_approach.get_timeline(db, start_date=start_date, end_date=end_date)
+            rows = sorted(rows, key=lambda row: (approach_time(row), row.id))
+            bodies = [UpcomingApproachResponse(
+                id=row.id, asteroid_id=row.asteroid_id, approach_date=row.approach_date, approach_date_full=row.approach_date_full,
+                velocity_kmh=row.velocity_kmh, miss_distance_km=row.miss_distance_km, miss_distance_lunar=row.miss_distance_lunar,
+                orbiting_body=row.orbiting_body or "Earth", risk_score=row.risk_score, asteroid={
+                    "id": row.asteroid_id, "name": row.name, "is_hazardous": bool(row.is_hazardous),
+                    "absolute_magnitude": row.absolute_magnitude, "estimated_diameter_min": row.estimated_diameter_min,
+                    "estimated_diameter_max": row.estimated_diameter_max, "risk_score": row.asteroid_risk_score
+                }
+            ).model_dump_json().encode() for row in rows]
+        metrics.increment("approach_timeline.rebuilds")
+        metrics.set_gauge("approach_timeline.entries", len(rows))
+        logger.info(f"Built approach timeline for {start_date} to {end_date}: {len(rows)} approaches")
+        return TimelineSnapshot(
+            start_date=start_date, end_date=end_date, built_at=time.monotonic(), generation=self._generation,
+            times=[approach_time(row) for row in rows], bodies=bodies,
+            hazardous=[bool(row.is_hazardous) for row in rows], risk_points=[row.risk_points or 0 for row in rows]
+        )
+
+
+approach_timeline = ApproachTimeline()
@@ -0,0 +1,188 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional, Union
+from fastapi import Request, Response
+from app.config import settings
+from app.utils.metrics import metrics
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._entries.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Byte-value cache on a Redis-compatible server, shared by every worker.
+
+    clear() bumps a generation counter that is part of every key instead of scanning for keys to delete;
+    entries from older generations are never read again and expire on their own. Reads and writes go
+    through the asyncio client, and each worker keeps the generation it last saw for
+    GENERATION_REFRESH_SECONDS, so a lookup is one round trip; a clear() in this worker takes effect here
+    at once and in the others within that interval.
+    """
+
+    GENERATION_REFRESH_SECONDS = 1.0
+
+    def __init__(self, url: str, ttl_seconds: float, namespace: str = "cosmic_watch:responses"):
+        import redis
+        import redis.asyncio
+        self._errors = redis.RedisError
+        self._client = redis.asyncio.Redis.from_url(url, socket_timeout=0.5)
+        # clear() runs after ingest commits, from synchronous code, so it has a blocking client of its own.
+        self._sync_client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._generation = 0
+        self._generation_checked = float("-inf")
+
+    async def _key(self, key: str) -> str:
+        if time.monotonic() - self._generation_checked >= self.GENERATION_REFRESH_SECONDS:
+            generation = int(await self._client.get(f"{self.namespace}:generation") or 0)
+            # Generations only grow; a read that raced a clear() must not roll it back.
+            self._generation = max(self._generation, generation)
+            self._generation_checked = time.monotonic()
+        return f"{self.namespace}:{self._generation}:{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = await self._client.get(await self._key(key))
+        except self._errors as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return default
+        return default if value is None else value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        try:
+            await self._client.set(await self._key(key), value, ex=max(1, int(self.ttl_seconds if ttl_seconds is None else ttl_seconds)))
+        except self._errors as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            self._generation = max(self._generation, int(self._sync_client.incr(f"{self.namespace}:generation")))
+            self._generation_checked = time.monotonic()
+        except self._errors as e:
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+
+    def pack(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        etag, _, body = data.partition(b"\n")
+        return cls(body=body, etag=etag.decode())
+
+
+class ResponseCache:
+    """Serialized JSON responses for read endpoints whose data only changes when NASA data is ingested."""
+
+    def __init__(self):
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = TTLCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+            if settings.RESPONSE_CACHE_REDIS_URL:
+                try:
+                    self._backend = RedisCache(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+                except ImportError:
+                    logger.warning("RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed; using the in-process cache")
+        return self._backend
+
+    @staticmethod
+    def make_key(endpoint: str, **params: Any) -> str:
+        normalized = sorted((k, v.isoformat() if hasattr(v, "isoformat") else v) for k, v in params.items() if v is not None)
+        return f"{endpoint}?{json.dumps(normalized, separators=(',', ':'))}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        data = self.backend.get(key)
+        if inspect.isawaitable(data):
+            data = await data
+        metrics.increment("response_cache.hits" if data is not None else "response_cache.misses")
+        return CachedResponse.unpack(data) if data is not None else None
+
+    async def set(self, key: str, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+        if settings.RESPONSE_CACHE_ENABLED:
+            stored = self.backend.set(key, entry.pack())
+            if inspect.isawaitable(stored):
+                await stored
+        return entry
+
+    def invalidate(self) -> None:
+        if self._backend is not None or settings.RESPONSE_CACHE_REDIS_URL:
+            self.backend.clear()
+            metrics.increment("response_cache.invalidations")
+
+    async def respond(self, request: Request, key: str, render: Callable[[], Union[bytes, Awaitable[bytes]]]) -> Response:
+        """Serve ``key`` from the cache (rendering and storing it on a miss) with ETag and Cache-Control headers.
+
+        A request whose If-None-Match matches the current ETag gets an empty 304.
+        """
+        entry = await self.get(key)
+        if entry is None:
+            body = render()
+            entry = await self.set(key, await body if inspect.isawaitable(body) else body)
+        headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE_SECONDS}"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    body: Any
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class DiskCache:
+    """JSON response cache on local disk with TTL freshness and size-bounded LRU eviction.
+
+    Entries are one file each; a file's mtime doubles as its last-access time for eviction.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        normalized = json.dumps([endpoint, sorted((k, str(v)) for k, v in params.items())], separators=(",", ":"))
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+                self._unlink(path)
+                return None
+        return CacheEntry(**data)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry.__dict__, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry fresh again after a successful revalidation."""
+        entry = self.get(key)
+        if entry is not None:
+            entry.stored_at = time.time()
+            self.set(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in os.listdir(self.directory):
+                self._unlink(os.path.join(self.directory, name))
+
+    def _evict(self) -> None:
+        files = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+
+        files.sort()
+        while total > self.max_bytes and files:
+            _, size, name = files.pop(0)
+            self._unlink(os.path.join(self.directory, name))
+            total -= size
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
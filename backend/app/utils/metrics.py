@@ -0,0 +1,81 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+import threading
+import time
+
+
+class LatencyStats:
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, ok: bool = True) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2) if ordered else 0.0
+
+        return {
+            "count": self.count, "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": percentile(0.50), "p95_ms": percentile(0.95), "max_ms": round(self.max_ms, 2)
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, LatencyStats] = defaultdict(LatencyStats)
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, float] = {}
+
+    def observe(self, name: str, elapsed_ms: float, ok: bool = True) -> None:
+        with self._lock:
+            self._latencies[name].record(elapsed_ms, ok)
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000, ok)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "latency": {name: stats.snapshot() for name, stats in sorted(self._latencies.items())},
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items()))
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
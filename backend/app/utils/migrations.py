@@ -0,0 +1,39 @@
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def current_revision(engine: Engine):
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def run_migrations(engine: Engine) -> None:
+    """Upgrade the database to the latest revision.
+
+    Databases created by Base.metadata.create_all before migrations existed have the tables but no
+    alembic_version; they are stamped at the baseline first, and later revisions only add what is missing.
+    """
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "asteroids" in tables:
+            logger.info(f"Adopting existing schema at baseline revision {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
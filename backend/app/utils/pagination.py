@@ -0,0 +1,20 @@
+from typing import Any, List
+import base64
+import json
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque, URL-safe token for a keyset position. Dates and datetimes are stored as ISO strings."""
+    payload = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
@@ -0,0 +1,77 @@
+from datetime import date
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARENT = "close_approaches"
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    month = month_start(day)
+    for _ in range(months):
+        month = next_month(month)
+    return month
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(engine: Engine) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name"
+        ), {"name": PARENT}).first() is not None
+
+
+def ensure_monthly_partitions(engine: Engine, start_date: date, end_date: date) -> List[str]:
+    """Create the monthly close_approaches partitions covering start_date..end_date on PostgreSQL.
+
+    Rows that already landed in the DEFAULT partition for a month are moved into the new partition before it
+    is attached, since ATTACH PARTITION refuses ranges the default partition still holds rows for. Each
+    month is its own transaction. A no-op on SQLite and on tables that are not partitioned.
+    """
+    if not is_partitioned(engine):
+        return []
+
+    with engine.connect() as connection:
+        existing = set(connection.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :name"
+        ), {"name": PARENT}).scalars())
+
+    created = []
+    month = month_start(start_date)
+    while month <= end_date:
+        name = partition_name(month)
+        if name not in existing:
+            bounds = {"lower": month, "upper": next_month(month)}
+            with engine.begin() as connection:
+                connection.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                connection.execute(text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE approach_date >= :lower AND approach_date < :upper RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ), bounds)
+                connection.execute(text(
+                    f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+                ))
+            created.append(name)
+        month = next_month(month)
+
+    if created:
+        logger.info(f"Created {len(created)} close_approaches partitions from {created[0]} to {created[-1]}")
+    return created
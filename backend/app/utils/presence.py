@@ -0,0 +1,96 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryPresenceStore:
+    """Who is in which chat room, for every Socket.IO server in this process."""
+
+    def __init__(self):
+        self._rooms: Dict[str, Dict[str, str]] = defaultdict(dict)
+
+    async def add(self, room: str, sid: str, user: str) -> None:
+        self._rooms[room][sid] = user
+
+    async def discard(self, room: str, sid: str) -> None:
+        members = self._rooms.get(room)
+        if members is not None:
+            members.pop(sid, None)
+            if not members:
+                del self._rooms[room]
+
+    async def members(self, room: str) -> List[str]:
+        return list(self._rooms.get(room, {}).values())
+
+    async def close(self) -> None:
+        self._rooms.clear()
+
+
+class RedisPresenceStore:
+    """Room membership in Redis, shared by every worker and node.
+
+    Each room is a hash of sid -> "server_id|user". Every server keeps a short-lived heartbeat key alive;
+    members whose server stopped heartbeating (crashed or killed without disconnecting its sockets) are
+    skipped on read and removed.
+    """
+
+    HEARTBEAT_SECONDS = 20
+    HEARTBEAT_TTL_SECONDS = 60
+
+    def __init__(self, url: str, namespace: str = "cosmic_watch:presence"):
+        import redis.asyncio as redis
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.namespace = namespace
+        self.server_id = uuid.uuid4().hex
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def _room_key(self, room: str) -> str:
+        return f"{self.namespace}:room:{room}"
+
+    def _server_key(self, server_id: str) -> str:
+        return f"{self.namespace}:server:{server_id}"
+
+    async def _beat(self) -> None:
+        while True:
+            try:
+                await self._client.set(self._server_key(self.server_id), 1, ex=self.HEARTBEAT_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Presence heartbeat failed: {e}")
+            await asyncio.sleep(self.HEARTBEAT_SECONDS)
+
+    async def add(self, room: str, sid: str, user: str) -> None:
+        if self._heartbeat is None or self._heartbeat.done():
+            await self._client.set(self._server_key(self.server_id), 1, ex=self.HEARTBEAT_TTL_SECONDS)
+            self._heartbeat = asyncio.create_task(self._beat())
+        await self._client.hset(self._room_key(room), sid, f"{self.server_id}|{user}")
+
+    async def discard(self, room: str, sid: str) -> None:
+        await self._client.hdel(self._room_key(room), sid)
+
+    async def members(self, room: str) -> List[str]:
+        entries = {sid: value.split("|", 1) for sid, value in (await self._client.hgetall(self._room_key(room))).items()}
+        if not entries:
+            return []
+        servers = sorted({server_id for server_id, _ in entries.values()})
+        alive = {server_id for server_id, beat in zip(servers, await self._client.mget([self._server_key(s) for s in servers])) if beat}
+        stale = [sid for sid, (server_id, _) in entries.items() if server_id not in alive]
+        if stale:
+            await self._client.hdel(self._room_key(room), *stale)
+        return [user for server_id, user in entries.values() if server_id in alive]
+
+    async def close(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+        await self._client.delete(self._server_key(self.server_id))
+        await self._client.aclose()
+
+
+def create_presence_store(url: Optional[str]):
+    """Redis-backed presence when the Socket.IO message queue is Redis; otherwise per-process memory."""
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisPresenceStore(url)
+    return MemoryPresenceStore()
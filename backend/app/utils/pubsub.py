@@ -0,0 +1,42 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+import asyncio
+import json
+from socketio.async_pubsub_manager import AsyncPubSubManager
+import socketio
+
+
+class InProcessPubSubManager(AsyncPubSubManager):
+    """Socket.IO pub/sub manager whose "queue" is shared memory inside one process.
+
+    Every server in the process that uses the same channel receives every message, exactly as separate
+    workers do through Redis. Lets tests and single-process deployments exercise the multi-worker path.
+    """
+    name = "inprocess"
+    _subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+
+    async def _publish(self, data):
+        # Round-trip through JSON so nothing is shared by reference, as with a real broker.
+        payload = json.dumps(data)
+        for queue in list(self._subscribers[self.channel]):
+            queue.put_nowait(payload)
+
+    async def _listen(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[self.channel].append(queue)
+        try:
+            while True:
+                yield json.loads(await queue.get())
+        finally:
+            self._subscribers[self.channel].remove(queue)
+
+
+def create_client_manager(url: Optional[str], channel: str) -> Optional[socketio.AsyncManager]:
+    """The Socket.IO client manager for SOCKETIO_MESSAGE_QUEUE; None keeps the default single-process manager."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InProcessPubSubManager(channel=channel)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return socketio.AsyncRedisManager(url, channel=channel)
+    raise ValueError(f"Unsupported SOCKETIO_MESSAGE_QUEUE {url!r}; expected redis://, rediss://, unix:// or memory://")
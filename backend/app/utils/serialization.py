@@ -0,0 +1,60 @@
+from typing import Any, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+from app.config import settings
+import orjson
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding of plain payloads; dates and datetimes come out in the same ISO format as pydantic."""
+    return orjson.dumps(content)
+
+
+def encode(adapter: TypeAdapter, payload: Any) -> bytes:
+    """JSON for a response payload. With FAST_JSON it is encoded with orjson as built; otherwise it is
+    validated against the response schema first, as FastAPI's response_model would."""
+    if settings.FAST_JSON:
+        return dumps(payload)
+    return adapter.dump_json(adapter.validate_python(payload))
+
+
+def json_response(adapter: TypeAdapter, payload: Any) -> Response:
+    return Response(content=encode(adapter, payload), media_type="application/json")
+
+
+APPROACH_FIELDS = (
+    "approach_date", "approach_date_full", "velocity_kmh", "miss_distance_km", "miss_distance_lunar",
+    "orbiting_body", "id", "asteroid_id", "risk_score"
+)
+ASTEROID_FIELDS = (
+    "id", "name", "absolute_magnitude", "is_hazardous", "estimated_diameter_min",
+    "estimated_diameter_max", "nasa_jpl_url", "last_updated", "closest_approach_km"
+)
+
+
+def _columns(obj, fields) -> dict:
+    # Loaded column values live in the instance __dict__; reading them there skips SQLAlchemy's instrumented
+    # descriptors, which cost more than the encoding itself. Expired or unloaded attributes load as usual.
+    values = obj.__dict__
+    return {field: values[field] if field in values else getattr(obj, field) for field in fields}
+
+
+# Builders for responses made straight from ORM rows. They emit exactly the fields of the matching
+# response schema (tests compare them with the pydantic output), so those rows skip model validation.
+
+# Nullable columns the schemas declare as required get the defaults the models insert.
+
+def approach_payload(approach) -> dict:
+    """CloseApproachResponse fields of a CloseApproach."""
+    payload = _columns(approach, APPROACH_FIELDS)
+    payload["orbiting_body"] = payload["orbiting_body"] or "Earth"
+    return payload
+
+
+def asteroid_payload(asteroid, risk_score: Optional[str] = None) -> dict:
+    """AsteroidResponse fields of an Asteroid whose close_approaches are loaded, with ``risk_score`` in place of the stored one."""
+    payload = _columns(asteroid, ASTEROID_FIELDS)
+    payload["is_hazardous"] = bool(payload["is_hazardous"])
+    payload["close_approaches"] = [approach_payload(approach) for approach in asteroid.close_approaches]
+    payload["risk_score"] = risk_score
+    return payload
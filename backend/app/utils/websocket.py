@@ -1,30 +1,83 @@
 import socketio
-from typing import Dict
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+from app.config import settings
+from app.core.security import decode_access_token
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.chat_service import chat_service
+from app.utils.presence import create_presence_store
+from app.utils.pubsub import create_client_manager
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create Socket.IO server
+# Create Socket.IO server; with a message queue, emits reach clients connected to any worker
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    client_manager=create_client_manager(settings.SOCKETIO_MESSAGE_QUEUE, settings.SOCKETIO_CHANNEL),
     cors_allowed_origins='*',
     logger=True,
     engineio_logger=True
 )
 
-# Store active connections
+# Store active connections of this worker
 active_users: Dict[str, str] = {}  # sid -> user_email
 
+# Room membership shared by all workers
+presence = create_presence_store(settings.SOCKETIO_MESSAGE_QUEUE)
+
+
+def asteroid_room(asteroid_id) -> str:
+    return f"asteroid_{asteroid_id}"
+
+
+def user_room(user_id) -> str:
+    return f"user_{user_id}"
+
+
+async def authenticate(auth, environ) -> Optional[User]:
+    """The user behind the JWT sent as ``auth={'token': ...}`` or ``?token=``; None for guests."""
+    token = (auth or {}).get('token') if isinstance(auth, dict) else None
+    token = token or parse_qs(environ.get('QUERY_STRING', '')).get('token', [None])[0]
+    if not token:
+        return None
+    
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise ConnectionRefusedError('Invalid token')
+    
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, int(payload["sub"]))
+    if user is None or not user.is_active:
+        raise ConnectionRefusedError('User not found or inactive')
+    return user
+
 
 @sio.event
-async def connect(sid, environ):
-    logger.info(f"Client connected: {sid}")
-    await sio.emit('connection_established', {'sid': sid}, room=sid)
+async def connect(sid, environ, auth=None):
+    user = await authenticate(auth, environ)
+    if user is not None:
+        await sio.save_session(sid, {'user_id': user.id, 'user_email': user.email})
+        await sio.enter_room(sid, user_room(user.id))
+        active_users[sid] = user.email
+    
+    logger.info(f"Client connected: {sid} ({user.email if user else 'guest'})")
+    await sio.emit('connection_established', {'sid': sid, 'authenticated': user is not None}, room=sid)
+
+
+async def push_alerts(alerts: List[Dict]) -> None:
+    """Send newly generated alerts to their users' rooms, on whichever worker they are connected to."""
+    for alert in alerts:
+        await sio.emit('new_alert', alert, room=user_room(alert['user_id']))
 
 
 @sio.event
 async def disconnect(sid):
     logger.info(f"Client disconnected: {sid}")
+    for room in sio.rooms(sid):
+        if room != sid:
+            await presence.discard(room, sid)
     if sid in active_users:
         del active_users[sid]
 
@@ -33,18 +86,26 @@ async def disconnect(sid):
 async def join_asteroid_room(sid, data):
     """Join a chat room for a specific asteroid"""
     asteroid_id = data.get('asteroid_id')
-    user_email = data.get('user_email', 'Anonymous')
+    session = await sio.get_session(sid)
+    user_email = session.get('user_email') or data.get('user_email', 'Anonymous')
     
     if not asteroid_id:
         await sio.emit('error', {'message': 'asteroid_id required'}, room=sid)
         return
     
-    room = f"asteroid_{asteroid_id}"
+    room = asteroid_room(asteroid_id)
     await sio.enter_room(sid, room)
     active_users[sid] = user_email
+    await presence.add(room, sid, user_email)
     
     logger.info(f"User {user_email} ({sid}) joined room {room}")
     
+    # Replay recent history to the new member
+    await sio.emit('chat_history', {
+        'asteroid_id': asteroid_id,
+        'messages': await chat_service.recent(asteroid_id)
+    }, room=sid)
+    
     # Notify room
     await sio.emit('user_joined', {
         'user_email': user_email,
@@ -60,8 +121,9 @@ async def leave_asteroid_room(sid, data):
     if not asteroid_id:
         return
     
-    room = f"asteroidasteroid_{asteroid_id}"
+    room = asteroid_room(asteroid_id)
     await sio.leave_room(sid, room)
+    await presence.discard(room, sid)
     user_email = active_users.get(sid, 'Anonymous')
     
     logger.info(f"User {user_email} ({sid}) left room {room}")
@@ -79,22 +141,23 @@ async def send_message(sid, data):
     asteroid_id = data.get('asteroid_id')
     message = data.get('message')
     user_email = active_users.get(sid, 'Anonymous')
-    user_id = data.get('user_id')
+    session = await sio.get_session(sid)
+    user_id = session.get('user_id')
     
     if not asteroid_id or not message:
         await sio.emit('error', {'message': 'asteroid_id and message required'}, room=sid)
         return
+    if not isinstance(message, str) or not message.strip() or len(message) > settings.CHAT_MAX_MESSAGE_LENGTH:
+        await sio.emit('error', {'message': f'message must be text of at most {settings.CHAT_MAX_MESSAGE_LENGTH} characters'}, room=sid)
+        return
     
-    room = f"asteroid_{asteroid_id}"
+    room = asteroid_room(asteroid_id)
     
-    # Broadcast message to all in room
-    message_data = {
-        'asteroid_id': asteroid_id,
-        'user_email': user_email,
-        'user_id': user_id,
-        'message': message,
-        'timestamp': None  # Will be set by client
-    }
+    # Stored in batches; only an authenticated connection's user_id is stored
+    entry = chat_service.record(asteroid_id=asteroid_id, message=message, user_id=user_id, user_email=user_email)
+    
+    # Broadcast message to all in room; guests' client-supplied user_id is echoed for older clients
+    message_data = {**chat_service.to_payload(entry), 'asteroid_id': asteroid_id, 'user_id': user_id or data.get('user_id')}
     
     await sio.emit('new_message', message_data, room=room)
     logger.info(f"Message from {user_email} in {room}: {message[:50]}")
@@ -107,10 +170,7 @@ async def get_online_users(sid, data):
     if not asteroid_id:
         return
     
-    room = f"asteroid_{asteroid_id}"
-    room_sids = sio.manager.rooms.get('/', {}).get(room, set())
-    
-    online_users = [active_users.get(s, 'Anonymous') for s in room_sids if s in active_users]
+    online_users = await presence.members(asteroid_room(asteroid_id))
     
     await sio.emit('online_users', {
         'asteroid_id': asteroid_id,
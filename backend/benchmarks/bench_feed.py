@@ -0,0 +1,134 @@
+"""
+Feed query benchmark
+
+Compares the original single-query feed (join + distinct + joinedload) with the two-phase
+ID page + selectinload feed on a SQLite database seeded with 100k close approaches.
+
+    python -m benchmarks.bench_feed [--approaches 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, joinedload
+
+from app import crud
+from app.database import Base
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+
+FEED_START = date(2030, 1, 1)
+
+
+def seed(engine, approaches: int, per_asteroid: int = 5) -> None:
+    rng = random.Random(42)
+    asteroids = approaches // per_asteroid
+    with engine.begin() as conn:
+        conn.execute(insert(Asteroid), [{
+            "id": str(1000000 + i), "name": f"({i})", "is_hazardous": rng.random() < 0.1,
+            "estimated_diameter_min": 0.05, "estimated_diameter_max": rng.uniform(0.01, 2.0), "last_updated": datetime.utcnow()
+        } for i in range(asteroids)])
+        # Distinct days per asteroid: (asteroid_id, approach_date) is unique.
+        days = [rng.sample(range(365), -(-approaches // asteroids)) for _ in range(asteroids)]
+        rows = []
+        for i in range(approaches):
+            day = FEED_START + timedelta(days=days[i % asteroids][i // asteroids])
+            distance = rng.uniform(1e5, 7e7)
+            rows.append({
+                "asteroid_id": str(1000000 + i % asteroids), "approach_date": day, "approach_date_full": datetime.combine(day, datetime.min.time()),
+                "velocity_kmh": rng.uniform(1e4, 1e5), "miss_distance_km": distance, "miss_distance_lunar": distance / 384400,
+                "orbiting_body": "Earth", "updated_at": datetime.utcnow()
+            })
+        conn.execute(insert(CloseApproach), rows)
+
+
+def legacy_feed(db: Session, *, start_date: date, end_date: date, sort_by: str = "approach_date", limit: int = 50, offset: int = 0):
+    """The feed query as it was before the two-phase rewrite."""
+    query = db.query(Asteroid).join(Asteroid.close_approaches).filter(
+        CloseApproach.approach_date >= start_date, CloseApproach.approach_date <= end_date
+    )
+    if sort_by == "diameter":
+        query = query.order_by(Asteroid.estimated_diameter_max.desc())
+    else:
+        query = query.order_by(CloseApproach.approach_date.asc())
+    return query.distinct().options(joinedload(Asteroid.close_approaches)).offset(offset).limit(limit).all()
+
+
+def two_phase_feed(db: Session, **kwargs):
+    return crud.asteroid.get_feed_page(db, **kwargs)[0]
+
+
+def cursor_kwargs(engine, kwargs: dict) -> dict:
+    """The same page as an offset request, addressed by the cursor a client would hold after paging there."""
+    if not kwargs.get("offset"):
+        return kwargs
+    with Session(engine) as db:
+        _, cursor = crud.asteroid.get_feed_page(db, **{**kwargs, "offset": kwargs["offset"] - kwargs["limit"]})
+    return {**kwargs, "offset": 0, "cursor": cursor}
+
+
+def count_rows(engine, feed, kwargs) -> int:
+    """Rows the database hands back to Python for one call, summed over every statement it issues."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "after_cursor_execute", record)
+    try:
+        with Session(engine) as db:
+            feed(db, **kwargs)
+    finally:
+        event.remove(engine, "after_cursor_execute", record)
+
+    with engine.connect() as conn:
+        return sum(len(conn.exec_driver_sql(statement, parameters).fetchall()) for statement, parameters in statements)
+
+
+def time_feed(engine, feed, kwargs, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            feed(db, **kwargs)
+            samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--approaches", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.approaches)
+
+        cases = [
+            ("approach_date, first page", {"sort_by": "approach_date"}),
+            ("approach_date, offset 2000", {"sort_by": "approach_date", "offset": 2000}),
+            ("diameter, first page", {"sort_by": "diameter"}),
+        ]
+        print(f"{args.approaches} approaches, 30-day window, limit 50\n")
+        print(f"{'case':<28} {'query':<10} {'rows':>8} {'median ms':>10} {'max ms':>8}")
+        for label, extra in cases:
+            kwargs = {"start_date": FEED_START, "end_date": FEED_START + timedelta(days=30), "limit": 50, **extra}
+            runs = [("legacy", legacy_feed, kwargs), ("two-phase", two_phase_feed, kwargs)]
+            if kwargs.get("offset"):
+                runs.append(("cursor", two_phase_feed, cursor_kwargs(engine, kwargs)))
+            for name, feed, run_kwargs in runs:
+                rows = count_rows(engine, feed, run_kwargs)
+                timing = time_feed(engine, feed, run_kwargs, args.repeat)
+                print(f"{label:<28} {name:<10} {rows:>8} {timing['median_ms']:>10} {timing['max_ms']:>8}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
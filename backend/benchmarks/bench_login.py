@@ -0,0 +1,118 @@
+"""
+Login concurrency benchmark
+
+Fires bursts of concurrent logins at the ASGI app while a probe is due to request /health every 10 ms,
+once with bcrypt running on the event loop (as an ``async def`` handler calling passlib directly would)
+and once on the password hasher pool. Reports login throughput and the probe's latency, which is what every
+other request and socket on the worker experiences during the burst. Probe latency is measured from when
+each request was due, so requests the blocked loop could not even send are counted.
+
+    python -m benchmarks.bench_login [--logins 64] [--concurrency 16] [--rounds 12] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.deps import get_async_db
+from app.core import security
+from app.database import Base, create_db_engine, create_async_db_engine
+from app.main import fastapi_app
+from app.models.user import User
+
+EMAIL, PASSWORD = "bench@example.com", "benchpass123"
+
+
+async def inline_run(name, func, *args):
+    return func(*args)
+
+
+async def burst(client: httpx.AsyncClient, args) -> dict:
+    stop = asyncio.Event()
+    probe_ms = []
+
+    async def probe():
+        due = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/health")
+            probe_ms.append((time.perf_counter() - due) * 1000)
+            due += 0.01
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    statuses = []
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            statuses.append(response.status_code)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    ordered = sorted(probe_ms)
+    return {
+        "logins_per_s": round(statuses.count(200) / elapsed, 1),
+        "rejected": statuses.count(503),
+        "probe_p50_ms": round(statistics.median(ordered), 1),
+        "probe_p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 1),
+        "probe_max_ms": round(ordered[-1], 1),
+    }
+
+
+async def run(mode: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, async_engine = create_db_engine(url), create_async_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(User.__table__.insert(), {"email": EMAIL, "password_hash": security.pwd_context.hash(PASSWORD), "unread_alert_count": 0})
+        sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with sessions() as db:
+                yield db
+
+        hasher = security.PasswordHasher(workers=args.workers, max_pending=args.logins)
+        original = security.password_hasher._run
+        security.password_hasher._run = inline_run if mode == "event loop" else hasher._run
+        fastapi_app.dependency_overrides[get_async_db] = override_get_async_db
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fastapi_app), base_url="http://bench") as client:
+                return await burst(client, args)
+        finally:
+            security.password_hasher._run = original
+            fastapi_app.dependency_overrides.clear()
+            hasher.shutdown()
+            await async_engine.dispose()
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    security.pwd_context = security.pwd_context.copy(bcrypt__rounds=args.rounds)
+
+    print(f"{args.logins} logins, {args.concurrency} in flight, bcrypt rounds={args.rounds}, {args.workers} hasher workers, {os.cpu_count()} CPUs\n")
+    print(f"{'bcrypt on':<12} {'logins/s':>9} {'503s':>5} {'probe p50':>10} {'probe p95':>10} {'probe max':>10}")
+    for mode in ("event loop", "pool"):
+        result = asyncio.run(run(mode, args))
+        print(f"{mode:<12} {result['logins_per_s']:>9} {result['rejected']:>5} {result['probe_p50_ms']:>10} {result['probe_p95_ms']:>10} {result['probe_max_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
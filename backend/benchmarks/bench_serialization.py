@@ -0,0 +1,93 @@
+"""
+Feed serialization benchmark
+
+Serializes one 100-asteroid feed page (five close approaches each, built as ORM objects so no query is
+timed) three ways: validating into AsteroidFeedResponse and encoding with jsonable_encoder + json.dumps,
+as FastAPI does for a returned dict; validating and encoding with pydantic's model_dump_json, as the feed
+does by default; and the prebuilt payload encoded with orjson, as the feed does with FAST_JSON=true.
+
+    python -m benchmarks.bench_serialization [--asteroids 100] [--approaches 5] [--repeat 500]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+from app.schemas.asteroid import AsteroidFeedResponse
+from app.utils.serialization import asteroid_payload, dumps
+
+
+def make_page(asteroids: int, approaches: int):
+    rng = random.Random(42)
+    page = []
+    for i in range(asteroids):
+        asteroid = Asteroid(
+            id=str(1000000 + i), name=f"({2030 + i} AB{i})", absolute_magnitude=rng.uniform(15, 30), is_hazardous=rng.random() < 0.1,
+            estimated_diameter_min=0.05, estimated_diameter_max=rng.uniform(0.01, 2.0), nasa_jpl_url=f"https://ssd.jpl.nasa.gov/sbdb.cgi?sstr={1000000 + i}",
+            risk_score="LOW", closest_approach_km=rng.uniform(1e5, 7e7), last_updated=datetime.utcnow()
+        )
+        for j in range(approaches):
+            day = date(2030, 1, 1) + timedelta(days=rng.randrange(365))
+            distance = rng.uniform(1e5, 7e7)
+            asteroid.close_approaches.append(CloseApproach(
+                id=i * approaches + j, asteroid_id=asteroid.id, approach_date=day, approach_date_full=datetime.combine(day, datetime.min.time()),
+                velocity_kmh=rng.uniform(1e4, 1e5), miss_distance_km=distance, miss_distance_lunar=distance / 384400, orbiting_body="Earth", risk_score="LOW"
+            ))
+        page.append(asteroid)
+    return page
+
+
+def feed_dict(page) -> dict:
+    """The dict the feed built before the orjson path: ORM approaches left for validation to convert."""
+    return {"count": len(page), "asteroids": [{
+        "id": a.id, "name": a.name, "absolute_magnitude": a.absolute_magnitude, "is_hazardous": a.is_hazardous,
+        "estimated_diameter_min": a.estimated_diameter_min, "estimated_diameter_max": a.estimated_diameter_max,
+        "nasa_jpl_url": a.nasa_jpl_url, "last_updated": a.last_updated, "close_approaches": a.close_approaches,
+        "risk_score": a.risk_score, "closest_approach_km": a.closest_approach_km
+    } for a in page], "next_cursor": None}
+
+
+def validate_stdlib(page) -> bytes:
+    content = jsonable_encoder(AsteroidFeedResponse.model_validate(feed_dict(page)))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def validate_pydantic(page) -> bytes:
+    return AsteroidFeedResponse.model_validate(feed_dict(page)).model_dump_json().encode()
+
+
+def prebuilt_orjson(page) -> bytes:
+    return dumps({"count": len(page), "asteroids": [asteroid_payload(a, a.risk_score) for a in page], "next_cursor": None})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--asteroids", type=int, default=100)
+    parser.add_argument("--approaches", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    page = make_page(args.asteroids, args.approaches)
+    outputs = {name: func(page) for name, func in (("validate + json.dumps", validate_stdlib), ("validate + model_dump_json", validate_pydantic), ("prebuilt + orjson", prebuilt_orjson))}
+    assert len({json.dumps(json.loads(body), sort_keys=True) for body in outputs.values()}) == 1, "serializers disagree"
+
+    print(f"{args.asteroids} asteroids x {args.approaches} approaches, {len(outputs['prebuilt + orjson'])} bytes, {args.repeat} runs\n")
+    print(f"{'serializer':<28}{'median ms':>10}{'p95 ms':>9}")
+    for name, func in (("validate + json.dumps", validate_stdlib), ("validate + model_dump_json", validate_pydantic), ("prebuilt + orjson", prebuilt_orjson)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            func(page)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f"{name:<28}{statistics.median(timings):>10.3f}{timings[int(len(timings) * 0.95)]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
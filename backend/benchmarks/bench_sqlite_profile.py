@@ -0,0 +1,111 @@
+"""
+SQLite storage profile benchmark
+
+Measures feed read throughput and latency while an ingest run is writing, once with SQLite's default
+rollback journal and once with the production profile (WAL, synchronous=NORMAL, larger cache, mmap).
+
+    python -m benchmarks.bench_sqlite_profile [--readers 4] [--seconds 5] [--approaches 50000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base, create_db_engine
+from app.services.ingest_service import ingest_service
+from benchmarks.bench_feed import FEED_START, seed
+
+
+def sync_feed(asteroids: int, rng: random.Random):
+    """A NASA-sized sync: every asteroid is rewritten with a fresh set of approaches."""
+    feed = []
+    for i in range(asteroids):
+        day = FEED_START + timedelta(days=rng.randrange(365))
+        feed.append({
+            "id": str(1000000 + i), "name": f"({i})", "is_hazardous": rng.random() < 0.1, "estimated_diameter_max": rng.uniform(0.01, 2.0),
+            "close_approaches": [{"approach_date": day.isoformat(), "velocity_kmh": rng.uniform(1e4, 1e5), "miss_distance_km": rng.uniform(1e5, 7e7), "miss_distance_lunar": 20.0}]
+        })
+    return feed
+
+
+def run(profile: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", profile=profile)
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.approaches)
+        feed = sync_feed(args.approaches // 5, random.Random(7))
+
+        stop = threading.Event()
+        latencies, errors, batches = [], [0], [0]
+        lock = threading.Lock()
+
+        def reader(seed_value: int):
+            rng = random.Random(seed_value)
+            while not stop.is_set():
+                start = FEED_START + timedelta(days=rng.randrange(300))
+                started = time.perf_counter()
+                try:
+                    with Session(engine) as db:
+                        crud.asteroid.get_feed_page(db, start_date=start, end_date=start + timedelta(days=7), limit=50)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                except OperationalError:
+                    with lock:
+                        errors[0] += 1
+
+        def writer():
+            while not stop.is_set():
+                with Session(engine) as db:
+                    try:
+                        batches[0] += len(ingest_service.ingest(db, feed, batch_size=args.batch_size)["batches"])
+                    except OperationalError:
+                        pass
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        if not args.no_writer:
+            threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    ordered = sorted(latencies)
+    return {
+        "reads_per_s": round(len(latencies) / args.seconds, 1),
+        "p50_ms": round(statistics.median(ordered), 2) if ordered else None,
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2) if ordered else None,
+        "max_ms": round(ordered[-1], 2) if ordered else None,
+        "read_errors": errors[0], "batches_written": batches[0]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--approaches", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--no-writer", action="store_true", help="measure reads without a concurrent ingest")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers for {args.seconds}s, {'no writer' if args.no_writer else 'ingest running'}, {args.approaches} approaches\n")
+    print(f"{'profile':<12} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>9} {'errors':>7} {'batches':>8}")
+    for profile in ("default", "production"):
+        result = run(profile, args)
+        print(f"{profile:<12} {result['reads_per_s']:>8} {result['p50_ms']!s:>8} {result['p95_ms']!s:>8} {result['max_ms']!s:>9} {result['read_errors']:>7} {result['batches_written']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,48 @@ Pytest Configuration and Fixtures
 
 Provides test database and client fixtures for API testing.
 """
+import os
+import tempfile
 import pytest
+
+# Tests talk to mocked transports; never read or write the on-disk NASA response cache.
+os.environ.setdefault("NASA_CACHE_ENABLED", "False")
+# Tests build their own schema with create_all; the app must not migrate its configured database on startup.
+os.environ.setdefault("DB_AUTO_MIGRATE", "False")
+# The minimum bcrypt cost keeps registering test users fast.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.main import app
-from app.database import Base
-from app.api.deps import get_db
+from app.main import fastapi_app as app
+from app.database import Base, apply_sqlite_pragmas
+from app.api.deps import get_db, get_async_db
+from app.utils.cache import response_cache
+from app.core.principals import principal_cache
+from app.services.timeline_service import approach_timeline
 
 
-# Test database - in-memory SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Test database - a temporary SQLite file, so the sync and async engines see the same data
+TEST_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="cosmic_watch_tests_"), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 
+# NullPool: TestClient runs each test on its own event loop, and aiosqlite connections cannot move between loops.
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_PATH}", poolclass=NullPool)
+
+apply_sqlite_pragmas(engine)
+apply_sqlite_pragmas(async_engine)
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 @pytest.fixture(scope="function")
@@ -55,7 +76,15 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    response_cache.invalidate()
+    principal_cache.clear()
+    approach_timeline.invalidate()
     
     with TestClient(app) as test_client:
         yield test_client
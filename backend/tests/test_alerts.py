@@ -0,0 +1,231 @@
+"""
+Alerts Tests
+
+Tests for alert generation and the alerts API.
+"""
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.models.alert import Alert
+from app.models.close_approach import CloseApproach
+from app.models.watchlist import Watchlist
+from app.services.alert_service import AlertService
+
+
+def add_approach(db, asteroid_id, days_ahead, miss_distance_km=200000):
+    approach_day = date.today() + timedelta(days=days_ahead)
+    approach = CloseApproach(
+        asteroid_id=asteroid_id,
+        approach_date=approach_day,
+        approach_date_full=datetime.combine(approach_day, datetime.min.time()),
+        velocity_kmh=40000,
+        miss_distance_km=miss_distance_km,
+        miss_distance_lunar=miss_distance_km / 384400,
+        orbiting_body="Earth"
+    )
+    db.add(approach)
+    db.commit()
+    return approach
+
+
+@pytest.fixture
+def watched_asteroid(db, client, test_user, sample_asteroid):
+    response = client.post(
+        "/api/v1/watchlist",
+        json={"asteroid_id": sample_asteroid.id, "alert_distance_km": 1000000},
+        headers=test_user["headers"]
+    )
+    assert response.status_code == 201
+    return sample_asteroid
+
+
+class TestAlertGeneration:
+    """Tests for AlertService.generate_alerts_for_approaches"""
+
+    def test_creates_alert_for_close_approach(self, db, watched_asteroid):
+        """Test an approach within the alert distance produces one alert"""
+        add_approach(db, watched_asteroid.id, days_ahead=3)
+
+        assert AlertService().generate_alerts_for_approaches(db) == 1
+        alert = db.query(Alert).one()
+        assert alert.asteroid_id == watched_asteroid.id
+        assert alert.message.startswith("⚠️ HAZARDOUS")
+
+    def test_ignores_distant_and_past_approaches(self, db, watched_asteroid):
+        """Test approaches outside the distance or the window are skipped"""
+        add_approach(db, watched_asteroid.id, days_ahead=3, miss_distance_km=5000000)
+        add_approach(db, watched_asteroid.id, days_ahead=-3)
+        add_approach(db, watched_asteroid.id, days_ahead=45)
+
+        assert AlertService().generate_alerts_for_approaches(db) == 0
+
+    def test_does_not_duplicate_alerts(self, db, watched_asteroid):
+        """Test running generation twice does not create duplicates"""
+        add_approach(db, watched_asteroid.id, days_ahead=3)
+        service = AlertService()
+
+        assert service.generate_alerts_for_approaches(db) == 1
+        assert service.generate_alerts_for_approaches(db) == 0
+        assert db.query(Alert).count() == 1
+
+    def test_incremental_picks_up_new_approaches(self, db, watched_asteroid):
+        """Test an incremental run sees approaches written after the previous run"""
+        service = AlertService()
+        assert service.generate_alerts_for_approaches(db, incremental=True) == 0
+
+        add_approach(db, watched_asteroid.id, days_ahead=5)
+        assert service.generate_alerts_for_approaches(db, incremental=True) == 1
+
+    def test_incremental_skips_unchanged_rows(self, db, watched_asteroid):
+        """Test an incremental run ignores approaches older than the last run"""
+        add_approach(db, watched_asteroid.id, days_ahead=5)
+        db.query(CloseApproach).update({"updated_at": datetime.utcnow() - timedelta(days=1)})
+        db.query(Watchlist).update({"updated_at": datetime.utcnow() - timedelta(days=1)})
+        db.commit()
+        service = AlertService()
+        service.last_run_at = datetime.utcnow()
+        service.last_horizon = date.today() + timedelta(days=AlertService.ALERT_WINDOW_DAYS)
+
+        assert service.generate_alerts_for_approaches(db, incremental=True) == 0
+        assert service.generate_alerts_for_approaches(db) == 1
+
+
+class TestAlertPush:
+    """Tests for pushing generated alerts over Socket.IO"""
+
+    def test_pushes_new_alerts_to_user_room(self, db, watched_asteroid, monkeypatch):
+        """Test generated alerts are emitted as new_alert to their owner's room"""
+        from app.utils import websocket
+        add_approach(db, watched_asteroid.id, days_ahead=3)
+        emitted = []
+
+        async def emit(event, data, room=None, **kwargs):
+            emitted.append((event, data, room))
+        monkeypatch.setattr(websocket.sio, "emit", emit)
+
+        alerts = AlertService().generate(db)
+        asyncio.run(websocket.push_alerts(alerts))
+
+        alert = db.query(Alert).one()
+        assert emitted == [("new_alert", alerts[0], f"user_{alert.user_id}")]
+        assert alerts[0]["id"] == alert.id
+        assert alerts[0]["asteroid_name"] == watched_asteroid.name
+
+
+class TestUnreadCounter:
+    """Tests for the denormalized users.unread_alert_count"""
+
+    def unread(self, db, user_id):
+        return db.query(Alert).filter(Alert.user_id == user_id, Alert.is_read == False).count()
+
+    def test_counter_follows_alert_writes(self, db, test_user, sample_asteroid):
+        """Test every alert write keeps the counter equal to the real unread count"""
+        from app import crud
+        from app.models.user import User
+        user_id = db.query(User).one().id
+        counts = []
+
+        first = crud.alert.create(db, user_id=user_id, asteroid_id=sample_asteroid.id, message="one")
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+        crud.alert.bulk_create(db, alerts=[{"user_id": user_id, "asteroid_id": sample_asteroid.id, "message": f"bulk {i}"} for i in range(3)])
+        db.commit()
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+        crud.alert.update(db, db_obj=first, obj_in={"is_read": True})
+        crud.alert.update(db, db_obj=first, obj_in={"is_read": True})
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+        crud.alert.remove(db, id=first.id)
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+        crud.alert.remove(db, id=db.query(Alert).first().id)
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+        crud.alert.mark_all_as_read(db, user_id=user_id)
+        counts.append(crud.alert.count_unread(db, user_id=user_id))
+
+        assert counts == [1, 4, 3, 3, 2, 0]
+        assert self.unread(db, user_id) == 0
+
+    def test_reconcile_repairs_drift(self, db, test_user, sample_asteroid):
+        """Test the reconciliation job resets a counter that no longer matches the alerts"""
+        from app import crud
+        from app.models.user import User
+        user = db.query(User).one()
+        crud.alert.create(db, user_id=user.id, asteroid_id=sample_asteroid.id, message="one")
+        user.unread_alert_count = 7
+        db.commit()
+
+        assert crud.alert.reconcile_unread_counts(db) == 1
+        db.commit()
+        db.refresh(user)
+        assert user.unread_alert_count == 1
+        assert crud.alert.reconcile_unread_counts(db) == 0
+
+    def test_unread_count_endpoint(self, client, db, test_user, watched_asteroid):
+        """Test the badge endpoint reports alerts created by the generator"""
+        add_approach(db, watched_asteroid.id, days_ahead=3)
+        AlertService().generate_alerts_for_approaches(db)
+
+        response = client.get("/api/v1/alerts/unread/count", headers=test_user["headers"])
+
+        assert response.json() == {"unread_count": 1}
+
+
+class TestAlertsAPI:
+    """Tests for the alerts listing endpoint"""
+
+    def test_cursor_pagination(self, client, db, test_user, sample_asteroid):
+        """Test X-Next-Cursor pages through alerts sharing a timestamp without gaps or duplicates"""
+        from app import crud
+        from app.models.user import User
+        user_id = db.query(User).one().id
+        crud.alert.bulk_create(db, alerts=[{"user_id": user_id, "asteroid_id": sample_asteroid.id, "message": f"alert {i}"} for i in range(5)])
+        db.commit()
+
+        seen, params = [], {"limit": 2}
+        while True:
+            response = client.get("/api/v1/alerts", params=params, headers=test_user["headers"])
+            assert response.status_code == 200
+            seen.extend(a["id"] for a in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+        assert seen == sorted(seen, reverse=True)
+        assert len(set(seen)) == 5
+
+    def test_delta_since_last_seen(self, client, db, test_user, sample_asteroid):
+        """Test the delta endpoint returns only alerts newer than after_id, oldest first"""
+        from app import crud
+        from app.models.user import User
+        user_id = db.query(User).one().id
+        ids = [row.id for row in crud.alert.bulk_create(db, alerts=[{"user_id": user_id, "asteroid_id": sample_asteroid.id, "message": f"alert {i}"} for i in range(3)])]
+        db.commit()
+
+        response = client.get("/api/v1/alerts/delta", params={"after_id": ids[0]}, headers=test_user["headers"])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [a["id"] for a in body["alerts"]] == ids[1:]
+        assert body["last_id"] == ids[-1]
+        assert body["has_more"] is False
+        assert body["unread_count"] == 3
+
+        caught_up = client.get("/api/v1/alerts/delta", params={"after_id": body["last_id"]}, headers=test_user["headers"]).json()
+        assert caught_up["alerts"] == [] and caught_up["last_id"] == ids[-1]
+
+
+class TestAlertPayload:
+    """Tests for the alert payload served with orjson"""
+
+    def test_alert_payload_matches_schema(self, db, test_user, sample_asteroid):
+        """Test alert_payload has exactly the AlertResponse fields"""
+        from datetime import datetime
+        from app import crud
+        from app.api.v1.alerts import alert_payload
+        from app.schemas.alert import AlertResponse
+
+        user = crud.user.get_by_email(db, email=test_user["email"])
+        alert = crud.alert.create(db, user_id=user.id, asteroid_id=sample_asteroid.id, message="Close approach", alert_type="close_approach", approach_date=datetime(2030, 1, 15))
+        payload = alert_payload(alert)
+
+        assert set(payload) == set(AlertResponse.model_fields)
+        assert AlertResponse.model_validate(payload).model_dump() == payload
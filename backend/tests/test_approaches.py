@@ -0,0 +1,104 @@
+"""
+Approach Timeline Tests
+
+Tests for the in-memory upcoming-approaches timeline.
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.services.ingest_service import ingest_service
+from app.services.timeline_service import utc_today
+from tests.conftest import async_engine
+from tests.test_ingest import make_asteroid
+
+TODAY = utc_today()
+
+
+def approach(days, time=None, lunar=50.0):
+    approach_date = TODAY + timedelta(days=days)
+    full = f"{approach_date.isoformat()} {time}" if time else None
+    return {"approach_date": approach_date.isoformat(), "approach_date_full": full, "velocity_kmh": 45000.0, "miss_distance_km": lunar * 384400, "miss_distance_lunar": lunar}
+
+
+@pytest.fixture
+def timeline_feed(db):
+    asteroids = [
+        make_asteroid("3100001", name="(Late)", approaches=[approach(1, "18:00")]),
+        make_asteroid("3100002", name="(Early)", approaches=[approach(1, "06:30"), approach(40, "06:30")]),
+        make_asteroid("3100003", name="(No Time)", approaches=[approach(1)]),
+        make_asteroid("3100004", name="(Past)", approaches=[approach(-2, "12:00")]),
+        {**make_asteroid("3100005", name="(Hazardous)", approaches=[approach(3, "09:00", lunar=0.5)]), "is_hazardous": True},
+    ]
+    ingest_service.ingest(db, asteroids)
+
+
+class TestUpcomingApproaches:
+    """Tests for GET /api/v1/approaches/upcoming"""
+
+    def test_sorted_by_approach_time(self, client, timeline_feed):
+        """Test approaches in the window are ordered by time with the asteroid summary attached"""
+        response = client.get("/api/v1/approaches/upcoming", params={"days": 30})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["asteroid"]["name"] for a in data] == ["(No Time)", "(Early)", "(Late)", "(Hazardous)"]
+        assert data[1]["approach_date_full"].endswith("06:30:00")
+        assert data[3]["asteroid"]["is_hazardous"] is True
+        assert data[3]["risk_score"] == data[3]["asteroid"]["risk_score"] == "EXTREME"
+
+    def test_window_bounds(self, client, timeline_feed):
+        """Test start and days select a time range, including within a day"""
+        start = datetime.combine(TODAY + timedelta(days=1), datetime.min.time()) + timedelta(hours=12)
+        response = client.get("/api/v1/approaches/upcoming", params={"start": start.isoformat(), "days": 1})
+
+        assert [a["asteroid"]["name"] for a in response.json()] == ["(Late)"]
+
+    def test_filters_and_limit(self, client, timeline_feed):
+        """Test hazardous, risk and limit filters on the timeline"""
+        assert [a["asteroid_id"] for a in client.get("/api/v1/approaches/upcoming", params={"is_hazardous": True}).json()] == ["3100005"]
+        assert [a["asteroid_id"] for a in client.get("/api/v1/approaches/upcoming", params={"min_risk": "HIGH"}).json()] == ["3100005"]
+        assert len(client.get("/api/v1/approaches/upcoming", params={"limit": 2}).json()) == 2
+
+    def test_served_from_memory_until_ingest(self, client, db, timeline_feed):
+        """Test repeat requests issue no queries and an ingest refreshes the timeline"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        assert len(client.get("/api/v1/approaches/upcoming").json()) == 4
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            assert len(client.get("/api/v1/approaches/upcoming").json()) == 4
+            assert statements == []
+
+            ingest_service.ingest(db, [make_asteroid("3100006", name="(New)", approaches=[approach(2, "12:00")])])
+            names = [a["asteroid"]["name"] for a in client.get("/api/v1/approaches/upcoming").json()]
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert "(New)" in names
+        assert statements
+
+    @pytest.mark.parametrize("offset_days, days", [(25, 30), (-1, 1), (31, 1)])
+    def test_window_outside_index_rejected(self, client, timeline_feed, offset_days, days):
+        """Test a range reaching outside the indexed days is a 422 rather than a silently short result"""
+        start = datetime.combine(TODAY + timedelta(days=offset_days), datetime.min.time())
+        response = client.get("/api/v1/approaches/upcoming", params={"start": start.isoformat(), "days": days})
+
+        assert response.status_code == 422
+
+    def test_aware_start_converted_to_utc(self, client, timeline_feed):
+        """Test a start with a UTC offset selects the same UTC range"""
+        start = (datetime.combine(TODAY + timedelta(days=1), datetime.min.time()) + timedelta(hours=14)).isoformat() + "+02:00"
+        response = client.get("/api/v1/approaches/upcoming", params={"start": start, "days": 1})
+
+        assert [a["asteroid"]["name"] for a in response.json()] == ["(Late)"]
+
+    def test_days_beyond_index_rejected(self, client):
+        """Test a window longer than the indexed horizon is a validation error"""
+        from app.config import settings
+        response = client.get("/api/v1/approaches/upcoming", params={"days": settings.TIMELINE_DAYS + 1})
+
+        assert response.status_code == 422
@@ -52,6 +52,128 @@ class TestAsteroidFeed:
         )
         
         assert response.status_code == 200
+    
+    def test_get_feed_sort_by_risk(self, client, db):
+        """Test the feed can be filtered and ordered by stored risk"""
+        from app.services.ingest_service import ingest_service
+        today = date.today().isoformat()
+        feed = []
+        for asteroid_id, hazardous, lunar in [("3000001", False, 15.0), ("3000002", True, 0.5), ("3000003", True, 15.0)]:
+            feed.append({
+                "id": asteroid_id, "name": f"({asteroid_id})", "is_hazardous": hazardous, "estimated_diameter_max": 0.3,
+                "close_approaches": [{"approach_date": today, "miss_distance_km": lunar * 384400, "miss_distance_lunar": lunar}]
+            })
+        ingest_service.ingest(db, feed)
+        
+        response = client.get("/api/v1/asteroids/feed", params={"sort_by": "risk", "min_risk": "HIGH"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["id"] for a in data["asteroids"]] == ["3000002", "3000003"]
+        assert [a["risk_score"] for a in data["asteroids"]] == ["EXTREME", "HIGH"]
+    
+    def test_risk_sort_matches_displayed_score(self, client, db):
+        """Test the risk sort and filter use the score the feed shows, even when it comes from an approach outside the window"""
+        from app.services.ingest_service import ingest_service
+        today, later = date.today(), date.today() + timedelta(days=60)
+        ingest_service.ingest(db, [
+            {"id": "3000001", "name": "(3000001)", "is_hazardous": False, "estimated_diameter_max": 0.6, "close_approaches": [
+                {"approach_date": today.isoformat(), "miss_distance_km": 25.0 * 384400, "miss_distance_lunar": 25.0},
+                {"approach_date": later.isoformat(), "miss_distance_km": 0.5 * 384400, "miss_distance_lunar": 0.5}
+            ]},
+            {"id": "3000002", "name": "(3000002)", "is_hazardous": True, "estimated_diameter_max": 0.3, "close_approaches": [
+                {"approach_date": today.isoformat(), "miss_distance_km": 15.0 * 384400, "miss_distance_lunar": 15.0}
+            ]}
+        ])
+        
+        response = client.get("/api/v1/asteroids/feed", params={"sort_by": "risk", "min_risk": "MODERATE"})
+        
+        assert response.status_code == 200
+        asteroids = response.json()["asteroids"]
+        assert [a["id"] for a in asteroids] == ["3000002", "3000001"]
+        assert [a["risk_score"] for a in asteroids] == ["HIGH", "MODERATE"]
+    
+    @pytest.mark.parametrize("sort_by", ["approach_date", "diameter", "risk"])
+    def test_get_feed_cursor_walks_every_row(self, client, db, sort_by):
+        """Test following next_cursor returns every asteroid exactly once, in order"""
+        from app.services.ingest_service import ingest_service
+        feed = [{
+            "id": str(3000000 + i), "name": f"({i})", "estimated_diameter_max": 0.1 * (i % 3),
+            "close_approaches": [{"approach_date": (date.today() + timedelta(days=i % 2)).isoformat(), "miss_distance_lunar": 15.0 + i % 4}]
+        } for i in range(7)]
+        ingest_service.ingest(db, feed)
+        
+        full = client.get("/api/v1/asteroids/feed", params={"sort_by": sort_by, "limit": 100}).json()
+        seen, cursor = [], None
+        while True:
+            params = {"sort_by": sort_by, "limit": 3, **({"cursor": cursor} if cursor else {})}
+            data = client.get("/api/v1/asteroids/feed", params=params).json()
+            seen.extend(a["id"] for a in data["asteroids"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        assert seen == [a["id"] for a in full["asteroids"]]
+        assert len(seen) == 7
+    
+    def test_get_feed_cursor_sort_mismatch(self, client):
+        """Test a cursor cannot be replayed against a different sort order"""
+        from app.utils.pagination import encode_cursor
+        cursor = encode_cursor(["risk", 30, "3000001"])
+        
+        assert client.get("/api/v1/asteroids/feed", params={"cursor": cursor}).status_code == 400
+        assert client.get("/api/v1/asteroids/feed", params={"cursor": "not-a-cursor"}).status_code == 400
+    
+    @pytest.mark.parametrize("values", [
+        ["approach_date", 30, "3000001"],
+        ["approach_date", "2030-01-01", 3000001],
+        ["risk", "30", "3000001"],
+        ["risk", True, "3000001"],
+        ["diameter", 0.2, None],
+    ])
+    def test_get_feed_cursor_wrong_types(self, client, values):
+        """Test a well-formed cursor holding values of the wrong types is rejected"""
+        from app.utils.pagination import encode_cursor
+        response = client.get("/api/v1/asteroids/feed", params={"sort_by": values[0], "cursor": encode_cursor(values)})
+        
+        assert response.status_code == 400
+    
+    def test_get_feed_invalid_min_risk(self, client):
+        """Test an unknown risk category is rejected"""
+        response = client.get("/api/v1/asteroids/feed", params={"min_risk": "SEVERE"})
+        
+        assert response.status_code == 422
+
+
+class TestAsteroidResponseCache:
+    """Tests for cached read endpoints"""
+    
+    def test_etag_and_not_modified(self, client, sample_asteroid):
+        """Test cached responses carry an ETag and answer If-None-Match with 304"""
+        response = client.get(f"/api/v1/asteroids/{sample_asteroid.id}")
+        
+        assert response.status_code == 200
+        assert "max-age" in response.headers["Cache-Control"]
+        etag = response.headers["ETag"]
+        
+        cached = client.get(f"/api/v1/asteroids/{sample_asteroid.id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+    
+    def test_ingest_invalidates(self, client, db, sample_asteroid):
+        """Test an ingest run drops cached responses"""
+        from app.services.ingest_service import ingest_service
+        first = client.get("/api/v1/asteroids/hazardous")
+        assert [a["id"] for a in first.json()] == [sample_asteroid.id]
+        
+        ingest_service.ingest(db, [{
+            "id": "3000001", "name": "(New)", "is_hazardous": True,
+            "close_approaches": [{"approach_date": date.today().isoformat(), "miss_distance_km": 5000000.0}]
+        }])
+        second = client.get("/api/v1/asteroids/hazardous", headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert second.status_code == 200
+        assert {a["id"] for a in second.json()} == {sample_asteroid.id, "3000001"}
 
 
 class TestAsteroidSearch:
@@ -123,3 +245,96 @@ class TestAsteroidHazardous:
         if len(data) > 0:
             for asteroid in data:
                 assert asteroid["is_hazardous"] == True
+
+
+class TestFastSerialization:
+    """Tests for the prebuilt ORM payloads served with orjson"""
+    
+    def test_asteroid_payload_matches_schema(self, sample_asteroid):
+        """Test the prebuilt payload encodes exactly like the validated AsteroidResponse"""
+        import json
+        from app.schemas.asteroid import AsteroidResponse
+        from app.utils.serialization import asteroid_payload, dumps
+        
+        expected = AsteroidResponse.model_validate(sample_asteroid).model_copy(update={"risk_score": "HIGH"}).model_dump_json()
+        assert json.loads(dumps(asteroid_payload(sample_asteroid, "HIGH"))) == json.loads(expected)
+    
+    def test_asteroid_payload_loads_expired_attributes(self, db, sample_asteroid):
+        """Test attributes expired by a commit are loaded instead of missing from the payload"""
+        from app.utils.serialization import asteroid_payload
+        
+        db.expire(sample_asteroid)
+        payload = asteroid_payload(sample_asteroid)
+        
+        assert payload["name"] == "(2024 Test)"
+        assert payload["close_approaches"][0]["miss_distance_lunar"] == 13.0
+    
+    def test_fast_json_matches_validated_responses(self, client, db, test_user, sample_asteroid, monkeypatch):
+        """Test FAST_JSON serves the same bodies as the validated path"""
+        from app import crud
+        from app.config import settings
+        from app.utils.cache import response_cache
+        user = crud.user.get_by_email(db, email=test_user["email"])
+        crud.alert.create(db, user_id=user.id, asteroid_id=sample_asteroid.id, message="Close approach")
+        crud.watchlist.create(db, user_id=user.id, asteroid_id=sample_asteroid.id)
+        paths = [
+            "/api/v1/asteroids/search?q=2024", "/api/v1/asteroids/hazardous", f"/api/v1/asteroids/{sample_asteroid.id}", "/api/v1/asteroids/feed",
+            "/api/v1/alerts", "/api/v1/alerts/delta", "/api/v1/watchlist"
+        ]
+        
+        bodies = {}
+        for fast in (False, True):
+            monkeypatch.setattr(settings, "FAST_JSON", fast)
+            response_cache.invalidate()
+            bodies[fast] = [client.get(path, headers=test_user["headers"]).json() for path in paths]
+        
+        assert bodies[True] == bodies[False]
+        assert all(bodies[True])
+    
+    def test_fast_json_fills_nullable_columns(self, client, db, sample_asteroid, monkeypatch):
+        """Test NULL columns the schema declares as required are served with their defaults"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "FAST_JSON", True)
+        sample_asteroid.is_hazardous = None
+        sample_asteroid.close_approaches[0].orbiting_body = None
+        db.commit()
+        
+        asteroid = client.get("/api/v1/asteroids/search", params={"q": "2024"}).json()[0]
+        
+        assert asteroid["is_hazardous"] is False
+        assert asteroid["close_approaches"][0]["orbiting_body"] == "Earth"
+
+
+
+class TestAsteroidSync:
+    """Tests for POST /api/v1/asteroids/sync"""
+
+    def test_sync_requires_auth(self, client):
+        """Test a sync without a bearer token is refused"""
+        response = client.post("/api/v1/asteroids/sync")
+
+        assert response.status_code == 403
+
+    def test_sync_range_is_capped(self, client, test_user, monkeypatch):
+        """Test ranges longer than SYNC_MAX_DAYS are refused before anything is fetched"""
+        from app.api.v1 import asteroids
+        calls = []
+
+        async def backfill(db, start_date, end_date, concurrency=None):
+            calls.append((start_date, end_date))
+            return {"asteroids": 0, "windows": 1, "approaches": 0, "batches": 0}
+        monkeypatch.setattr(asteroids.ingest_service, "backfill", backfill)
+
+        response = client.post(
+            "/api/v1/asteroids/sync", headers=test_user["headers"],
+            params={"start_date": "2024-01-01", "end_date": "2024-12-31"}
+        )
+        assert response.status_code == 400
+        assert calls == []
+
+        response = client.post(
+            "/api/v1/asteroids/sync", headers=test_user["headers"],
+            params={"start_date": "2024-01-01", "end_date": "2024-01-07"}
+        )
+        assert response.status_code == 200
+        assert calls == [(date(2024, 1, 1), date(2024, 1, 7))]
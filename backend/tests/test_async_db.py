@@ -0,0 +1,50 @@
+"""
+Async Database Tests
+
+Tests for the AsyncSession path used by read handlers.
+"""
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from app import crud
+from tests.conftest import TestingAsyncSessionLocal
+
+SLOW_QUERY = text("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 2000000) SELECT count(*) FROM c")
+
+
+class TestAsyncCRUD:
+    """Tests for crud.aio"""
+
+    def test_matches_sync_crud(self, db, sample_asteroid):
+        """Test awaitable CRUD methods return the same rows as the sync ones"""
+        async def run():
+            async with TestingAsyncSessionLocal() as async_db:
+                return await crud.aio.asteroid.get_hazardous(async_db)
+
+        asteroids = asyncio.run(run())
+
+        assert [a.id for a in asteroids] == [a.id for a in crud.asteroid.get_hazardous(db)]
+        assert len(asteroids[0].close_approaches) == 1
+
+    def test_slow_query_does_not_block_event_loop(self, db):
+        """Test other coroutines keep running while a query is in flight"""
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            async with TestingAsyncSessionLocal() as async_db:
+                count = (await async_db.execute(SLOW_QUERY)).scalar_one()
+            task.cancel()
+            return count, ticks
+
+        count, ticks = asyncio.run(run())
+
+        assert count == 2000000
+        assert ticks > 0
@@ -134,3 +134,102 @@ class TestAuthMe:
         )
         
         assert response.status_code == 401
+
+
+class TestPrincipalCache:
+    """Tests for the verified-user cache behind get_current_user_id"""
+    
+    def test_cached_user_skips_query(self, client, test_user):
+        """Test a recently verified user is authenticated without querying the users table"""
+        from sqlalchemy import event
+        from tests.conftest import async_engine
+        user_queries = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM users" in statement:
+                user_queries.append(statement)
+        
+        event.listen(async_engine.sync_engine, "after_cursor_execute", record)
+        try:
+            first = client.get("/api/v1/watchlist/count", headers=test_user["headers"])
+            queries_after_first = len(user_queries)
+            second = client.get("/api/v1/watchlist/count", headers=test_user["headers"])
+        finally:
+            event.remove(async_engine.sync_engine, "after_cursor_execute", record)
+        
+        assert first.status_code == second.status_code == 200
+        assert queries_after_first == 1
+        assert len(user_queries) == queries_after_first
+    
+    def test_deactivate_evicts_user(self, client, db, test_user):
+        """Test a deactivated user is rejected at once even though it was cached"""
+        from app import crud
+        assert client.get("/api/v1/alerts/unread/count", headers=test_user["headers"]).status_code == 200
+        
+        crud.user.deactivate(db, user=crud.user.get_by_email(db, email=test_user["email"]))
+        
+        assert client.get("/api/v1/alerts/unread/count", headers=test_user["headers"]).status_code == 403
+
+
+class TestPasswordHasher:
+    """Tests for bcrypt on the password hasher pool"""
+    
+    def test_login_rehashes_outdated_cost(self, client, db, test_user, monkeypatch):
+        """Test a successful login upgrades a hash made with other bcrypt rounds"""
+        from passlib.context import CryptContext
+        from app.core import security
+        from app.models.user import User
+        assert db.query(User).one().password_hash.startswith("$2b$04$")
+        monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5))
+        
+        response = client.post("/api/v1/auth/login", json={"email": test_user["email"], "password": test_user["password"]})
+        
+        assert response.status_code == 200
+        db.expire_all()
+        assert db.query(User).one().password_hash.startswith("$2b$05$")
+    
+    def test_rejects_when_saturated(self):
+        """Test operations beyond max_pending fail fast instead of queueing"""
+        import asyncio
+        from app.core.security import PasswordHasher, PasswordHasherBusy
+        hasher = PasswordHasher(workers=1, max_pending=2)
+        
+        async def burst():
+            try:
+                return await asyncio.gather(*(hasher.hash("testpass123") for _ in range(3)), return_exceptions=True)
+            finally:
+                hasher.shutdown()
+        
+        results = asyncio.run(burst())
+        
+        assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 1
+        assert sum(isinstance(r, str) for r in results) == 2
+    
+    def test_explicit_zero_max_pending(self):
+        """Test max_pending=0 is honoured rather than replaced by the default"""
+        import asyncio
+        from app.core.security import PasswordHasher, PasswordHasherBusy
+        hasher = PasswordHasher(workers=1, max_pending=0)
+        
+        with pytest.raises(PasswordHasherBusy):
+            asyncio.run(hasher.hash("testpass123"))
+        hasher.shutdown()
+    
+    @pytest.mark.parametrize("setting", [{"PASSWORD_HASH_WORKERS": 0}, {"PASSWORD_HASH_MAX_PENDING": -1}])
+    def test_invalid_settings_rejected(self, setting):
+        """Test the hasher pool settings are validated when the configuration loads"""
+        from pydantic import ValidationError
+        from app.config import Settings
+        
+        with pytest.raises(ValidationError):
+            Settings(**setting)
+    
+    def test_busy_login_returns_503(self, client, test_user, monkeypatch):
+        """Test a saturated hasher answers logins with 503 and Retry-After"""
+        from app.core.security import password_hasher
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        
+        response = client.post("/api/v1/auth/login", json={"email": test_user["email"], "password": test_user["password"]})
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,71 @@
+"""
+Cache Tests
+
+Tests for the in-process TTL cache behind the response cache.
+"""
+import asyncio
+import pytest
+
+from app.utils.cache import CachedResponse, ResponseCache, TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when the cache is full"""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_expired_entries_are_misses(self):
+        """Test an entry past its TTL is not returned"""
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", 1, ttl_seconds=0)
+
+        assert cache.get("a", "miss") == "miss"
+        assert len(cache) == 0
+
+
+class TestResponseCache:
+    """Tests for ResponseCache keys and entries"""
+
+    def test_key_ignores_parameter_order_and_unset_values(self):
+        """Test equivalent parameter sets share a key"""
+        assert ResponseCache.make_key("feed", limit=10, sort_by="risk", cursor=None) == ResponseCache.make_key("feed", sort_by="risk", limit=10)
+        assert ResponseCache.make_key("feed", limit=10) != ResponseCache.make_key("feed", limit=20)
+
+    def test_entry_round_trip(self):
+        """Test a packed entry keeps its body and ETag"""
+        entry = CachedResponse(body=b'{"a":\n1}', etag='"abc"')
+
+        assert CachedResponse.unpack(entry.pack()) == entry
+
+    def test_async_backend(self):
+        """Test a backend with coroutine get/set, like the Redis one, is awaited"""
+        class AsyncBackend:
+            def __init__(self):
+                self.entries = {}
+
+            async def get(self, key, default=None):
+                return self.entries.get(key, default)
+
+            async def set(self, key, value, ttl_seconds=None):
+                self.entries[key] = value
+
+        cache = ResponseCache()
+        cache._backend = AsyncBackend()
+
+        async def run():
+            stored = await cache.set("feed", b"[]")
+            return stored, await cache.get("feed")
+
+        stored, loaded = asyncio.run(run())
+        assert loaded == stored and loaded.body == b"[]"
+
@@ -0,0 +1,108 @@
+"""
+Export Tests
+
+Tests for streaming table exports over the API and the CLI.
+"""
+import csv
+import io
+import json
+import sys
+import pytest
+
+from app import cli
+from app.services.export_service import export_service
+from app.services.ingest_service import ingest_service
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+from tests.test_ingest import make_asteroid
+
+
+@pytest.fixture
+def exported(db, test_user, monkeypatch):
+    monkeypatch.setattr(export_service, "session_factory", TestingAsyncSessionLocal)
+    ingest_service.ingest(db, [make_asteroid(str(3200000 + i), name=f"(Export {i})") for i in range(5)])
+
+
+class TestExportAPI:
+    """Tests for GET /api/v1/export/{table}"""
+
+    def test_ndjson(self, client, test_user, exported):
+        """Test every asteroid is streamed as one JSON object per line in key order"""
+        response = client.get("/api/v1/export/asteroids", headers=test_user["headers"])
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [str(3200000 + i) for i in range(5)]
+        assert rows[0]["name"] == "(Export 0)"
+        assert rows[0]["last_updated"]
+
+    def test_csv_across_batches(self, client, test_user, exported, monkeypatch):
+        """Test a CSV export spanning several fetch batches has one header and every row"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+        response = client.get("/api/v1/export/close_approaches", params={"format": "csv"}, headers=test_user["headers"])
+
+        assert response.status_code == 200
+        assert 'filename="close_approaches.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 5
+        assert rows[0]["approach_date"] == "2030-01-15"
+        assert rows[0]["approach_date_full"] == "2030-01-15T10:30:00"
+
+    def test_parquet_without_pyarrow(self, client, test_user, exported, monkeypatch):
+        """Test Parquet is refused before streaming when pyarrow is not installed"""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        response = client.get("/api/v1/export/asteroids", params={"format": "parquet"}, headers=test_user["headers"])
+
+        assert response.status_code == 501
+
+    def test_parquet(self, client, test_user, exported):
+        """Test a Parquet export reads back with every row"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        response = client.get("/api/v1/export/close_approaches", params={"format": "parquet"}, headers=test_user["headers"])
+
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 5
+        assert table.column("asteroid_id").to_pylist()[0] == "3200000"
+
+    def test_requires_authentication(self, client, exported):
+        """Test clients without a valid token cannot stream tables"""
+        assert client.get("/api/v1/export/asteroids", headers={"Authorization": "Bearer invalid"}).status_code == 401
+        assert client.get("/api/v1/export/asteroids").status_code == 403  # No credentials provided
+
+    def test_concurrent_export_limit(self, client, test_user, exported, monkeypatch):
+        """Test exports beyond EXPORT_MAX_CONCURRENT are refused and finished ones free their slot"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "EXPORT_MAX_CONCURRENT", 1)
+        monkeypatch.setattr(export_service, "active", 1)
+
+        response = client.get("/api/v1/export/asteroids", headers=test_user["headers"])
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+
+        export_service.release()
+        assert client.get("/api/v1/export/asteroids", headers=test_user["headers"]).status_code == 200
+        assert export_service.active == 0
+
+    def test_unknown_table(self, client, test_user):
+        """Test only the exportable tables are accepted"""
+        assert client.get("/api/v1/export/users", headers=test_user["headers"]).status_code == 422
+
+
+class TestExportService:
+    """Tests for ExportService.export and the CLI"""
+
+    def test_yields_one_chunk_per_batch(self, db, exported):
+        """Test rows are encoded batch by batch rather than all at once"""
+        chunks = list(export_service.export(db, "asteroids", "ndjson", batch_size=2))
+
+        assert [chunk.count(b"\n") for chunk in chunks] == [0, 2, 2, 1, 0]
+
+    def test_cli_export(self, db, exported, tmp_path, monkeypatch):
+        """Test the export command writes the table to a file"""
+        monkeypatch.setattr(cli, "SessionLocal", TestingSessionLocal)
+        output = tmp_path / "asteroids.csv"
+        cli.main(["export", "asteroids", "--format", "csv", "--output", str(output)])
+
+        rows = list(csv.DictReader(output.open()))
+        assert [row["id"] for row in rows] == [str(3200000 + i) for i in range(5)]
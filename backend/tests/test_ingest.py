@@ -0,0 +1,109 @@
+"""
+Ingestion Pipeline Tests
+
+Tests for batched NASA feed ingestion.
+"""
+import pytest
+from datetime import date, datetime
+
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+from app.services.ingest_service import ingest_service
+
+
+def make_asteroid(asteroid_id, name="(Ingest Test)", approaches=None):
+    return {
+        "id": asteroid_id,
+        "name": name,
+        "absolute_magnitude": 22.1,
+        "is_hazardous": False,
+        "estimated_diameter_min": 0.1,
+        "estimated_diameter_max": 0.3,
+        "nasa_jpl_url": f"https://ssd.jpl.nasa.gov/sbdb.cgi?sstr={asteroid_id}",
+        "close_approaches": approaches if approaches is not None else [{
+            "approach_date": "2030-01-15",
+            "approach_date_full": "2030-Jan-15 10:30",
+            "velocity_kmh": 45000.0,
+            "miss_distance_km": 3000000.0,
+            "miss_distance_lunar": 7.8,
+            "orbiting_body": "Earth"
+        }]
+    }
+
+
+class TestIngest:
+    """Tests for IngestService.ingest"""
+
+    def test_ingest_creates_rows(self, db):
+        """Test ingesting a fresh feed inserts asteroids and approaches"""
+        stats = ingest_service.ingest(db, [make_asteroid("3000001"), make_asteroid("3000002")])
+
+        assert stats["asteroids"] == 2
+        assert stats["approaches"] == 2
+        assert db.query(Asteroid).count() == 2
+        assert db.query(CloseApproach).count() == 2
+
+    def test_ingest_updates_existing_rows(self, db):
+        """Test re-ingesting the same feed updates rows instead of duplicating them"""
+        ingest_service.ingest(db, [make_asteroid("3000001")])
+        stats = ingest_service.ingest(db, [make_asteroid("3000001", name="(Renamed)")])
+
+        batch = stats["batches"][0]
+        assert batch["asteroids_created"] == 0
+        assert batch["asteroids_updated"] == 1
+        assert batch["approaches_created"] == 0
+        assert batch["approaches_updated"] == 1
+
+        db.expire_all()
+        assert db.query(Asteroid).one().name == "(Renamed)"
+        approach = db.query(CloseApproach).one()
+        assert approach.approach_date == date(2030, 1, 15)
+        assert approach.approach_date_full.hour == 10
+
+    def test_unchanged_approach_keeps_updated_at(self, db):
+        """Test re-ingesting an identical approach leaves updated_at alone and a changed one bumps it"""
+        ingest_service.ingest(db, [make_asteroid("3000001")])
+        db.query(CloseApproach).update({CloseApproach.updated_at: datetime(2020, 1, 1)})
+        db.commit()
+
+        ingest_service.ingest(db, [make_asteroid("3000001")])
+        db.expire_all()
+        assert db.query(CloseApproach).one().updated_at == datetime(2020, 1, 1)
+
+        changed = make_asteroid("3000001")
+        changed["close_approaches"][0]["miss_distance_km"] = 2500000.0
+        ingest_service.ingest(db, [changed])
+        db.expire_all()
+        approach = db.query(CloseApproach).one()
+        assert approach.updated_at > datetime(2020, 1, 1)
+        assert approach.miss_distance_km == 2500000.0
+
+    def test_ingest_splits_batches(self, db):
+        """Test the feed is committed in batches with per-batch timings"""
+        feed = [make_asteroid(str(3000000 + i)) for i in range(5)]
+        stats = ingest_service.ingest(db, feed, batch_size=2)
+
+        assert len(stats["batches"]) == 3
+        assert all("elapsed_ms" in batch for batch in stats["batches"])
+        assert db.query(Asteroid).count() == 5
+
+    def test_ingest_deduplicates_within_batch(self, db):
+        """Test an asteroid listed twice in one feed is written once"""
+        stats = ingest_service.ingest(db, [make_asteroid("3000001"), make_asteroid("3000001")])
+
+        assert stats["asteroids"] == 1
+        assert db.query(CloseApproach).count() == 1
+
+    def test_ingest_materializes_risk(self, db):
+        """Test risk scores and the closest distance are stored on ingest"""
+        approaches = [
+            {"approach_date": "2030-01-15", "velocity_kmh": 45000.0, "miss_distance_km": 3000000.0, "miss_distance_lunar": 7.8},
+            {"approach_date": "2031-06-01", "velocity_kmh": 45000.0, "miss_distance_km": 300000.0, "miss_distance_lunar": 0.78}
+        ]
+        ingest_service.ingest(db, [make_asteroid("3000001", approaches=approaches)])
+
+        asteroid = db.query(Asteroid).one()
+        assert asteroid.closest_approach_km == 300000.0
+        assert asteroid.risk_points == 30
+        assert asteroid.risk_score == "MODERATE"
+        assert sorted(a.risk_points for a in asteroid.close_approaches) == [20, 30]
@@ -0,0 +1,111 @@
+"""
+Migration Tests
+
+Tests for the Alembic migration set and startup migration of existing databases.
+"""
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.utils.migrations import alembic_config, current_revision, run_migrations
+
+
+@pytest.fixture
+def migration_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def head_revision():
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+class TestMigrations:
+    """Tests for app.utils.migrations.run_migrations"""
+
+    def test_upgrade_matches_models(self, migration_engine):
+        """Test a migrated database has exactly the schema the models declare"""
+        run_migrations(migration_engine)
+
+        with migration_engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+        assert diff == []
+        assert current_revision(migration_engine) == head_revision()
+
+    def test_adopts_create_all_database(self, migration_engine):
+        """Test a database created by create_all is stamped instead of re-created"""
+        Base.metadata.create_all(bind=migration_engine)
+
+        run_migrations(migration_engine)
+
+        assert current_revision(migration_engine) == head_revision()
+
+    def test_upgrades_baseline_database(self, migration_engine):
+        """Test a pre-migration database with only the baseline tables gains the newer columns"""
+        config = alembic_config()
+        with migration_engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "0001")
+            connection.execute(text("DROP TABLE alembic_version"))
+
+        run_migrations(migration_engine)
+
+        columns = {c["name"] for c in inspect(migration_engine).get_columns("close_approaches")}
+        assert {"risk_points", "risk_score", "updated_at"} <= columns
+
+    def test_scores_existing_rows(self, migration_engine):
+        """Test approaches stored before the risk columns existed are scored by the upgrade"""
+        config = alembic_config()
+        with migration_engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "0001")
+            connection.execute(text("INSERT INTO asteroids (id, name, is_hazardous, estimated_diameter_max) VALUES ('2024001', '(2024 Test)', 1, 0.3)"))
+            connection.execute(text(
+                "INSERT INTO close_approaches (asteroid_id, approach_date, miss_distance_km, miss_distance_lunar) "
+                "VALUES ('2024001', '2030-01-01', 192200, 0.5), ('2024001', '2030-02-01', 5766000, 15.0)"
+            ))
+            connection.execute(text("DROP TABLE alembic_version"))
+
+        run_migrations(migration_engine)
+
+        with migration_engine.connect() as connection:
+            approaches = connection.execute(text("SELECT risk_score FROM close_approaches ORDER BY approach_date")).scalars().all()
+            asteroid = connection.execute(text("SELECT risk_score, closest_approach_km FROM asteroids")).one()
+        assert approaches == ["EXTREME", "HIGH"]
+        assert tuple(asteroid) == ("EXTREME", 192200.0)
+
+    def test_collapses_duplicate_approaches(self, migration_engine):
+        """Test duplicate (asteroid_id, approach_date) rows are merged before the unique index is built"""
+        config = alembic_config()
+        with migration_engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "0002")
+            connection.execute(text("INSERT INTO asteroids (id, name) VALUES ('2024001', '(2024 Test)')"))
+            connection.execute(text(
+                "INSERT INTO close_approaches (asteroid_id, approach_date, velocity_kmh) "
+                "VALUES ('2024001', '2030-01-01', 1.0), ('2024001', '2030-01-01', 2.0), ('2024001', '2030-02-01', 3.0)"
+            ))
+
+        run_migrations(migration_engine)
+
+        with migration_engine.connect() as connection:
+            rows = connection.execute(text("SELECT approach_date, velocity_kmh FROM close_approaches ORDER BY approach_date")).all()
+        assert rows == [("2030-01-01", 2.0), ("2030-02-01", 3.0)]
+
+    def test_downgrade_round_trip(self, migration_engine):
+        """Test every revision can be downgraded and re-applied"""
+        config = alembic_config()
+        run_migrations(migration_engine)
+        with migration_engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.downgrade(config, "base")
+
+        assert inspect(migration_engine).get_table_names() == ["alembic_version"]
+        run_migrations(migration_engine)
+        assert current_revision(migration_engine) == head_revision()
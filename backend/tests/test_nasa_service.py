@@ -0,0 +1,189 @@
+"""
+NASA Service Tests
+
+Tests for feed window splitting and concurrent range fetching.
+"""
+import asyncio
+import os
+import pytest
+import httpx
+from datetime import date, timedelta
+
+from app.services.nasa_service import NASAService, NASAOfflineError, NASARateLimitError
+from app.utils.disk_cache import CacheEntry, DiskCache
+
+
+def feed_handler(request):
+    start = request.url.params["start_date"]
+    return httpx.Response(200, json={"near_earth_objects": {start: []}}, headers={"X-RateLimit-Remaining": "500"})
+
+
+async def collect(service, start_date, end_date, transport, concurrency=4):
+    async with httpx.AsyncClient(transport=transport) as client:
+        return [window async for window in service.fetch_range(start_date, end_date, concurrency=concurrency, client=client)]
+
+
+class TestSplitRange:
+    """Tests for NASAService.split_range"""
+
+    def test_short_range_is_single_window(self):
+        """Test a range within the feed limit is not split"""
+        start = date(2030, 1, 1)
+        assert NASAService().split_range(start, start + timedelta(days=7)) == [(start, start + timedelta(days=7))]
+
+    def test_long_range_covers_every_day(self):
+        """Test a quarter is split into contiguous, non-overlapping windows"""
+        start, end = date(2030, 1, 1), date(2030, 3, 31)
+        windows = NASAService().split_range(start, end)
+
+        assert windows[0][0] == start
+        assert windows[-1][1] == end
+        for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+            assert next_start == prev_end + timedelta(days=1)
+        assert all((window_end - window_start).days <= NASAService.MAX_FEED_DAYS for window_start, window_end in windows)
+
+
+class TestFetchRange:
+    """Tests for NASAService.fetch_range"""
+
+    def test_fetches_every_window(self):
+        """Test every window of a long range is fetched and yielded"""
+        service = NASAService()
+        service.api_key = "TEST_KEY"
+        start, end = date(2030, 1, 1), date(2030, 2, 28)
+
+        windows = asyncio.run(collect(service, start, end, httpx.MockTransport(feed_handler)))
+
+        assert sorted(w[:2] for w in windows) == service.split_range(start, end)
+        assert service.rate_limit_remaining == 500
+
+    def test_demo_key_limits_concurrency(self):
+        """Test DEMO_KEY requests are never issued concurrently"""
+        service = NASAService()
+        service.api_key = "DEMO_KEY"
+        assert service.feed_concurrency(8) == 1
+
+    def test_rate_limit_stops_backfill(self):
+        """Test a 429 response aborts the range and blocks further requests"""
+        service = NASAService()
+        transport = httpx.MockTransport(lambda request: httpx.Response(429, headers={"Retry-After": "3600"}))
+
+        with pytest.raises(NASARateLimitError):
+            asyncio.run(collect(service, date(2030, 1, 1), date(2030, 1, 20), transport))
+        with pytest.raises(NASARateLimitError):
+            asyncio.run(collect(service, date(2030, 1, 1), date(2030, 1, 2), httpx.MockTransport(feed_handler)))
+
+
+class TestRetries:
+    """Tests for retry and backoff in NASAService._request"""
+
+    def test_retries_server_errors(self, monkeypatch):
+        """Test transient 5xx responses are retried on the shared client"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "NASA_HTTP_BACKOFF_BASE", 0.0)
+        responses = iter([httpx.Response(503), httpx.Response(502)])
+
+        def handler(request):
+            return next(responses, None) or feed_handler(request)
+
+        service = NASAService(transport=httpx.MockTransport(handler))
+
+        async def fetch():
+            try:
+                return await service.fetch_feed(date(2030, 1, 1), date(2030, 1, 7))
+            finally:
+                await service.shutdown()
+
+        assert asyncio.run(fetch()) == {"near_earth_objects": {"2030-01-01": []}}
+
+    def test_lookup_missing_asteroid(self):
+        """Test a 404 lookup returns None without retrying"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        service = NASAService(transport=httpx.MockTransport(handler))
+
+        async def lookup():
+            try:
+                return await service.lookup_asteroid("missing")
+            finally:
+                await service.shutdown()
+
+        assert asyncio.run(lookup()) is None
+        assert len(calls) == 1
+
+
+class TestResponseCache:
+    """Tests for the on-disk NASA response cache"""
+
+    def lookup(self, service, asteroid_id="2024001"):
+        async def run():
+            try:
+                return await service.lookup_asteroid(asteroid_id)
+            finally:
+                await service.shutdown()
+        return asyncio.run(run())
+
+    def test_fresh_entry_skips_network(self, tmp_path):
+        """Test a second lookup within the TTL is served from disk"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"id": "2024001"})
+
+        service = NASAService(transport=httpx.MockTransport(handler), cache=DiskCache(str(tmp_path), max_bytes=1024 * 1024))
+
+        assert self.lookup(service) == {"id": "2024001"}
+        assert self.lookup(service) == {"id": "2024001"}
+        assert len(calls) == 1
+
+    def test_stale_entry_revalidates_with_etag(self, tmp_path, monkeypatch):
+        """Test a stale entry is revalidated with If-None-Match and reused on 304"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "NASA_CACHE_TTL_SECONDS", 0)
+        seen_etags = []
+
+        def handler(request):
+            seen_etags.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": "2024001"}, headers={"ETag": '"v1"'})
+
+        service = NASAService(transport=httpx.MockTransport(handler), cache=DiskCache(str(tmp_path), max_bytes=1024 * 1024))
+
+        assert self.lookup(service) == {"id": "2024001"}
+        assert self.lookup(service) == {"id": "2024001"}
+        assert seen_etags == [None, '"v1"']
+
+    def test_offline_mode(self, tmp_path, monkeypatch):
+        """Test offline mode serves stale entries and fails on misses without network access"""
+        from app.config import settings
+        cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        cache.set(DiskCache.make_key("/neo/2024001", {}), CacheEntry(body={"id": "2024001"}, stored_at=0))
+        monkeypatch.setattr(settings, "NASA_OFFLINE", True)
+
+        def handler(request):
+            raise AssertionError("network used in offline mode")
+
+        service = NASAService(transport=httpx.MockTransport(handler), cache=cache)
+
+        assert self.lookup(service) == {"id": "2024001"}
+        with pytest.raises(NASAOfflineError):
+            self.lookup(service, "9999999")
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entries are evicted when the cache is over size"""
+        cache = DiskCache(str(tmp_path), max_bytes=250)
+        for mtime, name in enumerate(("a", "b"), start=1):
+            cache.set(name, CacheEntry(body="x" * 50, stored_at=0))
+            os.utime(tmp_path / f"{name}.json", (mtime, mtime))
+        cache.get("a")
+        cache.set("c", CacheEntry(body="x" * 50, stored_at=0))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
@@ -0,0 +1,108 @@
+"""
+Query Plan Tests
+
+Runs each CRUD method against SQLite, captures the statements it issues and fails if
+EXPLAIN QUERY PLAN shows a full scan of any table.
+"""
+import re
+import pytest
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+
+from app import crud
+from app.database import Base
+from app.services.alert_service import AlertService
+from app.services.risk_service import refresh_risk_scores
+from tests.conftest import engine
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+TODAY = date.today()
+LATER = datetime.utcnow() + timedelta(days=1)
+
+# Methods whose full scan is inherent to what they do, and why.
+ALLOWED_SCANS = {
+    "asteroid.search": {"asteroids"},         # substring match on name/id; a B-tree cannot serve '%q%'
+    "watchlist.get_all": {"watchlist"},       # returns every row
+    "alert.reconcile_unread_counts": {"users"},  # checks every user's counter
+}
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", record)
+
+
+def full_scans(db, statements):
+    scans = set()
+    connection = db.connection()
+    for statement, parameters in statements:
+        for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            match = FULL_SCAN.match(row[-1])
+            if match and match.group(1) in Base.metadata.tables:
+                scans.add(match.group(1))
+    return scans
+
+
+FEED = {"start_date": TODAY, "end_date": TODAY + timedelta(days=7), "limit": 10}
+
+CASES = {
+    "user.get": lambda db: crud.user.get(db, id=1),
+    "user.get_by_email": lambda db: crud.user.get_by_email(db, email="test@example.com"),
+    "asteroid.get": lambda db: crud.asteroid.get(db, id="2024001"),
+    "asteroid.get_feed_page[approach_date]": lambda db: crud.asteroid.get_feed_page(db, **FEED),
+    "asteroid.get_feed_page[approach_date cursor]": lambda db: crud.asteroid.get_feed_page(db, **FEED, cursor=(TODAY, "2024001")),
+    "asteroid.get_feed_page[risk]": lambda db: crud.asteroid.get_feed_page(db, **FEED, sort_by="risk", min_risk=30),
+    "asteroid.get_feed_page[diameter cursor]": lambda db: crud.asteroid.get_feed_page(db, **FEED, sort_by="diameter", cursor=(0.2, "2024001")),
+    "asteroid.search": lambda db: crud.asteroid.search(db, query="2024"),
+    "asteroid.get_hazardous": lambda db: crud.asteroid.get_hazardous(db),
+    "asteroid.bulk_upsert": lambda db: crud.asteroid.bulk_upsert(db, asteroids_data=[{"id": "2024001", "name": "(2024 Test)"}]),
+    "close_approach.get_by_asteroid": lambda db: crud.close_approach.get_by_asteroid(db, asteroid_id="2024001"),
+    "close_approach.get_by_date_range": lambda db: crud.close_approach.get_by_date_range(db, start_date=TODAY, end_date=TODAY),
+    "close_approach.get_upcoming": lambda db: crud.close_approach.get_upcoming(db),
+    "close_approach.get_timeline": lambda db: crud.close_approach.get_timeline(db, start_date=TODAY, end_date=TODAY + timedelta(days=30)),
+    "close_approach.upsert": lambda db: crud.close_approach.upsert(db, asteroid_id="2024001", approach_data={"approach_date": TODAY.isoformat()}),
+    "close_approach.bulk_upsert": lambda db: crud.close_approach.bulk_upsert(db, approaches=[("2024001", {"approach_date": TODAY.isoformat()})]),
+    "watchlist.get_by_user": lambda db: crud.watchlist.get_by_user(db, user_id=1),
+    "watchlist.get_by_user_and_asteroid": lambda db: crud.watchlist.get_by_user_and_asteroid(db, user_id=1, asteroid_id="2024001"),
+    "watchlist.count_by_user": lambda db: crud.watchlist.count_by_user(db, user_id=1),
+    "watchlist.get_all": lambda db: crud.watchlist.get_all(db),
+    "watchlist.bulk_add": lambda db: crud.watchlist.bulk_add(db, user_id=1, items=[("2024001", 1000.0), ("missing", 1000.0)]),
+    "watchlist.bulk_update": lambda db: crud.watchlist.bulk_update(db, user_id=1, items=[("2024001", 1000.0)]),
+    "watchlist.bulk_remove": lambda db: crud.watchlist.bulk_remove(db, user_id=1, asteroid_ids=["2024001"]),
+    "alert.get_by_user": lambda db: crud.alert.get_by_user(db, user_id=1),
+    "alert.get_by_user[unread cursor]": lambda db: crud.alert.get_by_user(db, user_id=1, unread_only=True, cursor=(LATER, 10)),
+    "alert.get_after": lambda db: crud.alert.get_after(db, user_id=1, after_id=10),
+    "alert.get_by_user_asteroid_date": lambda db: crud.alert.get_by_user_asteroid_date(db, user_id=1, asteroid_id="2024001", approach_date=LATER),
+    "alert.count_unread": lambda db: crud.alert.count_unread(db, user_id=1),
+    "alert.mark_all_as_read": lambda db: crud.alert.mark_all_as_read(db, user_id=1),
+    "alert.remove": lambda db: crud.alert.remove(db, id=1),
+    "alert.reconcile_unread_counts": lambda db: crud.alert.reconcile_unread_counts(db),
+    "chat_message.get_by_asteroid": lambda db: crud.chat_message.get_by_asteroid(db, asteroid_id="2024001"),
+    "chat_message.get_by_asteroid[cursor]": lambda db: crud.chat_message.get_by_asteroid(db, asteroid_id="2024001", cursor=(LATER, 10)),
+    "alert_service.generate_alerts_for_approaches": lambda db: AlertService().generate_alerts_for_approaches(db),
+    "risk.refresh_risk_scores": lambda db: refresh_risk_scores(db, asteroid_ids={"2024001"}),
+}
+
+
+class TestQueryPlans:
+    """EXPLAIN QUERY PLAN checks for every CRUD query"""
+
+    @pytest.mark.parametrize("name", sorted(CASES))
+    def test_no_full_table_scan(self, db, sample_asteroid, name):
+        """Test the method's queries are all served by an index"""
+        with captured_statements() as statements:
+            CASES[name](db)
+
+        assert statements, "no statements captured"
+        assert full_scans(db, statements) <= ALLOWED_SCANS.get(name, set())
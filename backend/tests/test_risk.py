@@ -0,0 +1,58 @@
+"""
+Risk Scoring Tests
+
+Tests that the vectorized risk scorer matches the scalar implementation.
+"""
+import itertools
+import pytest
+import numpy as np
+
+from app.models.asteroid import Asteroid
+from app.models.close_approach import CloseApproach
+from app.services.risk_service import calculate_risk_score, calculate_risk_scores
+
+
+DIAMETERS = [None, 0.0, 0.03, 0.05, 0.07, 0.1, 0.3, 0.5, 0.7, 1.0, 1.5, float("nan")]
+LUNAR_DISTANCES = [None, 0.0, 0.5, 1.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 40.0, -1.0, float("nan")]
+
+
+class TestVectorizedRiskScore:
+    """Tests for calculate_risk_scores"""
+
+    def test_matches_scalar_on_every_bucket_edge(self):
+        """Test every hazard/diameter/distance combination scores the same as the scalar function"""
+        cases = list(itertools.product([False, True], DIAMETERS, LUNAR_DISTANCES))
+        hazardous, diameters, distances = zip(*cases)
+
+        _, categories = calculate_risk_scores(hazardous, diameters, distances)
+
+        expected = [
+            calculate_risk_score(
+                Asteroid(is_hazardous=h, estimated_diameter_max=d), CloseApproach(miss_distance_lunar=l)
+            )
+            for h, d, l in cases
+        ]
+        assert categories.tolist() == expected
+
+    def test_scores_are_numeric(self):
+        """Test the numeric score is the sum of the bucket points"""
+        scores, categories = calculate_risk_scores([True], [1.5], [0.5])
+
+        assert scores.tolist() == [100]
+        assert categories.tolist() == ["EXTREME"]
+
+    def test_empty_input(self):
+        """Test scoring zero rows returns empty arrays"""
+        scores, categories = calculate_risk_scores([], [], [])
+
+        assert len(scores) == 0
+        assert len(categories) == 0
+
+    def test_large_batch(self):
+        """Test thousands of rows are scored in one call"""
+        size = 10000
+        rng = np.random.default_rng(0)
+        scores, categories = calculate_risk_scores(rng.random(size) > 0.9, rng.random(size) * 2, rng.random(size) * 30)
+
+        assert scores.shape == (size,)
+        assert set(categories.tolist()) <= {"LOW", "MODERATE", "HIGH", "EXTREME"}
@@ -19,6 +19,18 @@ class TestGetWatchlist:
         assert response.status_code == 200
         assert response.json() == []
     
+    def test_get_watchlist_projection(self, client, test_user, sample_asteroid):
+        """Test entries carry the asteroid name and the date of its next approach"""
+        from datetime import date
+        client.post("/api/v1/watchlist", json={"asteroid_id": sample_asteroid.id}, headers=test_user["headers"])
+        
+        response = client.get("/api/v1/watchlist", headers=test_user["headers"])
+        
+        assert response.status_code == 200
+        entry = response.json()[0]
+        assert entry["asteroid_name"] == sample_asteroid.name
+        assert entry["next_approach_date"] == date.today().isoformat()
+    
     def test_get_watchlist_unauthorized(self, client):
         """Test getting watchlist without auth fails"""
         response = client.get("/api/v1/watchlist")
@@ -41,6 +53,7 @@ class TestAddToWatchlist:
         data = response.json()
         assert data["asteroid_id"] == sample_asteroid.id
         assert data["alert_distance_km"] == 500000
+        assert data["asteroid_name"] == sample_asteroid.name
     
     def test_add_duplicate_fails(self, client, test_user, sample_asteroid):
         """Test adding same asteroid twice fails"""
@@ -140,3 +153,56 @@ class TestRemoveFromWatchlist:
         )
         
         assert response.status_code == 404
+
+
+@pytest.fixture
+def many_asteroids(db):
+    from app.models.asteroid import Asteroid
+    asteroids = [Asteroid(id=str(3000000 + i), name=f"(Bulk {i})") for i in range(3)]
+    db.add_all(asteroids)
+    db.commit()
+    return [a.id for a in asteroids]
+
+
+class TestBulkWatchlist:
+    """Tests for /api/v1/watchlist/bulk"""
+    
+    def test_bulk_add(self, client, test_user, many_asteroids):
+        """Test a bulk add reports created, exists and not_found per asteroid"""
+        client.post("/api/v1/watchlist", json={"asteroid_id": many_asteroids[0]}, headers=test_user["headers"])
+        items = [{"asteroid_id": a, "alert_distance_km": 750000} for a in many_asteroids] + [{"asteroid_id": "missing"}, {"asteroid_id": many_asteroids[1]}]
+        
+        response = client.post("/api/v1/watchlist/bulk", json={"items": items}, headers=test_user["headers"])
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [(r["asteroid_id"], r["status"]) for r in data["results"]] == [
+            (many_asteroids[0], "exists"), (many_asteroids[1], "created"), (many_asteroids[2], "created"), ("missing", "not_found")
+        ]
+        assert data["counts"] == {"exists": 1, "created": 2, "not_found": 1}
+        assert data["results"][2]["entry"]["asteroid_name"] == "(Bulk 2)"
+        assert len(client.get("/api/v1/watchlist", headers=test_user["headers"]).json()) == 3
+    
+    def test_bulk_update_and_remove(self, client, test_user, many_asteroids):
+        """Test bulk update and remove touch only the user's existing entries"""
+        client.post("/api/v1/watchlist/bulk", json={"items": [{"asteroid_id": a} for a in many_asteroids[:2]]}, headers=test_user["headers"])
+        
+        updated = client.put(
+            "/api/v1/watchlist/bulk",
+            json={"items": [{"asteroid_id": a, "alert_distance_km": 123.0} for a in many_asteroids]},
+            headers=test_user["headers"]
+        )
+        removed = client.request("DELETE", "/api/v1/watchlist/bulk", json={"asteroid_ids": many_asteroids[1:]}, headers=test_user["headers"])
+        
+        assert updated.json()["counts"] == {"updated": 2, "not_found": 1}
+        assert removed.json()["counts"] == {"removed": 1, "not_found": 1}
+        remaining = client.get("/api/v1/watchlist", headers=test_user["headers"]).json()
+        assert [(e["asteroid_id"], e["alert_distance_km"]) for e in remaining] == [(many_asteroids[0], 123.0)]
+    
+    def test_bulk_limit(self, client, test_user):
+        """Test oversized and empty batches are rejected"""
+        from app.schemas.watchlist import BULK_MAX_ITEMS
+        too_many = [{"asteroid_id": str(i)} for i in range(BULK_MAX_ITEMS + 1)]
+        
+        assert client.post("/api/v1/watchlist/bulk", json={"items": too_many}, headers=test_user["headers"]).status_code == 422
+        assert client.post("/api/v1/watchlist/bulk", json={"items": []}, headers=test_user["headers"]).status_code == 422
@@ -0,0 +1,143 @@
+"""
+WebSocket Tests
+
+Tests for fanning Socket.IO events out across workers, shared chat presence and socket authentication.
+"""
+import asyncio
+import json
+import pytest
+import socketio
+
+from app.utils.presence import MemoryPresenceStore, create_presence_store
+from app.utils.pubsub import InProcessPubSubManager, create_client_manager
+from app.utils import websocket
+from app.utils.websocket import authenticate
+
+
+class Worker:
+    """A Socket.IO server standing in for one uvicorn worker, recording the packets it sends to its clients."""
+
+    def __init__(self, channel):
+        self.server = socketio.AsyncServer(async_mode="asgi", client_manager=InProcessPubSubManager(channel=channel))
+        self.sent = []
+
+        async def send_eio_packet(eio_sid, eio_pkt):
+            self.sent.append((eio_sid, json.loads(eio_pkt.data[1:])))
+        self.server._send_eio_packet = send_eio_packet
+
+    async def connect(self, eio_sid, room):
+        sid = await self.server.manager.connect(eio_sid, "/")
+        await self.server.manager.enter_room(sid, "/", room)
+        return sid
+
+
+class TestPubSubManager:
+    """Tests for InProcessPubSubManager"""
+
+    def test_emit_reaches_other_worker(self):
+        """Test an event emitted on one worker is delivered to a room member connected to another"""
+        async def run():
+            first, second = Worker("test-fanout"), Worker("test-fanout")
+            first.server.manager.initialize()
+            second.server.manager.initialize()
+            await second.connect("eio-1", "asteroid_2000433")
+            await asyncio.sleep(0)
+
+            await first.server.emit("new_message", {"message": "hello"}, room="asteroid_2000433")
+            for _ in range(50):
+                if second.sent:
+                    break
+                await asyncio.sleep(0.01)
+            for worker in (first, second):
+                worker.server.manager.thread.cancel()
+            return first.sent, second.sent
+
+        first_sent, second_sent = asyncio.run(run())
+
+        assert first_sent == []
+        assert second_sent == [("eio-1", ["new_message", {"message": "hello"}])]
+
+    def test_message_queue_selection(self):
+        """Test the client manager follows SOCKETIO_MESSAGE_QUEUE"""
+        assert create_client_manager(None, "cosmic_watch") is None
+        assert isinstance(create_client_manager("memory://", "cosmic_watch"), InProcessPubSubManager)
+        with pytest.raises(ValueError):
+            create_client_manager("amqp://localhost", "cosmic_watch")
+
+
+class TestPresence:
+    """Tests for the shared presence store"""
+
+    def test_members_across_workers(self):
+        """Test room members joined through different workers are listed together until they leave"""
+        store = MemoryPresenceStore()
+
+        async def run():
+            await store.add("asteroid_1", "sid-worker-1", "a@example.com")
+            await store.add("asteroid_1", "sid-worker-2", "b@example.com")
+            await store.add("asteroid_2", "sid-worker-2b", "c@example.com")
+            joined = await store.members("asteroid_1")
+            await store.discard("asteroid_1", "sid-worker-1")
+            return joined, await store.members("asteroid_1")
+
+        joined, after_leave = asyncio.run(run())
+
+        assert sorted(joined) == ["a@example.com", "b@example.com"]
+        assert after_leave == ["b@example.com"]
+
+    def test_memory_store_without_redis(self):
+        """Test presence stays in process unless the message queue is Redis"""
+        assert isinstance(create_presence_store(None), MemoryPresenceStore)
+        assert isinstance(create_presence_store("memory://"), MemoryPresenceStore)
+
+
+class TestSocketAuth:
+    """Tests for authenticating Socket.IO connections with the API's JWT"""
+
+    @pytest.fixture(autouse=True)
+    def session_factory(self, monkeypatch):
+        from app.utils import websocket
+        from tests.conftest import TestingAsyncSessionLocal
+        monkeypatch.setattr(websocket, "AsyncSessionLocal", TestingAsyncSessionLocal)
+
+    def test_token_in_auth_payload(self, test_user):
+        """Test a valid token identifies the user"""
+        user = asyncio.run(authenticate({"token": test_user["token"]}, {}))
+        assert user.email == test_user["email"]
+
+    def test_token_in_query_string(self, test_user):
+        """Test clients that cannot send an auth payload may pass the token in the URL"""
+        user = asyncio.run(authenticate(None, {"QUERY_STRING": f"EIO=4&transport=websocket&token={test_user['token']}"}))
+        assert user.email == test_user["email"]
+
+    def test_guest_and_invalid_token(self, db):
+        """Test a connection without a token is a guest and one with a bad token is refused"""
+        assert asyncio.run(authenticate(None, {})) is None
+        with pytest.raises(ConnectionRefusedError):
+            asyncio.run(authenticate({"token": "not-a-jwt"}, {}))
+
+
+class TestSendMessage:
+    """Tests for validating chat messages before they are broadcast and queued"""
+
+    @pytest.fixture
+    def emitted(self, monkeypatch):
+        emitted = []
+
+        async def emit(event, data, room=None):
+            emitted.append((event, data))
+
+        async def get_session(sid):
+            return {"user_id": None}
+        monkeypatch.setattr(websocket.sio, "emit", emit)
+        monkeypatch.setattr(websocket.sio, "get_session", get_session)
+        return emitted
+
+    @pytest.mark.parametrize("message", [{"text": "hi"}, ["hi"], 42, "   ", "x" * 2001])
+    def test_rejects_invalid_messages(self, emitted, monkeypatch, message):
+        """Test anything but non-blank text within the length limit is refused and never queued"""
+        recorded = []
+        monkeypatch.setattr(websocket.chat_service, "record", lambda **kwargs: recorded.append(kwargs))
+        asyncio.run(websocket.send_message("sid", {"asteroid_id": "2024001", "message": message}))
+        assert recorded == []
+        assert [event for event, _ in emitted] == ["error"]